@@ -0,0 +1,63 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database in a temporary
+directory unless BENCHMARK_DATABASE_URL points somewhere else. Never point
+it at a database holding real data: benchmarks create tables and seed rows.
+"""
+import os
+import sys
+import time
+import tempfile
+import statistics
+from typing import Awaitable, Callable
+
+_tmp_dir = tempfile.mkdtemp(prefix='fastapi-music-bench-')
+
+
+def setup_environment() -> None:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+    os.environ['DATABASE_URL'] = os.environ.get(
+        'BENCHMARK_DATABASE_URL',
+        'sqlite:///{}'.format(os.path.join(_tmp_dir, 'db.sqlite'))
+    )
+    for name in 'MAIL_USERNAME', 'MAIL_PASSWORD', 'MAIL_SERVER':
+        os.environ.setdefault(name, 'benchmark')
+    os.environ.setdefault('MAIL_FROM', 'benchmark@example.com')
+
+
+def create_tables() -> None:
+    import sqlalchemy
+
+    from src.config import settings
+    from src.core.base_meta import BaseMeta
+
+    engine = sqlalchemy.create_engine(settings.DATABASE_URL)
+    BaseMeta.metadata.create_all(engine)
+    engine.dispose()
+
+
+async def timed(func: Callable[[], Awaitable]) -> float:
+    started_at = time.perf_counter()
+    await func()
+    return time.perf_counter() - started_at
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(round(percent / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def report(name: str, latencies: list[float]) -> None:
+    if not latencies:
+        print('{:<32} no samples'.format(name))
+        return
+    print('{:<32} n={:<6} mean={:8.2f}ms p50={:8.2f}ms p99={:8.2f}ms'.format(
+        name,
+        len(latencies),
+        statistics.mean(latencies) * 1000,
+        percentile(latencies, 50) * 1000,
+        percentile(latencies, 99) * 1000
+    ))
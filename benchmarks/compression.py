@@ -0,0 +1,171 @@
+"""Bytes on the wire and CPU per request for compressed catalog lists.
+
+    python -m benchmarks.compression --albums 50 --tracks 15 --rounds 5
+
+Seeds albums and playlists with track previews, then requests the 50 item
+AlbumList and PlaylistList pages through CompressionMiddleware with each
+encoding and level. cpu is process time per request, including the query
+and serialization work; compress is the encoder alone on the same body.
+"""
+import os
+import time
+import asyncio
+import argparse
+import statistics
+
+from benchmarks.base import create_tables, setup_environment
+
+setup_environment()
+os.environ['RESPONSE_COMPRESSION'] = 'false'
+
+import httpx
+
+from main import app
+from benchmarks.read_path import _seed
+from src.core.db import database
+from src.core.compression import CompressionMiddleware, get_compressor
+from src.app.music.models import Playlist, Track
+
+ENDPOINTS = {
+    'AlbumList': '/api/v1/albums?limit=50',
+    'PlaylistList': '/api/v1/playlists?limit=50'
+}
+ENCODINGS = [
+    ('identity', None),
+    ('gzip', 1),
+    ('gzip', 6),
+    ('gzip', 9),
+    ('br', 1),
+    ('br', 4),
+    ('br', 11)
+]
+
+
+def _get_through_table(name: str):
+    return Playlist.Meta.model_fields[name].through.Meta.table
+
+
+async def _seed_playlists(playlists: int, tracks: int) -> None:
+    if await Playlist.objects.exists():
+        return
+
+    rows = await database.fetch_all(
+        Track.Meta.table.select().order_by(Track.Meta.table.c.id)
+    )
+    await database.execute(Playlist.Meta.table.insert().values([
+        {
+            'id': id,
+            'title': 'Playlist {}'.format(id),
+            'author': id % 10 + 1,
+            'duration_ms': 1000 * tracks,
+            'track_count': tracks,
+            'follower_count': 0,
+            'version': 1
+        }
+        for id in range(1, playlists + 1)
+    ]))
+
+    links, artists = [], set()
+    for id in range(1, playlists + 1):
+        for number in range(tracks):
+            row = rows[(id * 7 + number * 13) % len(rows)]
+            links.append({'playlist': id, 'track': row['id']})
+            artists.add((id, row['artist']))
+    await database.execute(_get_through_table('tracks').insert().values(links))
+    await database.execute(_get_through_table('artists').insert().values([
+        {'playlist': id, 'user': user} for id, user in sorted(artists)
+    ]))
+    await database.execute(_get_through_table('images').insert().values([
+        {'playlist': id, 'image': image}
+        for id in range(1, playlists + 1)
+        for image in (id * 2 - 1, id * 2)
+    ]))
+
+
+async def _measure(
+    client: httpx.AsyncClient,
+    url: str,
+    encoding: str,
+    rounds: int
+) -> tuple[int, list[float]]:
+    headers = {'Accept-Encoding': encoding}
+    await client.get(url, headers=headers)
+
+    size, cpu = 0, []
+    for _ in range(rounds):
+        started_at = time.process_time()
+        response = await client.get(url, headers=headers)
+        cpu.append(time.process_time() - started_at)
+        assert response.status_code == 200, response.text
+        assert response.headers.get('content-encoding', 'identity') == encoding
+        size = int(response.headers['content-length'])
+    return size, cpu
+
+
+def _measure_compressor(
+    body: bytes,
+    encoding: str,
+    level: int,
+    rounds: int
+) -> float:
+    started_at = time.process_time()
+    for _ in range(rounds):
+        compress, finish = get_compressor(encoding, level, level)
+        compress(body) + finish()
+    return (time.process_time() - started_at) / rounds
+
+
+async def main(albums: int, tracks: int, rounds: int) -> None:
+    create_tables()
+    await database.connect()
+    await _seed(albums, tracks)
+    await _seed_playlists(albums, tracks)
+
+    middleware = CompressionMiddleware(app, exclude_paths=('/media',))
+    async with httpx.AsyncClient(
+        app=middleware,
+        base_url='http://bench'
+    ) as client:
+        for name, url in ENDPOINTS.items():
+            response = await client.get(
+                url,
+                headers={'Accept-Encoding': 'identity'}
+            )
+            body = response.content
+            print('{} ({}, {} items)'.format(
+                name,
+                url,
+                len(response.json()['items'])
+            ))
+            for encoding, level in ENCODINGS:
+                if level is not None:
+                    middleware.gzip_level = middleware.brotli_quality = level
+                size, cpu = await _measure(client, url, encoding, rounds)
+                compress_ms = _measure_compressor(
+                    body,
+                    encoding,
+                    level,
+                    rounds * 10
+                ) * 1000 if level is not None else 0.0
+                print(
+                    '  {:<12} {:>9} bytes {:>6.1%}  cpu={:8.2f}ms/request  '
+                    'compress={:6.2f}ms'.format(
+                        encoding if level is None
+                            else '{}-{}'.format(encoding, level),
+                        size,
+                        size / len(body),
+                        statistics.mean(cpu) * 1000,
+                        compress_ms
+                    )
+                )
+
+    await database.disconnect()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--albums', type=int, default=50)
+    parser.add_argument('--tracks', type=int, default=15)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.albums, args.tracks, args.rounds))
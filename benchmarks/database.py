@@ -0,0 +1,149 @@
+"""Read and write latency of the repositories under concurrent load.
+
+    python -m benchmarks.database --duration 10 --concurrency 32
+
+Runs against SQLite by default; set BENCHMARK_DATABASE_URL to a
+postgresql:// URL to measure the asyncpg pool instead. Pool sizing and
+timeouts come from the DATABASE_* settings, so the same run can be repeated
+with e.g. DATABASE_POOL_MAX_SIZE=5 and DATABASE_POOL_MAX_SIZE=20.
+"""
+import time
+import random
+import asyncio
+import argparse
+
+from benchmarks.base import create_tables, report, setup_environment, timed
+
+setup_environment()
+
+from src.config import settings
+from src.core.db import database
+from src.app.user.models import User
+from src.app.music.models import Album, Genre, Track
+from src.app.music.repositories import AlbumRepository, TrackRepository
+
+PAGE_SIZE = 20
+
+
+async def _seed(tracks: int) -> int:
+    artist = await User.objects.get_or_none(username='benchmark')
+    if artist is None:
+        artist = await User.objects.create(
+            username='benchmark',
+            email='benchmark@example.com',
+            hashed_password='benchmark',
+            email_confirmed=True
+        )
+    genre = await Genre.objects.create(title='benchmark')
+    album = await Album.objects.create(
+        title='benchmark',
+        artist=artist,
+        genre=genre,
+        album_type='album',
+        duration_ms=0
+    )
+
+    table = Track.Meta.table
+    for offset in range(0, tracks, 500):
+        await database.execute(table.insert().values([
+            {
+                'title': 'track {}'.format(number),
+                'artist': artist.pk,
+                'album': album.pk,
+                'file': 'benchmark.mp3',
+                'is_playable': True,
+                'explicit': False,
+                'duration_ms': 1000,
+                'number': number,
+                'saved_count': 0,
+                'version': 1
+            }
+            for number in range(offset + 1, min(offset + 500, tracks) + 1)
+        ]))
+    return album.pk
+
+
+async def _read(total: int) -> None:
+    # The row path GET /tracks takes; slice() spends most of its time
+    # building ormar models, which hides the database behind the CPU.
+    await TrackRepository.slice_rows(
+        random.randrange(max(total - PAGE_SIZE, 1)),
+        PAGE_SIZE
+    )
+
+
+async def _write(album_id: int) -> None:
+    async with database.transaction():
+        await AlbumRepository.increment(album_id, saved_count=1)
+        await AlbumRepository.increment(album_id, saved_count=-1)
+
+
+async def _worker(
+    album_id: int,
+    total: int,
+    write_ratio: float,
+    deadline: float,
+    reads: list[float],
+    writes: list[float],
+    errors: list[Exception]
+) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            if random.random() < write_ratio:
+                writes.append(await timed(lambda: _write(album_id)))
+            else:
+                reads.append(await timed(lambda: _read(total)))
+        except Exception as error:
+            errors.append(error)
+
+
+async def main(
+    duration: float,
+    concurrency: int,
+    tracks: int,
+    write_ratio: float
+) -> None:
+    create_tables()
+    await database.connect()
+    album_id = await _seed(tracks)
+    total = await TrackRepository.count()
+
+    reads, writes, errors = [], [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        _worker(album_id, total, write_ratio, deadline, reads, writes, errors)
+        for _ in range(concurrency)
+    ))
+
+    await database.disconnect()
+
+    print('{} pool={}..{} acquire_timeout={}s statement_cache={}'.format(
+        database.url.dialect,
+        settings.DATABASE_POOL_MIN_SIZE,
+        settings.DATABASE_POOL_MAX_SIZE,
+        settings.DATABASE_POOL_ACQUIRE_TIMEOUT,
+        settings.DATABASE_STATEMENT_CACHE_SIZE
+    ))
+    report('read page of {} tracks'.format(PAGE_SIZE), reads)
+    report('write transaction', writes)
+    print('throughput: {:.1f} ops/s, errors: {}'.format(
+        (len(reads) + len(writes)) / duration,
+        len(errors)
+    ))
+    for name in sorted({type(error).__name__ for error in errors}):
+        print('  {}'.format(name))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--tracks', type=int, default=5000)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(main(
+        args.duration,
+        args.concurrency,
+        args.tracks,
+        args.write_ratio
+    ))
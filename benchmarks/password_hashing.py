@@ -0,0 +1,94 @@
+"""Login throughput and latency of unrelated routes under login load.
+
+    python -m benchmarks.password_hashing --duration 10 --concurrency 8
+"""
+import time
+import asyncio
+import argparse
+
+from benchmarks.base import create_tables, report, setup_environment, timed
+
+setup_environment()
+
+import httpx
+
+from main import app
+from src.core.db import database
+from src.core.security import get_password_hash, get_password_hash_stats
+from src.app.user.models import User
+
+PASSWORD = 'benchmark-password'
+
+
+async def _seed() -> None:
+    if not await User.objects.filter(username='benchmark').exists():
+        await User.objects.create(
+            username='benchmark',
+            email='benchmark@example.com',
+            hashed_password=await get_password_hash(PASSWORD),
+            email_confirmed=True
+        )
+
+
+async def _probe(
+    client: httpx.AsyncClient,
+    deadline: float,
+    latencies: list[float]
+) -> None:
+    while time.perf_counter() < deadline:
+        latencies.append(await timed(lambda: client.get('/api/v1/genres')))
+        await asyncio.sleep(0.01)
+
+
+async def _login(
+    client: httpx.AsyncClient,
+    deadline: float,
+    latencies: list[float]
+) -> None:
+    while time.perf_counter() < deadline:
+        latencies.append(await timed(lambda: client.post(
+            '/api/v1/auth/token',
+            json={'username': 'benchmark', 'password': PASSWORD}
+        )))
+
+
+async def _sample_queue(deadline: float, depths: list[int]) -> None:
+    while time.perf_counter() < deadline:
+        depths.append(get_password_hash_stats()['queued'])
+        await asyncio.sleep(0.05)
+
+
+async def main(duration: float, concurrency: int) -> None:
+    create_tables()
+    await database.connect()
+    await _seed()
+
+    async with httpx.AsyncClient(app=app, base_url='http://bench') as client:
+        idle = []
+        await _probe(client, time.perf_counter() + duration / 2, idle)
+
+        probes, logins, depths = [], [], []
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            _probe(client, deadline, probes),
+            _sample_queue(deadline, depths),
+            *(_login(client, deadline, logins) for _ in range(concurrency))
+        )
+
+    await database.disconnect()
+
+    report('GET /genres (idle)', idle)
+    report('GET /genres (under login load)', probes)
+    report('POST /auth/token', logins)
+    print('login throughput: {:.1f}/s, max hash queue depth: {}'.format(
+        len(logins) / duration,
+        max(depths, default=0)
+    ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.duration, args.concurrency))
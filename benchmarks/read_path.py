@@ -0,0 +1,126 @@
+"""Latency and peak memory of ORM hydration vs Core rows for track lists.
+
+    python -m benchmarks.read_path --albums 100 --tracks 15 --rounds 20
+
+Compares TrackRepository.all, which builds ormar models for every track,
+artist, album, genre and image, with TrackRepository.all_rows, which
+returns the same data as nested dicts built straight from a Core select.
+"""
+import asyncio
+import argparse
+import tracemalloc
+
+from benchmarks.base import create_tables, report, setup_environment, timed
+
+setup_environment()
+
+from src.core.db import database
+from src.app.user.models import User
+from src.app.music.models import Album, Genre, Image, Track
+from src.app.music.repositories import TrackRepository
+
+
+async def _seed(albums: int, tracks: int) -> None:
+    if await Track.objects.exists():
+        return
+
+    await database.execute(User.Meta.table.insert().values([
+        {
+            'id': id,
+            'username': 'artist{}'.format(id),
+            'email': 'artist{}@example.com'.format(id),
+            'hashed_password': 'benchmark',
+            'email_confirmed': True,
+            'is_active': True,
+            'is_superuser': False
+        }
+        for id in range(1, 11)
+    ]))
+    await database.execute(
+        Genre.Meta.table.insert().values(id=1, title='benchmark')
+    )
+    await database.execute(Album.Meta.table.insert().values([
+        {
+            'id': id,
+            'title': 'Album {}'.format(id),
+            'artist': id % 10 + 1,
+            'genre': 1,
+            'album_type': 'album',
+            'duration_ms': 1000 * tracks,
+            'track_count': tracks,
+            'saved_count': 0,
+            'version': 1
+        }
+        for id in range(1, albums + 1)
+    ]))
+    await database.execute(Image.Meta.table.insert().values([
+        {
+            'id': id,
+            'url': 'media/img/{}.jpg'.format(id),
+            'size': 'small' if id % 2 else 'normal'
+        }
+        for id in range(1, albums * 2 + 1)
+    ]))
+    await database.execute(
+        Album.Meta.model_fields['images'].through.Meta.table.insert().values([
+            {'album': (id + 1) // 2, 'image': id}
+            for id in range(1, albums * 2 + 1)
+        ])
+    )
+    for album_id in range(1, albums + 1):
+        await database.execute(Track.Meta.table.insert().values([
+            {
+                'title': 'Track {} of album {}'.format(number, album_id),
+                'artist': album_id % 10 + 1,
+                'album': album_id,
+                'file': 'benchmark.mp3',
+                'is_playable': True,
+                'explicit': False,
+                'text': 'Lyrics line\n' * 20,
+                'duration_ms': 1000,
+                'number': number,
+                'saved_count': 0,
+                'version': 1
+            }
+            for number in range(1, tracks + 1)
+        ]))
+
+
+async def _measure_peak(func) -> tuple[int, int]:
+    tracemalloc.start()
+    result = await func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(result), peak
+
+
+async def main(albums: int, tracks: int, rounds: int) -> None:
+    create_tables()
+    await database.connect()
+    await _seed(albums, tracks)
+
+    paths = {
+        'TrackRepository.all': TrackRepository.all,
+        'TrackRepository.all_rows': TrackRepository.all_rows
+    }
+    for name, func in paths.items():
+        await func()
+        latencies = [await timed(func) for _ in range(rounds)]
+        count, peak = await _measure_peak(func)
+        report(name, latencies)
+        print('{:<32} {} tracks, peak memory {:.1f} MiB'.format(
+            '',
+            count,
+            peak / 1024 / 1024
+        ))
+
+    await database.disconnect()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--albums', type=int, default=100)
+    parser.add_argument('--tracks', type=int, default=15)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.albums, args.tracks, args.rounds))
@@ -0,0 +1,134 @@
+"""Serialization cost of an AlbumList page: response validation vs fast path.
+
+    python -m benchmarks.serialization --albums 50 --tracks 15 --rounds 200
+
+Feeds the same album page dicts, shaped like ormar's .dict() output, to
+FastAPI's response_model serialization and to the FAST_JSON_RESPONSES path,
+and checks that both produce the same JSON.
+"""
+import json
+import asyncio
+import argparse
+from datetime import date, datetime
+
+from benchmarks.base import report, setup_environment, timed
+
+setup_environment()
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from src.core.responses import shape_response
+from src.app.music import schemas
+
+
+def _get_artist(id: int) -> dict:
+    return {
+        'id': id,
+        'username': 'artist{}'.format(id),
+        'email': 'artist{}@example.com'.format(id),
+        'email_confirmed': True,
+        'hashed_password': '$2b$12$' + 'x' * 53,
+        'avatar': None,
+        'about': 'About artist {}'.format(id),
+        'date_joined': datetime(2022, 4, 1, 12, 30, 15, 123456),
+        'is_active': True,
+        'invalidate_before': datetime(2022, 4, 1, 12, 30, 15),
+        'is_superuser': False
+    }
+
+
+def _get_track(album_id: int, number: int) -> dict:
+    return {
+        'id': album_id * 100 + number,
+        'title': 'Track {} of album {}'.format(number, album_id),
+        'artist': _get_artist(album_id % 7 + 1),
+        'album': {'id': album_id},
+        'file': 'media/audio/{}/{}.mp3'.format(album_id, number),
+        'is_playable': True,
+        'explicit': number % 3 == 0,
+        'text': 'Lyrics line\n' * 20,
+        'duration_ms': 180000 + number,
+        'number': number,
+        'saved_count': number
+    }
+
+
+def _get_album(id: int, tracks: int) -> dict:
+    return {
+        'id': id,
+        'title': 'Album {}'.format(id),
+        'artist': _get_artist(id % 7 + 1),
+        'genre': {'id': 1, 'title': 'rock'},
+        'album_type': 'album',
+        'release_date': date(2022, 4, 1),
+        'images': [
+            {'id': id * 2 + i, 'url': 'media/img/{}/{}.jpg'.format(id, size),
+             'size': size}
+            for i, size in enumerate(('small', 'normal'))
+        ],
+        'duration_ms': 180000 * tracks,
+        'track_count': tracks,
+        'saved_count': id,
+        'tracks': {
+            'items': [_get_track(id, n) for n in range(1, tracks + 1)],
+            'href': 'http://bench/api/v1/albums/{}/tracks'.format(id),
+            'next_page': None,
+            'previous_page': None,
+            'offset': 0,
+            'limit': tracks,
+            'total': tracks
+        }
+    }
+
+
+def _get_page(albums: int, tracks: int) -> dict:
+    return {
+        'items': [_get_album(id, tracks) for id in range(1, albums + 1)],
+        'href': 'http://bench/api/v1/albums?offset=0&limit={}'.format(albums),
+        'next_page': None,
+        'previous_page': None,
+        'offset': 0,
+        'limit': albums,
+        'total': albums
+    }
+
+
+async def main(albums: int, tracks: int, rounds: int) -> None:
+    page = _get_page(albums, tracks)
+    field = create_response_field('Response_get_albums', schemas.AlbumList)
+
+    async def validated() -> bytes:
+        return JSONResponse(await serialize_response(
+            field=field,
+            response_content=page
+        )).body
+
+    async def fast() -> bytes:
+        return ORJSONResponse(shape_response(schemas.AlbumList, page)).body
+
+    assert json.loads(await validated()) == json.loads(await fast())
+
+    validated_latencies = [await timed(validated) for _ in range(rounds)]
+    fast_latencies = [await timed(fast) for _ in range(rounds)]
+
+    print('AlbumList: {} albums x {} tracks, {} bytes'.format(
+        albums,
+        tracks,
+        len(await fast())
+    ))
+    report('response_model validation', validated_latencies)
+    report('FAST_JSON_RESPONSES', fast_latencies)
+    print('speedup: {:.1f}x'.format(
+        sum(validated_latencies) / sum(fast_latencies)
+    ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--albums', type=int, default=50)
+    parser.add_argument('--tracks', type=int, default=15)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.albums, args.tracks, args.rounds))
@@ -0,0 +1,176 @@
+"""Catalog read throughput on SQLite while uploads are writing.
+
+    python -m benchmarks.sqlite_concurrency --duration 5 --readers 16
+
+Runs the same workload twice against fresh database files: once with
+SQLite's defaults (rollback journal, synchronous=FULL) and once with the
+SQLITE_* profile from settings that src.core.db applies to every
+connection.
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+
+from benchmarks.base import _tmp_dir, report, setup_environment, timed
+
+setup_environment()
+
+import sqlalchemy
+
+from src.config import settings
+from src.core.base_meta import BaseMeta
+from src.core.db import Database, get_database_options
+from src.app.user.models import User
+from src.app.music.models import Album, Genre, Track
+
+PAGE_SIZE = 20
+BATCH_SIZE = 50
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'mmap_size': 0,
+    'cache_size': -2000
+}
+
+
+def _create_database(name: str, pragmas: dict) -> Database:
+    url = 'sqlite:///{}'.format(os.path.join(_tmp_dir, name))
+    engine = sqlalchemy.create_engine(url)
+    BaseMeta.metadata.create_all(engine)
+    engine.dispose()
+    options = get_database_options(url)
+    options['pragmas'] = pragmas
+    return Database(url, **options)
+
+
+def _get_rows(start: int, count: int) -> list[dict]:
+    return [
+        {
+            'title': 'track {}'.format(number),
+            'artist': 1,
+            'album': 1,
+            'file': 'benchmark.mp3',
+            'is_playable': True,
+            'explicit': False,
+            'duration_ms': 1000,
+            'number': number,
+            'saved_count': 0,
+            'version': 1
+        }
+        for number in range(start, start + count)
+    ]
+
+
+async def _seed(database: Database, tracks: int) -> None:
+    await database.execute(User.Meta.table.insert().values(
+        id=1,
+        username='benchmark',
+        email='benchmark@example.com',
+        hashed_password='benchmark',
+        email_confirmed=True,
+        is_active=True,
+        is_superuser=False
+    ))
+    await database.execute(Genre.Meta.table.insert().values(
+        id=1,
+        title='benchmark'
+    ))
+    await database.execute(Album.Meta.table.insert().values(
+        id=1,
+        title='benchmark',
+        artist=1,
+        genre=1,
+        album_type='album',
+        duration_ms=0,
+        track_count=0,
+        saved_count=0,
+        version=1
+    ))
+    table = Track.Meta.table
+    for start in range(1, tracks + 1, 500):
+        await database.execute(
+            table.insert().values(_get_rows(start, min(500, tracks - start + 1)))
+        )
+
+
+async def _read(
+    database: Database,
+    tracks: int,
+    deadline: float,
+    latencies: list[float]
+) -> None:
+    table = Track.Meta.table
+    query = sqlalchemy.select([table]).order_by(table.c.id).limit(PAGE_SIZE)
+    while time.perf_counter() < deadline:
+        latencies.append(await timed(lambda: database.fetch_all(
+            query.offset(random.randrange(tracks - PAGE_SIZE))
+        )))
+
+
+async def _write(
+    database: Database,
+    deadline: float,
+    latencies: list[float]
+) -> None:
+    table = Track.Meta.table
+    while time.perf_counter() < deadline:
+        async def upload() -> None:
+            async with database.transaction():
+                for row in _get_rows(1, BATCH_SIZE):
+                    await database.execute(table.insert().values(row))
+        latencies.append(await timed(upload))
+
+
+async def _run(
+    name: str,
+    pragmas: dict,
+    duration: float,
+    readers: int,
+    writers: int,
+    tracks: int
+) -> None:
+    database = _create_database('{}.sqlite'.format(name), pragmas)
+    await database.connect()
+    await _seed(database, tracks)
+
+    reads, writes = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(_read(database, tracks, deadline, reads) for _ in range(readers)),
+        *(_write(database, deadline, writes) for _ in range(writers))
+    )
+    await database.disconnect()
+
+    print('{}: {}'.format(name, ', '.join(
+        '{}={}'.format(key, value) for key, value in pragmas.items()
+    )))
+    report('  read page of {} tracks'.format(PAGE_SIZE), reads)
+    report('  upload of {} tracks'.format(BATCH_SIZE), writes)
+    print('  read throughput: {:.1f}/s, uploads: {:.1f}/s'.format(
+        len(reads) / duration,
+        len(writes) / duration
+    ))
+
+
+async def main(
+    duration: float,
+    readers: int,
+    writers: int,
+    tracks: int
+) -> None:
+    tuned = get_database_options(settings.DATABASE_URL)['pragmas']
+    await _run('default', DEFAULT_PRAGMAS, duration, readers, writers, tracks)
+    await _run('tuned', tuned, duration, readers, writers, tracks)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=16)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--tracks', type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.duration, args.readers, args.writers, args.tracks))
@@ -7,9 +7,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from scripts.base import CommandManager
 from scripts.runserver import runserver_manager
 from scripts.createsuperuser import createsuperuser_manager
+from scripts.reconcilecounters import reconcilecounters_manager
+from scripts.rebuildsearchindex import rebuildsearchindex_manager
 from src.config import settings
 from src.core.db import database
+from src.core.cache import response_cache
+from src.core.compression import CompressionMiddleware
+from src.core.suggest import suggest_index
+from src.utils.image import shutdown_image_executor
 from src.app.routers import app_router
+from src.app.search.services import SuggestService
 
 app = FastAPI(
     title='FastAPI Music',
@@ -27,6 +34,11 @@ async def startup() -> None:
     database_ = app.state.database
     if not database_.is_connected:
         await database_.connect()
+    if settings.REDIS_URL:
+        response_cache.connect(settings.REDIS_URL)
+        suggest_index.connect(settings.REDIS_URL)
+    await SuggestService.build()
+    suggest_index.start(SuggestService.build)
 
 
 @app.on_event("shutdown")
@@ -34,6 +46,9 @@ async def shutdown() -> None:
     database_ = app.state.database
     if database_.is_connected:
         await database_.disconnect()
+    await response_cache.disconnect()
+    await suggest_index.disconnect()
+    shutdown_image_executor()
 
 
 app.add_middleware(
@@ -43,6 +58,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"]
 )
+if settings.RESPONSE_COMPRESSION:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.GZIP_COMPRESS_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+        exclude_paths=('/media',)
+    )
 
 app.include_router(app_router)
 
@@ -51,6 +74,8 @@ if __name__ == '__main__':
     command_manager = CommandManager()
     command_manager.include_manager(runserver_manager)
     command_manager.include_manager(createsuperuser_manager)
+    command_manager.include_manager(reconcilecounters_manager)
+    command_manager.include_manager(rebuildsearchindex_manager)
 
     kwargs = vars(command_manager.parse_args())
     command, func = kwargs.pop('command'), kwargs.pop('func')
@@ -1,4 +1,4 @@
-from typing import Any, Callable, Iterable, Sequence, Type
+from typing import Any, Callable, Sequence, Type
 from argparse import Action, ArgumentParser, HelpFormatter
 
 from pydantic import BaseModel
@@ -11,7 +11,7 @@ class Argument(BaseModel):
     const: Any = None
     default: Any = None
     type: Callable = None
-    choices: Iterable[Any] | None = None
+    choices: Sequence[Any] | None = None
     required: bool | None = None
     help: str | None = None
     metavar: str | tuple[str, ...] | None = None
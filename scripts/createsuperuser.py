@@ -27,6 +27,6 @@ async def createsuperuser() -> None:
     else:
         await UserService.create(
             **schema.dict(exclude={'password'}),
-            hashed_password=get_password_hash(schema.password)
+            hashed_password=await get_password_hash(schema.password)
         )
         print('Superuser has been successfully created')
@@ -0,0 +1,15 @@
+from scripts.base import CommandManager
+from src.core.db import database
+from src.app.search.services import SearchService
+
+rebuildsearchindex_manager = CommandManager()
+
+
+@rebuildsearchindex_manager.add_command(
+    'rebuildsearchindex',
+    description='Rebuilds the full-text search index'
+)
+async def rebuildsearchindex() -> None:
+    async with database:
+        await SearchService.rebuild()
+    print('Search index has been rebuilt')
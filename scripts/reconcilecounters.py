@@ -0,0 +1,44 @@
+from scripts.base import Argument, CommandManager
+from src.config import settings
+from src.core.db import database
+from src.core.cache import response_cache
+from src.app.music.services import AlbumService, PlaylistService, TrackService
+
+reconcilecounters_manager = CommandManager()
+
+
+@reconcilecounters_manager.add_command(
+    'reconcilecounters',
+    description='Recomputes album, track and playlist counters',
+    arguments=[
+        Argument(
+            name_or_flags='--batch-size',
+            default=500,
+            type=int,
+            help='Rows updated per statement'
+        )
+    ]
+)
+async def reconcilecounters(*, batch_size: int = 500) -> None:
+    if settings.REDIS_URL:
+        response_cache.connect(settings.REDIS_URL)
+
+    async with database:
+        for service in (AlbumService, TrackService, PlaylistService):
+            reconciled, last_id = 0, 0
+            while True:
+                async with database.transaction():
+                    next_id = await service.reconcile_counters(
+                        last_id,
+                        batch_size
+                    )
+                if next_id is None:
+                    break
+                reconciled += 1
+                last_id = next_id
+            await service.invalidate_responses()
+            print('{}: {} batches reconciled'.format(
+                service._repository._model.get_name(lower=False),
+                reconciled
+            ))
+    await response_cache.disconnect()
@@ -25,6 +25,54 @@ runserver_manager = CommandManager()
             default=8000,
             type=int,
             help='Port'
+        ),
+        Argument(
+            name_or_flags='--workers',
+            default=1,
+            type=int,
+            help='Number of worker processes, ignored with --reload'
+        ),
+        Argument(
+            name_or_flags='--loop',
+            default='auto',
+            choices=['auto', 'asyncio', 'uvloop'],
+            help='Event loop implementation'
+        ),
+        Argument(
+            name_or_flags='--http',
+            default='auto',
+            choices=['auto', 'h11', 'httptools'],
+            help='HTTP protocol implementation'
+        ),
+        Argument(
+            name_or_flags='--backlog',
+            default=2048,
+            type=int,
+            help='Maximum number of pending connections'
+        ),
+        Argument(
+            name_or_flags='--timeout-keep-alive',
+            default=5,
+            type=int,
+            help='Close keep-alive connections idle for this many seconds'
+        ),
+        Argument(
+            name_or_flags='--limit-concurrency',
+            type=int,
+            help='Respond with 503 once a worker has this many '
+                 'connections or tasks in flight'
+        ),
+        Argument(
+            name_or_flags='--limit-max-requests',
+            type=int,
+            help='Replace a worker after it has served this many requests, '
+                 'needs --workers above 1'
+        ),
+        Argument(
+            name_or_flags='--timeout-graceful-shutdown',
+            default=30,
+            type=int,
+            help='Seconds to wait for in-flight requests on shutdown'
         )
     ]
 )
@@ -32,6 +80,33 @@ def runserver(
     *,
     host: str | None = None,
     port: int | None = None,
-    reload: bool | None = None
+    reload: bool | None = None,
+    workers: int = 1,
+    loop: str = 'auto',
+    http: str = 'auto',
+    backlog: int = 2048,
+    timeout_keep_alive: int = 5,
+    limit_concurrency: int | None = None,
+    limit_max_requests: int | None = None,
+    timeout_graceful_shutdown: int | None = None
 ) -> None:
-    uvicorn.run('main:app', host=host, port=port, reload=reload)
+    if limit_max_requests is not None and (reload or workers < 2):
+        # A single process just exits at the limit, only the multi-worker
+        # supervisor starts a replacement
+        print('--limit-max-requests needs --workers above 1 and no --reload')
+        return
+
+    uvicorn.run(
+        'main:app',
+        host=host,
+        port=port,
+        reload=reload,
+        workers=None if reload else workers,
+        loop=loop,
+        http=http,
+        backlog=backlog,
+        timeout_keep_alive=timeout_keep_alive,
+        limit_concurrency=limit_concurrency,
+        limit_max_requests=limit_max_requests,
+        timeout_graceful_shutdown=timeout_graceful_shutdown
+    )
@@ -7,7 +7,6 @@ from src.app.auth.http import (
 )
 from src.app.auth.tokens import AccessToken
 from src.app.base.schemas import ExceptionMessage
-from src.app.user.services import UserService
 from src.app.user.models import User
 
 
@@ -21,15 +20,13 @@ async def get_current_user(
 
     try:
         access_token = AccessToken(token)
-        await access_token.verify()
-        user_id = access_token.user_id
+        user = await access_token.verify()
     except JWTError:
         raise HTTPException(
             status_code=403,
             detail='Invalid token'
         )
 
-    user = await UserService.get_object_or_404(pk=user_id)
     return user
 
 
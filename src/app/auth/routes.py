@@ -57,7 +57,8 @@ async def refresh(schema: schemas.RefreshToken):
             'description': 'Successful logout from all devices'
         },
         **token_responses
-    }
+    },
+    response_class=Response
 )
 async def logout_from_all_devices(
     credentials: HTTPAuthorizationCredentials = Security(security)
@@ -116,7 +117,8 @@ async def resend_email_confirmation(schema: schemas.Email, task: BackgroundTasks
             'description': 'Bad request or user doesn\'t have enough '
                 'privileges'
         }
-    }
+    },
+    response_class=Response
 )
 async def reset_password(schema: schemas.PasswordReset):
     await services.reset_user_password(
@@ -133,7 +135,8 @@ async def reset_password(schema: schemas.PasswordReset):
             'description': 'Password changed successfully'
         },
         **token_responses
-    }
+    },
+    response_class=Response
 )
 async def change_password(
     passwords: schemas.PasswordChange,
@@ -15,7 +15,7 @@ from src.app.auth.tokens import (
 from src.app.user.models import User
 from src.app.user.services import UserService
 from src.app.auth.jwt import generate_refresh_token
-from src.app.auth.schemas import Email, PasswordChange, UserCreate, UserLogin
+from src.app.auth.schemas import Email, UserCreate, UserLogin
 from src.utils.email import send_email_confirmation, send_password_reset
 
 
@@ -32,7 +32,7 @@ async def register_user(user: UserCreate, task: BackgroundTasks) -> None:
 
     user_db = await UserService.create(
         **user.dict(exclude={'password'}),
-        hashed_password=get_password_hash(user.password)
+        hashed_password=await get_password_hash(user.password)
     )
 
     task.add_task(
@@ -62,12 +62,16 @@ async def confirm_user_email(token: str):
     user: User = await email_confirmation_token.verify()
 
     await user.update(email_confirmed=True)
+    UserService.invalidate_cache(user.id)
 
 
 async def authenticate_user(schema: UserLogin) -> User:
     user: User = await UserService.get_object_or_none(username=schema.username)
 
-    if not user or not verify_password(schema.password, user.hashed_password):
+    if not user or not await verify_password(
+        schema.password,
+        user.hashed_password
+    ):
         raise HTTPException(
             status_code=401,
             detail='Incorrect username or password',
@@ -90,23 +94,29 @@ async def logout_user_from_all_devices(token: str) -> None:
     user = await access_token.verify()
 
     await user.update(invalidate_before=datetime.utcnow())
+    UserService.invalidate_cache(user.id)
 
 
-async def change_user_password(token: str, schema: PasswordChange) -> None:
+async def change_user_password(
+    token: str,
+    raw_old_password: str,
+    raw_new_password: str
+) -> None:
     access_token = AccessToken(token)
     user = await access_token.verify()
 
-    if not verify_password(schema.raw_old_password, user.hashed_password):
+    if not await verify_password(raw_old_password, user.hashed_password):
         raise HTTPException(
             status_code=403,
             detail='Wrong old password'
         )
 
-    new_hashed_password = get_password_hash(schema.raw_new_password)
+    new_hashed_password = await get_password_hash(raw_new_password)
     await user.update(
         hashed_password=new_hashed_password,
         invalidate_before=datetime.utcnow()
     )
+    UserService.invalidate_cache(user.id)
 
 
 async def refresh_access_token(token: str) -> dict:
@@ -134,9 +144,10 @@ async def recover_user_password(email: str, task: BackgroundTasks) -> None:
 
 async def reset_user_password(token: str, new_raw_password: str) -> None:
     user: User = await PasswordResetToken(token).verify()
-    new_hashed_password = get_password_hash(new_raw_password)
+    new_hashed_password = await get_password_hash(new_raw_password)
 
     await user.update(
         hashed_password=new_hashed_password,
         invalidate_before=datetime.utcnow()
     )
+    UserService.invalidate_cache(user.id)
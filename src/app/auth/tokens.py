@@ -31,7 +31,7 @@ class Token:
         return int(self._get_sub())
 
     async def verify(self) -> User:
-        user: User = await UserService.get_object_or_404(pk=self.user_id)
+        user: User = await self._get_user()
 
         if (not self._is_token_type_valid() or
                 not self._is_iat_valid(user.invalidate_before)):
@@ -39,6 +39,9 @@ class Token:
 
         return user
 
+    async def _get_user(self) -> User:
+        return await UserService.get_object_or_404(pk=self.user_id)
+
     def _get(self, key) -> str:
         try:
             val = self._payload[key]
@@ -72,6 +75,9 @@ class AccessToken(Token):
     _token_type: str = settings.ACCESS_TOKEN_TYPE
     _secret_key: str = settings.ACCESS_TOKEN_SECRET_KEY
 
+    async def _get_user(self) -> User:
+        return await UserService.get_cached_object_or_404(self.user_id)
+
 
 class RefreshToken(Token):
     _token_type: str = settings.REFRESH_TOKEN_TYPE
@@ -1,6 +1,10 @@
-from typing import Sequence
+import json
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, Sequence
 
 from ormar import Model
+from fastapi import HTTPException
 from starlette.datastructures import URL
 
 
@@ -10,13 +14,27 @@ def paginate(
     limit: int,
     url: URL
 ):
-    total = len(items)
+    return build_page(
+        items[offset : offset + limit],
+        len(items),
+        offset,
+        limit,
+        url
+    )
 
+
+def build_page(
+    items: Sequence[Model],
+    total: int,
+    offset: int,
+    limit: int,
+    url: URL
+):
     next_page = _get_next_page(url, offset, limit, total)
     previous_page = _get_previous_page(url, offset, limit)
 
     return {
-        'items': items[offset : offset + limit],
+        'items': items,
         'href': str(url),
         'next_page': next_page,
         'previous_page': previous_page,
@@ -26,8 +44,53 @@ def paginate(
     }
 
 
+def build_cursor_page(
+    items: Sequence[Model],
+    total: int,
+    limit: int,
+    url: URL,
+    next_cursor: tuple[Any, int] | None
+):
+    next_page = str(url.include_query_params(
+        cursor=encode_cursor(next_cursor),
+        limit=limit
+    )) if next_cursor else None
+
+    return {
+        'items': items,
+        'href': str(url),
+        'next_page': next_page,
+        'previous_page': None,
+        'offset': None,
+        'limit': limit,
+        'total': total
+    }
+
+
+def encode_cursor(cursor: tuple[Any, int]) -> str:
+    return urlsafe_b64encode(
+        json.dumps(cursor, default=str, separators=(',', ':')).encode()
+    ).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int] | None:
+    if not cursor:
+        return None
+
+    try:
+        sort_value, pk = json.loads(
+            urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+
+    if not isinstance(pk, int):
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+    return sort_value, pk
+
+
 def _get_next_page(url: URL, offset: int, limit: int, total: int) -> str:
-    return str(url.replace_query_params(
+    return str(url.include_query_params(
         offset=offset + limit,
         limit=limit
     )) if total > limit + offset else None
@@ -36,12 +99,12 @@ def _get_next_page(url: URL, offset: int, limit: int, total: int) -> str:
 def _get_previous_page(url: URL, offset: int, limit: int) -> str:
     if offset != 0:
         if offset >= limit:
-            previous_page = str(url.replace_query_params(
+            previous_page = str(url.include_query_params(
                 offset=offset - limit,
                 limit=limit
             ))
         else:
-            previous_page = str(url.replace_query_params(
+            previous_page = str(url.include_query_params(
                 offset=0,
                 limit=offset
             ))
@@ -0,0 +1,155 @@
+from collections import defaultdict
+from typing import Any, Iterable, Sequence
+
+import sqlalchemy
+from ormar import Model, QuerySet
+
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+async def prefetch_related(
+    objs: list[Model],
+    relation: str,
+    queryset: QuerySet | None = None,
+    limit: int | None = None,
+    order_by: Sequence[str] = ()
+) -> None:
+    """Load a many-to-many or reverse foreign key relation of objs with
+    one query per chunk of parents.
+
+    With limit only the first limit related objects of each parent are
+    loaded. order_by names the fields of the link model (the through model,
+    or the related model for a reverse foreign key) they are ranked by, the
+    related primary key by default.
+    """
+    *path, name = relation.split('__')
+    parents = _follow(objs, path)
+    if not parents:
+        return
+
+    model = type(parents[0])
+    field = model.Meta.model_fields[name]
+    queryset = queryset if queryset is not None else field.to.objects
+    ids = list({parent.pk for parent in parents})
+
+    if field.is_multi or limit is not None:
+        related = await _load_links(field, ids, queryset, limit, order_by)
+    else:
+        related = await _load_reverse_foreign_key(model, field, ids, queryset)
+
+    for parent in parents:
+        setattr(parent, name, related.get(parent.pk, []))
+
+
+def _follow(objs: Iterable[Model], path: list[str]) -> list[Model]:
+    for name in path:
+        objs = [
+            related for related in (getattr(obj, name) for obj in objs)
+            if related is not None
+        ]
+    return list(objs)
+
+
+def chunks(values: list[Any]) -> Iterable[list[Any]]:
+    for i in range(0, len(values), IN_CLAUSE_CHUNK_SIZE):
+        yield values[i : i + IN_CLAUSE_CHUNK_SIZE]
+
+
+def _get_link_model(field: Any) -> type[Model]:
+    return field.through if field.is_multi else field.to
+
+
+def get_link_columns(field: Any) -> tuple[sqlalchemy.Column, sqlalchemy.Column]:
+    if field.is_multi:
+        source_name = field.default_source_field_name()
+        target_name = field.default_target_field_name()
+    else:
+        source_name = field.get_related_name()
+        target_name = field.to.Meta.pkname
+    return _get_link_column(field, source_name), \
+        _get_link_column(field, target_name)
+
+
+def _get_link_column(field: Any, name: str) -> sqlalchemy.Column:
+    link_model = _get_link_model(field)
+    return link_model.Meta.table.c[
+        link_model.Meta.model_fields[name].get_alias()
+    ]
+
+
+async def select_links(
+    field: Any,
+    ids: list[int],
+    limit: int | None = None,
+    order_by: Sequence[str] = ()
+) -> list[Any]:
+    """(source id, target id) rows of field for the parents in ids, at most
+    limit per parent, in order_by order within each parent.
+    """
+    source, target = get_link_columns(field)
+    order = [_get_link_column(field, name) for name in order_by] or [target]
+    database = field.to.Meta.database
+
+    rows = []
+    for chunk in chunks(ids):
+        if limit is None:
+            query = sqlalchemy.select([source, target])\
+                .where(source.in_(chunk))\
+                .order_by(*order)
+        else:
+            position = sqlalchemy.func.row_number().over(
+                partition_by=source,
+                order_by=order
+            ).label('position')
+            ranked = sqlalchemy.select([source, target, position])\
+                .where(source.in_(chunk))\
+                .subquery()
+            query = sqlalchemy.select([
+                ranked.c[source.name],
+                ranked.c[target.name]
+            ])\
+                .where(ranked.c.position <= limit)\
+                .order_by(ranked.c.position)
+        rows.extend(await database.fetch_all(query))
+    return rows
+
+
+async def _load_links(
+    field: Any,
+    ids: list[int],
+    queryset: QuerySet,
+    limit: int | None,
+    order_by: Sequence[str] = ()
+) -> dict[int, list[Model]]:
+    rows = await select_links(field, ids, limit, order_by)
+    target_ids = list({row[1] for row in rows})
+    targets = {}
+    for chunk in chunks(target_ids):
+        for obj in await queryset.filter(**{
+            '{}__in'.format(field.to.Meta.pkname): chunk
+        }).all():
+            targets[obj.pk] = obj
+
+    # Index the rows: asyncpg records iterate over their keys, not values
+    related = defaultdict(list)
+    for row in rows:
+        if row[1] in targets:
+            related[row[0]].append(targets[row[1]])
+    return related
+
+
+async def _load_reverse_foreign_key(
+    model: type[Model],
+    field: Any,
+    ids: list[int],
+    queryset: QuerySet
+) -> dict[int, list[Model]]:
+    foreign_key = field.get_related_name()
+
+    related = defaultdict(list)
+    for chunk in chunks(ids):
+        for obj in await queryset.filter(**{
+            '{}__{}__in'.format(foreign_key, model.Meta.pkname): chunk
+        }).all():
+            related[getattr(obj, foreign_key).pk].append(obj)
+    return related
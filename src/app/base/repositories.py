@@ -1,15 +1,379 @@
-from typing import Type, TypeVar
+from typing import Any, Type, TypeVar
 
-from ormar import Model
-from pydantic import BaseModel
+import ormar
+import sqlalchemy
+from ormar import Model, QuerySet
+from sqlalchemy.dialects import postgresql, sqlite
+from pydantic import BaseModel, parse_obj_as
+
+from src.app.base.rows import (
+    RowPrefetch,
+    expand_paths,
+    get_columns,
+    join_relations,
+    prefetch_rows,
+    select_rows
+)
+from src.app.base.sparse import SparseFields
 
 
 class ModelRepository:
     _model: Type[Model] = None
+    _cursor_field: str | None = None
+    _row_relations: tuple[str, ...] = ()
+    _row_prefetch: RowPrefetch = {}
+    _row_prefetch_options: dict[str, dict[str, Any]] = {}
+    _row_item_path: str = ''
+    _deferred_fields: tuple[str, ...] = ()
+    _version_relations: tuple[str, ...] = ()
+    _version_timestamp: str | None = None
+
+    @classmethod
+    def _get_queryset(cls) -> QuerySet:
+        return cls._model.objects
+
+    @classmethod
+    def _get_list_queryset(cls) -> QuerySet:
+        queryset = cls._get_queryset()
+        if cls._deferred_fields:
+            queryset = queryset.exclude_fields(list(cls._deferred_fields))
+        return queryset
+
+    @classmethod
+    async def _prefetch(cls, objs: list[Model]) -> None:
+        pass
+
+    @classmethod
+    async def _prefetch_page(cls, objs: list[Model]) -> None:
+        await cls._prefetch(objs)
+
+    @classmethod
+    def _to_items(cls, objs: list[Model]) -> list[Model]:
+        return objs
+
+    @classmethod
+    async def _fetch(cls, queryset: QuerySet) -> list[Model]:
+        objs = await queryset.all()
+        await cls._prefetch(objs)
+        return objs
 
     @classmethod
     async def all(cls, **kwargs) -> list[Model]:
-        return await cls._model.objects.all(**kwargs)
+        return cls._to_items(
+            await cls._fetch(cls._get_list_queryset().filter(**kwargs))
+        )
+
+    @classmethod
+    async def slice(cls, offset: int, limit: int, **kwargs) -> list[Model]:
+        if not limit:
+            return []
+        objs = await cls._get_list_queryset()\
+            .filter(**kwargs)\
+            .order_by(cls._get_sort_fields())\
+            .offset(offset)\
+            .limit(limit)\
+            .all()
+        await cls._prefetch_page(objs)
+        return cls._to_items(objs)
+
+    @classmethod
+    def _get_sort_fields(cls) -> list[str]:
+        pkname = cls._model.Meta.pkname
+        if cls._cursor_field and cls._cursor_field != pkname:
+            return [cls._cursor_field, pkname]
+        return [pkname]
+
+    @classmethod
+    def parse_cursor(
+        cls,
+        cursor: tuple[Any, int] | None
+    ) -> tuple[Any, int] | None:
+        """Coerce the sort value of a decoded cursor to the type of
+        _cursor_field, raising ValueError when it does not fit.
+        """
+        if cursor is None:
+            return None
+        sort_value, pk = cursor
+        field = cls._model.Meta.model_fields[
+            cls._cursor_field or cls._model.Meta.pkname
+        ]
+        if sort_value is None:
+            raise ValueError('Cursor has no sort value')
+        return parse_obj_as(field.__type__, sort_value), pk
+
+    @classmethod
+    async def slice_after(
+        cls,
+        cursor: tuple[Any, int] | None,
+        limit: int,
+        **kwargs
+    ) -> tuple[list[Model], tuple[Any, int] | None]:
+        if not limit:
+            return [], cursor
+
+        pkname = cls._model.Meta.pkname
+        sort_field = cls._cursor_field or pkname
+
+        queryset = cls._get_list_queryset().filter(**kwargs)
+        if cursor:
+            queryset = queryset.filter(
+                cls._get_cursor_clause(sort_field, pkname, cursor)
+            )
+        objs = await queryset\
+            .order_by(cls._get_sort_fields())\
+            .limit(limit + 1)\
+            .all()
+
+        next_cursor = None
+        if len(objs) > limit:
+            objs = objs[:limit]
+            next_cursor = (getattr(objs[-1], sort_field), objs[-1].pk)
+        await cls._prefetch_page(objs)
+        return cls._to_items(objs), next_cursor
+
+    @classmethod
+    def _get_cursor_clause(
+        cls,
+        sort_field: str,
+        pkname: str,
+        cursor: tuple[Any, int]
+    ):
+        sort_value, pk = cursor
+        if sort_field == pkname:
+            return ormar.and_(**{'{}__gt'.format(pkname): pk})
+        return ormar.or_(
+            ormar.and_(**{
+                sort_field: sort_value,
+                '{}__gt'.format(pkname): pk
+            }),
+            **{'{}__gt'.format(sort_field): sort_value}
+        )
+
+    @classmethod
+    def _rows_to_items(cls, rows: list[dict]) -> list[dict]:
+        return rows
+
+    @classmethod
+    def _get_where(cls, **kwargs) -> list[Any]:
+        fields = cls._model.Meta.model_fields
+        table = cls._model.Meta.table
+        where = []
+        for key, value in kwargs.items():
+            name, _, related_pkname = key.partition('__')
+            field = fields[name]
+            if related_pkname and (
+                not field.is_relation
+                or related_pkname != field.to.Meta.pkname
+            ):
+                raise ValueError('Unsupported row filter: {}'.format(key))
+            if isinstance(value, Model):
+                value = value.pk
+            where.append(table.c[field.get_alias()] == value)
+        return where
+
+    @classmethod
+    def _get_column(cls, name: str) -> sqlalchemy.Column:
+        return cls._model.Meta.table.c[
+            cls._model.Meta.model_fields[name].get_alias()
+        ]
+
+    @classmethod
+    def _get_row_item(cls) -> tuple[str, type[Model]]:
+        prefix, model = '', cls._model
+        for name in filter(None, cls._row_item_path.split('__')):
+            model = model.Meta.model_fields[name].to
+            prefix += name + '__'
+        return prefix, model
+
+    @classmethod
+    def get_unknown_fields(
+        cls,
+        sparse: SparseFields,
+        deferred: bool = True
+    ) -> list[str]:
+        prefix, model = cls._get_row_item()
+        expands = {
+            path[len(prefix):] for path in expand_paths([
+                *cls._row_relations,
+                *cls._row_prefetch
+            ])
+            if path.startswith(prefix)
+        }
+        fields = {name for name, _, _ in get_columns(model)} | {
+            path.split('__')[0] for path in expands
+        }
+        if deferred:
+            fields -= {
+                path[len(prefix):] for path in cls._deferred_fields
+                if path.startswith(prefix)
+            }
+        return sorted(
+            (sparse.fields or set()) - fields
+        ) + sorted(
+            path.replace('__', '.')
+            for path in (sparse.expand or set()) - expands
+        )
+
+    @classmethod
+    def _get_row_options(
+        cls,
+        sparse: SparseFields | None,
+        cursor: bool = False
+    ) -> tuple[list[str], RowPrefetch, dict[str, set[str]] | None]:
+        if sparse is None:
+            return list(cls._row_relations), cls._row_prefetch, None
+
+        prefix, _ = cls._get_row_item()
+        expand = None if sparse.expand is None else set(
+            expand_paths(sparse.expand)
+        )
+
+        def is_requested(path: str) -> bool:
+            if not path.startswith(prefix):
+                return True
+            relative = path[len(prefix):]
+            return (
+                sparse.fields is None
+                or relative.split('__')[0] in sparse.fields
+            ) and (expand is None or relative in expand)
+
+        relations = [
+            path for path in expand_paths(cls._row_relations)
+            if is_requested(path)
+        ]
+        prefetch = {
+            relation: nested
+            for relation, nested in cls._row_prefetch.items()
+            if is_requested(relation)
+        }
+        fields = None
+        if sparse.fields is not None:
+            fields = {cls._row_item_path: set(sparse.fields)}
+            if cursor and cls._cursor_field and not cls._row_item_path:
+                fields[''].add(cls._cursor_field)
+        return relations, prefetch, fields
+
+    @classmethod
+    async def _fetch_rows(
+        cls,
+        *where: Any,
+        sparse: SparseFields | None = None,
+        deferred: bool = True,
+        cursor: bool = False,
+        **kwargs
+    ) -> list[dict]:
+        # Deferred fields are left out of lists, single rows keep them
+        deferred_fields = cls._deferred_fields if deferred else ()
+        relations, prefetch, fields = cls._get_row_options(sparse, cursor)
+        rows = await select_rows(
+            cls._model,
+            relations,
+            *where,
+            fields=fields,
+            deferred=deferred_fields,
+            **kwargs
+        )
+        for relation, nested in prefetch.items():
+            await prefetch_rows(
+                cls._model,
+                rows,
+                relation,
+                nested,
+                deferred=[
+                    path[len(relation) + 2:] for path in deferred_fields
+                    if path.startswith(relation + '__')
+                ],
+                **cls._row_prefetch_options.get(relation, {})
+            )
+        return rows
+
+    @classmethod
+    async def all_rows(
+        cls,
+        sparse: SparseFields | None = None,
+        **kwargs
+    ) -> list[dict]:
+        return cls._rows_to_items(await cls._fetch_rows(
+            *cls._get_where(**kwargs),
+            sparse=sparse
+        ))
+
+    @classmethod
+    async def get_row_or_none(
+        cls,
+        sparse: SparseFields | None = None,
+        **kwargs
+    ) -> dict | None:
+        rows = cls._rows_to_items(await cls._fetch_rows(
+            *cls._get_where(**kwargs),
+            sparse=sparse,
+            deferred=False,
+            limit=1
+        ))
+        return rows[0] if rows else None
+
+    @classmethod
+    async def slice_rows(
+        cls,
+        offset: int,
+        limit: int,
+        sparse: SparseFields | None = None,
+        **kwargs
+    ) -> list[dict]:
+        if not limit:
+            return []
+        return cls._rows_to_items(await cls._fetch_rows(
+            *cls._get_where(**kwargs),
+            sparse=sparse,
+            order_by=[cls._get_column(name) for name in cls._get_sort_fields()],
+            offset=offset,
+            limit=limit
+        ))
+
+    @classmethod
+    async def slice_rows_after(
+        cls,
+        cursor: tuple[Any, int] | None,
+        limit: int,
+        sparse: SparseFields | None = None,
+        **kwargs
+    ) -> tuple[list[dict], tuple[Any, int] | None]:
+        if not limit:
+            return [], cursor
+
+        pkname = cls._model.Meta.pkname
+        sort_field = cls._cursor_field or pkname
+        pk, sort = cls._get_column(pkname), cls._get_column(sort_field)
+
+        where = cls._get_where(**kwargs)
+        if cursor:
+            sort_value, last_pk = cursor
+            where.append(pk > last_pk if sort_field == pkname else sqlalchemy.or_(
+                sqlalchemy.and_(sort == sort_value, pk > last_pk),
+                sort > sort_value
+            ))
+        rows = await cls._fetch_rows(
+            *where,
+            sparse=sparse,
+            cursor=True,
+            order_by=[cls._get_column(name) for name in cls._get_sort_fields()],
+            limit=limit + 1
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][sort_field], rows[-1][pkname])
+        if sort_field != pkname and not cls._row_item_path \
+                and sparse is not None and sparse.fields is not None \
+                and sort_field not in sparse.fields:
+            for row in rows:
+                row.pop(sort_field, None)
+        return cls._rows_to_items(rows), next_cursor
+
+    @classmethod
+    async def count(cls, **kwargs) -> int:
+        return await cls._model.objects.filter(**kwargs).count()
 
     @classmethod
     async def get(cls, **kwargs) -> Model:
@@ -17,7 +381,10 @@ class ModelRepository:
 
     @classmethod
     async def get_object_or_none(cls, **kwargs) -> Model:
-        return await cls._model.objects.get_or_none(**kwargs)
+        obj = await cls._get_queryset().get_or_none(**kwargs)
+        if obj:
+            await cls._prefetch([obj])
+        return obj
 
     @classmethod
     async def create(cls, **kwargs) -> Model:
@@ -25,12 +392,146 @@ class ModelRepository:
 
     @classmethod
     async def update(cls, obj: Model, **kwargs) -> Model:
-        return await obj.update(**kwargs)
+        if not cls._is_versioned():
+            return await obj.update(**kwargs)
+        obj = await obj.update(
+            _columns=[
+                name for name in cls._model.Meta.model_fields
+                if name != 'version'
+            ],
+            **kwargs
+        )
+        await cls.touch(obj.pk)
+        return obj
+
+    @classmethod
+    async def create_or_ignore(cls, **kwargs) -> bool:
+        """Insert a row unless it conflicts with a unique constraint and
+        return whether it was inserted, without a racy lookup first.
+        """
+        values = {}
+        for name, field in cls._model.Meta.model_fields.items():
+            if name in kwargs:
+                value = kwargs[name]
+                values[field.get_alias()] = value.pk \
+                    if isinstance(value, Model) else value
+            elif not field.virtual and not field.is_multi \
+                    and field.has_default(use_server=False):
+                values[field.get_alias()] = field.get_default()
+
+        database = cls._model.Meta.database
+        dialect = postgresql if database.is_postgres else sqlite
+        return await database.execute_rowcount(
+            dialect.insert(cls._model.Meta.table)
+                .values(values)
+                .on_conflict_do_nothing()
+        ) == 1
 
     @classmethod
     async def delete(cls, **kwargs) -> None:
         await cls._model.objects.filter(**kwargs).delete()
 
+    @classmethod
+    async def delete_rowcount(cls, **kwargs) -> int:
+        return await cls._model.Meta.database.execute_rowcount(
+            cls._model.Meta.table.delete().where(*cls._get_where(**kwargs))
+        )
+
+    @classmethod
+    async def increment(cls, pk: Any, **deltas: int) -> None:
+        table = cls._model.Meta.table
+        await cls._increment(table.c[cls._model.Meta.pkname] == pk, **deltas)
+
+    @classmethod
+    async def touch(cls, *pks: Any) -> None:
+        await cls._increment(cls._get_column(cls._model.Meta.pkname).in_(pks))
+
+    @classmethod
+    async def _increment(cls, where: Any, **deltas: int) -> None:
+        table = cls._model.Meta.table
+        values = {
+            table.c[name]: table.c[name] + delta
+            for name, delta in deltas.items()
+        }
+        values.update(cls._get_version_values())
+        if not values:
+            return
+        await cls._model.Meta.database.execute(
+            table.update().where(where).values(values)
+        )
+
+    @classmethod
+    def _is_versioned(cls) -> bool:
+        return 'version' in cls._model.Meta.model_fields
+
+    @classmethod
+    def _get_version_values(cls) -> dict[Any, Any]:
+        if not cls._is_versioned():
+            return {}
+        version = cls._get_column('version')
+        return {version: version + 1}
+
+    @classmethod
+    async def get_version(cls, **kwargs) -> tuple:
+        """Summarise the rows matching kwargs without loading them.
+
+        Counts the rows, takes the latest _version_timestamp and sums the
+        version of the model and of every versioned _version_relations
+        model. Versions only grow and new rows carry the latest timestamp,
+        so any change to the rows or the versioned objects they point to
+        changes the result. Users and genres carry no version: renaming an
+        artist or a genre leaves the result, and so the ETag, as it was
+        until the object itself changes.
+        """
+        source, tables, paths = join_relations(
+            cls._model,
+            cls._version_relations
+        )
+        columns = [sqlalchemy.func.count()]
+        if cls._version_timestamp:
+            columns.append(
+                sqlalchemy.func.max(cls._get_column(cls._version_timestamp))
+            )
+        columns.extend(
+            sqlalchemy.func.sum(tables[path].c[
+                paths[path].Meta.model_fields['version'].get_alias()
+            ])
+            for path in tables
+            if 'version' in paths[path].Meta.model_fields
+        )
+        row = await cls._model.Meta.database.fetch_one(
+            sqlalchemy.select(columns)
+                .select_from(source)
+                .where(*cls._get_where(**kwargs))
+        )
+        return tuple(row[i] for i in range(len(columns)))
+
+    @classmethod
+    def _get_counters(cls) -> dict[str, Any]:
+        return {}
+
+    @classmethod
+    async def reconcile_counters(cls, after: Any, limit: int) -> Any | None:
+        table = cls._model.Meta.table
+        pk = table.c[cls._model.Meta.pkname]
+        database = cls._model.Meta.database
+
+        ids = [row[0] for row in await database.fetch_all(
+            sqlalchemy.select([pk])
+                .where(pk > after)
+                .order_by(pk)
+                .limit(limit)
+        )]
+        if not ids:
+            return None
+
+        await database.execute(
+            table.update()
+                .where(pk.in_(ids))
+                .values({**cls._get_counters(), **cls._get_version_values()})
+        )
+        return ids[-1]
+
     @classmethod
     async def exists(cls, *args, **kwargs) -> bool:
         return await cls._model.objects.filter(*args, **kwargs).exists()
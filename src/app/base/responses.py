@@ -0,0 +1,242 @@
+import os
+import stat
+import hashlib
+from secrets import token_hex
+from email.utils import formatdate
+
+import anyio
+from fastapi import HTTPException
+from starlette.background import BackgroundTask
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range_header(
+    range_header: str | None,
+    file_size: int
+) -> list[tuple[int, int]] | None:
+    if not range_header:
+        return None
+
+    unit, _, ranges_spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or not ranges_spec:
+        return None
+
+    ranges = []
+    for range_spec in ranges_spec.split(','):
+        start, sep, end = range_spec.strip().partition('-')
+        if not sep:
+            return None
+        try:
+            if not start:
+                suffix_length = int(end)
+                if suffix_length <= 0:
+                    continue
+                start, end = max(file_size - suffix_length, 0), file_size - 1
+            else:
+                start = int(start)
+                end = int(end) if end else file_size - 1
+                if start < 0:
+                    return None
+        except ValueError:
+            return None
+
+        if start >= file_size:
+            continue
+        if end < start:
+            return None
+        ranges.append((start, min(end, file_size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+
+class RangeFileResponse(Response):
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        range_header: str | None = None,
+        if_range: str | None = None,
+        media_type: str | None = None,
+        headers: dict | None = None,
+        background: BackgroundTask | None = None
+    ) -> None:
+        self.path = path
+        self.range_header = range_header
+        self.if_range = if_range
+        self.status_code = 200
+        self.media_type = media_type
+        self.background = background
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail='File does not exist')
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise HTTPException(status_code=404, detail='File does not exist')
+
+        file_size = stat_result.st_size
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        etag = '"{}"'.format(hashlib.md5(
+            '{}-{}'.format(stat_result.st_mtime, file_size).encode()
+        ).hexdigest())
+
+        self.headers.setdefault('accept-ranges', 'bytes')
+        self.headers.setdefault('last-modified', last_modified)
+        self.headers.setdefault('etag', etag)
+
+        ranges = None
+        if self.if_range is None or self.if_range in (etag, last_modified):
+            try:
+                ranges = parse_range_header(self.range_header, file_size)
+            except RangeNotSatisfiable:
+                await self._send_not_satisfiable(send, file_size)
+                return
+
+        if ranges is None:
+            await self._send_ranges(scope, send, [(0, file_size - 1)], 200)
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            self.headers['content-range'] = 'bytes {}-{}/{}'.format(
+                start, end, file_size
+            )
+            await self._send_ranges(scope, send, ranges, 206)
+        else:
+            await self._send_multipart(scope, send, ranges, file_size)
+
+        if self.background is not None:
+            await self.background()
+
+    async def _send_not_satisfiable(self, send: Send, file_size: int) -> None:
+        headers = MutableHeaders(raw=[
+            (b'content-range', 'bytes */{}'.format(file_size).encode()),
+            (b'content-length', b'0')
+        ])
+        await send({
+            'type': 'http.response.start',
+            'status': 416,
+            'headers': headers.raw
+        })
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def _send_ranges(
+        self,
+        scope: Scope,
+        send: Send,
+        ranges: list[tuple[int, int]],
+        status_code: int
+    ) -> None:
+        self.headers['content-length'] = str(sum(
+            end - start + 1 for start, end in ranges
+        ))
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': self.raw_headers
+        })
+        async with await anyio.open_file(self.path, mode='rb') as file:
+            for i, (start, end) in enumerate(ranges):
+                await self._send_file_range(
+                    scope,
+                    send,
+                    file,
+                    start,
+                    end,
+                    more_body=i < len(ranges) - 1
+                )
+
+    async def _send_multipart(
+        self,
+        scope: Scope,
+        send: Send,
+        ranges: list[tuple[int, int]],
+        file_size: int
+    ) -> None:
+        boundary = token_hex(13)
+        part_headers = [
+            '--{}\r\nContent-Type: {}\r\nContent-Range: bytes {}-{}/{}\r\n\r\n'
+                .format(boundary, self.media_type, start, end, file_size)
+                .encode('latin-1')
+            for start, end in ranges
+        ]
+        closing = '\r\n--{}--\r\n'.format(boundary).encode('latin-1')
+
+        content_length = len(closing) + sum(
+            len(part_header) + end - start + 1
+            for part_header, (start, end) in zip(part_headers, ranges)
+        ) + 2 * (len(ranges) - 1)
+
+        self.headers['content-type'] = \
+            'multipart/byteranges; boundary={}'.format(boundary)
+        self.headers['content-length'] = str(content_length)
+        await send({
+            'type': 'http.response.start',
+            'status': 206,
+            'headers': self.raw_headers
+        })
+
+        async with await anyio.open_file(self.path, mode='rb') as file:
+            for i, (part_header, (start, end)) in enumerate(
+                zip(part_headers, ranges)
+            ):
+                if i:
+                    part_header = b'\r\n' + part_header
+                await send({
+                    'type': 'http.response.body',
+                    'body': part_header,
+                    'more_body': True
+                })
+                await self._send_file_range(scope, send, file, start, end)
+            await send({'type': 'http.response.body', 'body': closing})
+
+    async def _send_file_range(
+        self,
+        scope: Scope,
+        send: Send,
+        file: anyio.AsyncFile,
+        start: int,
+        end: int,
+        more_body: bool = True
+    ) -> None:
+        count = end - start + 1
+        if count <= 0:
+            await send({
+                'type': 'http.response.body',
+                'body': b'',
+                'more_body': more_body
+            })
+            return
+
+        if 'http.response.zerocopysend' in scope.get('extensions', {}):
+            await send({
+                'type': 'http.response.zerocopysend',
+                'file': file.wrapped,
+                'offset': start,
+                'count': count,
+                'more_body': more_body
+            })
+            return
+
+        await file.seek(start)
+        while count > 0:
+            chunk = await file.read(min(self.chunk_size, count))
+            count = count - len(chunk) if chunk else 0
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': more_body or count > 0
+            })
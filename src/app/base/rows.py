@@ -0,0 +1,197 @@
+from collections import defaultdict
+from typing import Any, Collection, Iterable, Sequence
+
+import sqlalchemy
+from ormar import Model
+
+from src.core.responses import Reference
+from src.app.base.prefetch import chunks, select_links
+
+RowPrefetch = dict[str, Sequence[str]]
+
+
+def get_columns(model: type[Model]) -> list[tuple[str, str, Any]]:
+    return [
+        (name, field.get_alias(), field.to if field.is_relation else None)
+        for name, field in model.Meta.model_fields.items()
+        if not field.virtual and not field.is_multi
+    ]
+
+
+def expand_paths(relations: Iterable[str]) -> list[str]:
+    paths = set()
+    for relation in relations:
+        parts = relation.split('__')
+        paths.update('__'.join(parts[:i]) for i in range(1, len(parts) + 1))
+    return sorted(paths, key=lambda path: (path.count('__'), path))
+
+
+def _build(
+    row: Any,
+    path: str,
+    selected: dict[str, list[tuple[str, str, Any]]],
+    paths: dict[str, type[Model]]
+) -> dict | None:
+    model = paths[path]
+    prefix = path + '__' if path else ''
+    if row[prefix + model.Meta.pkname] is None:
+        return None
+
+    data = {}
+    for name, _, related in selected[path]:
+        key = prefix + name
+        if related is None:
+            data[name] = row[key]
+        elif key in paths:
+            data[name] = _build(row, key, selected, paths)
+        else:
+            data[name] = Reference({related.Meta.pkname: row[key]}) \
+                if row[key] is not None else None
+    return data
+
+
+def join_relations(
+    model: type[Model],
+    relations: Sequence[str] = ()
+) -> tuple[Any, dict[str, Any], dict[str, type[Model]]]:
+    """Join the tables of the given foreign key paths onto model's table,
+    aliasing each by its path.
+    """
+    table = model.Meta.table
+    tables, paths = {'': table}, {'': model}
+    source = table
+    for path in expand_paths(relations):
+        parent_path, _, name = path.rpartition('__')
+        field = paths[parent_path].Meta.model_fields[name]
+        related = field.to
+        alias = related.Meta.table.alias(path)
+        source = source.join(
+            alias,
+            tables[parent_path].c[field.get_alias()] == alias.c[
+                related.Meta.model_fields[related.Meta.pkname].get_alias()
+            ],
+            isouter=field.nullable
+        )
+        tables[path], paths[path] = alias, related
+    return source, tables, paths
+
+
+async def select_rows(
+    model: type[Model],
+    relations: Sequence[str] = (),
+    *where: Any,
+    fields: dict[str, set[str]] | None = None,
+    deferred: Collection[str] = (),
+    order_by: Sequence[Any] | None = None,
+    offset: int | None = None,
+    limit: int | None = None
+) -> list[dict]:
+    """Load model rows and their foreign keys as nested dicts with a single
+    Core select, shaped like Model.dict() without building Model instances.
+
+    fields limits the columns selected for the given relation paths ('' is
+    the model itself); primary keys are always selected. deferred columns,
+    given as paths such as 'track__text', are never selected.
+    """
+    table = model.Meta.table
+    source, tables, paths = join_relations(model, relations)
+
+    fields = fields or {}
+    selected, columns = {}, []
+    for path, path_table in tables.items():
+        prefix = path + '__' if path else ''
+        pkname = paths[path].Meta.pkname
+        selected[path] = [
+            column for column in get_columns(paths[path])
+            if prefix + column[0] not in deferred and (
+                path not in fields
+                or column[0] in fields[path]
+                or column[0] == pkname
+            )
+        ]
+        columns.extend(
+            path_table.c[alias].label(prefix + name)
+            for name, alias, _ in selected[path]
+        )
+
+    query = sqlalchemy.select(columns)\
+        .select_from(source)\
+        .order_by(*(order_by if order_by is not None else [
+            table.c[model.Meta.model_fields[model.Meta.pkname].get_alias()]
+        ]))
+    if where:
+        query = query.where(*where)
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+
+    rows = await model.Meta.database.fetch_all(query)
+    return [_build(row, '', selected, paths) for row in rows]
+
+
+def _follow(rows: Iterable[dict], path: list[str]) -> list[dict]:
+    for name in path:
+        rows = [row[name] for row in rows if row.get(name) is not None]
+    return list(rows)
+
+
+async def prefetch_rows(
+    model: type[Model],
+    rows: list[dict],
+    relation: str,
+    relations: Sequence[str] = (),
+    deferred: Collection[str] = (),
+    limit: int | None = None,
+    order_by: Sequence[str] = ()
+) -> None:
+    """Row counterpart of prefetch_related for many-to-many and reverse
+    foreign keys: fills each parent dict with a list of related dicts.
+    limit and order_by work as in prefetch_related.
+    """
+    *path, name = relation.split('__')
+    for part in path:
+        model = model.Meta.model_fields[part].to
+    parents = _follow(rows, path)
+    if not parents:
+        return
+
+    pkname = model.Meta.pkname
+    field = model.Meta.model_fields[name]
+    related = field.to
+    related_pk = related.Meta.table.c[
+        related.Meta.model_fields[related.Meta.pkname].get_alias()
+    ]
+    ids = list({parent[pkname] for parent in parents})
+
+    grouped = defaultdict(list)
+    if field.is_multi or limit is not None:
+        links = await select_links(field, ids, limit, order_by)
+        targets = {}
+        for chunk in chunks(list({link[1] for link in links})):
+            for row in await select_rows(
+                related,
+                relations,
+                related_pk.in_(chunk),
+                deferred=deferred
+            ):
+                targets[row[related.Meta.pkname]] = row
+        for link in links:
+            if link[1] in targets:
+                grouped[link[0]].append(targets[link[1]])
+    else:
+        foreign_key = field.get_related_name()
+        column = related.Meta.table.c[
+            related.Meta.model_fields[foreign_key].get_alias()
+        ]
+        for chunk in chunks(ids):
+            for row in await select_rows(
+                related,
+                relations,
+                column.in_(chunk),
+                deferred=deferred
+            ):
+                grouped[row[foreign_key][pkname]].append(row)
+
+    for parent in parents:
+        parent[name] = grouped.get(parent[pkname], [])
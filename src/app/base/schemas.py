@@ -30,5 +30,5 @@ class ItemList(BaseModel):
     next_page: str | None = None
     previous_page: str | None = None
     total: int
-    offset: int
+    offset: int | None = None
     limit: int
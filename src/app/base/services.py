@@ -5,9 +5,17 @@ from fastapi import HTTPException
 from pydantic import BaseModel
 from starlette.datastructures import URL
 
+from src.core.cache import response_cache
+from src.core.search import search_index
+from src.core.suggest import suggest_index
 from src.app.base.schemas import ItemList
-from src.app.base.paginator import paginate
+from src.app.base.paginator import (
+    build_cursor_page,
+    build_page,
+    decode_cursor
+)
 from src.app.base.repositories import ModelRepository
+from src.app.base.sparse import SparseFields
 
 CreateSchema = TypeVar('CreateSchema', bound=BaseModel)
 UpdateSchema = TypeVar('UpdateSchema', bound=BaseModel)
@@ -15,6 +23,11 @@ UpdateSchema = TypeVar('UpdateSchema', bound=BaseModel)
 
 class ModelService:
     _repository: Type[ModelRepository]
+    _cache_tag: str | None = None
+    _search_kind: str | None = None
+    _search_fields: tuple[str, ...] = ('title',)
+    _suggest_kind: str | None = None
+    _use_rows: bool = False
 
     @classmethod
     async def get(cls, **kwargs) -> Model:
@@ -30,15 +43,99 @@ class ModelService:
         offset: int,
         limit: int,
         url: URL,
+        sparse: SparseFields | None = None,
         **kwargs
     ) -> ItemList:
-        items = await cls._repository.all(**kwargs)
-        return paginate(items, offset, limit, url)
+        cls._check_sparse(sparse)
+        total = await cls._repository.count(**kwargs)
+        if total <= offset:
+            items = []
+        elif cls._use_rows:
+            items = await cls._repository.slice_rows(
+                offset,
+                limit,
+                sparse=sparse,
+                **kwargs
+            )
+        else:
+            items = await cls._repository.slice(offset, limit, **kwargs)
+        items = await cls._prepare_page_items(items)
+        return build_page(items, total, offset, limit, url)
+
+    @classmethod
+    async def get_cursor_pages(
+        cls,
+        cursor: str,
+        limit: int,
+        url: URL,
+        sparse: SparseFields | None = None,
+        **kwargs
+    ) -> ItemList:
+        cls._check_sparse(sparse)
+        try:
+            cursor = cls._repository.parse_cursor(decode_cursor(cursor))
+        except ValueError:
+            raise HTTPException(status_code=400, detail='Invalid cursor')
+
+        total = await cls._repository.count(**kwargs)
+        if cls._use_rows:
+            items, next_cursor = await cls._repository.slice_rows_after(
+                cursor,
+                limit,
+                sparse=sparse,
+                **kwargs
+            )
+        else:
+            items, next_cursor = await cls._repository.slice_after(
+                cursor,
+                limit,
+                **kwargs
+            )
+        items = await cls._prepare_page_items(items)
+        return build_cursor_page(items, total, limit, url, next_cursor)
 
     @classmethod
     async def get_object_or_none(cls, **kwargs):
         return await cls._repository.get_object_or_none(**kwargs)
 
+    @classmethod
+    async def get_row_or_404(
+        cls,
+        sparse: SparseFields | None = None,
+        **kwargs
+    ) -> dict:
+        cls._check_sparse(sparse, deferred=False)
+        row = await cls._repository.get_row_or_none(sparse=sparse, **kwargs)
+
+        if row is None:
+            raise HTTPException(
+                status_code=404,
+                detail='{} does not exist'.format(
+                    cls._repository._model.get_name(lower=False)
+                )
+            )
+        return row
+
+    @classmethod
+    def _check_sparse(
+        cls,
+        sparse: SparseFields | None,
+        deferred: bool = True
+    ) -> None:
+        if sparse is None:
+            return
+        if not cls._use_rows:
+            raise HTTPException(
+                status_code=400,
+                detail='fields and expand are not supported here'
+            )
+        unknown = cls._repository.get_unknown_fields(sparse, deferred)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail='Unknown fields: {}'.format(', '.join(unknown))
+            )
+
     @classmethod
     async def get_object_or_404(cls, **kwargs) -> Model:
         obj = await cls._repository.get_object_or_none(**kwargs)
@@ -61,21 +158,75 @@ class ModelService:
         if schema:
             schema_dict = await cls._pre_save(schema)
             kwargs.update(**schema_dict)
-        return await cls._repository.create(**kwargs)
+        obj = await cls._repository.create(**kwargs)
+        await cls.index_search(obj)
+        await cls.invalidate_responses()
+        return obj
 
     @classmethod
     async def update(cls, schema: UpdateSchema, **kwargs) -> Model:
         obj: Model = await cls.get_object_or_404(**kwargs)
 
         schema_dict = await cls._pre_save(schema)
-        return await cls._repository.update(
+        obj = await cls._repository.update(
             obj,
             **schema_dict
         )
+        await cls.index_search(obj)
+        await cls.invalidate_responses(obj.pk)
+        return obj
 
     @classmethod
     async def delete(cls, **kwargs) -> None:
         await cls._repository.delete(**kwargs)
+        ids = (kwargs['id'],) if 'id' in kwargs else ()
+        await cls.unindex_search(*ids)
+        await cls.invalidate_responses(*ids)
+
+    @classmethod
+    async def invalidate_responses(cls, *ids: int) -> None:
+        if cls._cache_tag:
+            await response_cache.invalidate(cls._cache_tag, *(
+                '{}:{}'.format(cls._cache_tag, id) for id in ids
+            ))
+
+    @classmethod
+    async def index_search(cls, obj: Model) -> None:
+        if cls._search_kind:
+            await search_index.add(
+                cls._search_kind,
+                obj.pk,
+                *(getattr(obj, field) for field in cls._search_fields)
+            )
+        if cls._suggest_kind:
+            await suggest_index.publish_add(
+                cls._suggest_kind,
+                obj.pk,
+                getattr(obj, cls._search_fields[0])
+            )
+
+    @classmethod
+    async def unindex_search(cls, *ids: int) -> None:
+        if cls._search_kind:
+            await search_index.remove(cls._search_kind, *ids)
+        if cls._suggest_kind:
+            await suggest_index.publish_remove(cls._suggest_kind, *ids)
+
+    @classmethod
+    async def increment(cls, pk: Any, **deltas: int) -> None:
+        await cls._repository.increment(pk, **deltas)
+
+    @classmethod
+    async def touch(cls, *pks: Any) -> None:
+        await cls._repository.touch(*pks)
+
+    @classmethod
+    async def get_version(cls, **kwargs) -> tuple:
+        return await cls._repository.get_version(**kwargs)
+
+    @classmethod
+    async def reconcile_counters(cls, after: Any, limit: int) -> Any | None:
+        return await cls._repository.reconcile_counters(after, limit)
 
     @classmethod
     async def exists(cls, *args, **kwargs) -> bool:
@@ -85,6 +236,10 @@ class ModelService:
     async def get_or_create(cls, **kwargs) -> Model:
         return await cls._repository.get_or_create(**kwargs)
 
+    @classmethod
+    async def _prepare_page_items(cls, items: list[Model]) -> list:
+        return items
+
     @classmethod
     async def _pre_save(
         cls,
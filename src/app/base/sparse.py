@@ -0,0 +1,41 @@
+from fastapi import HTTPException, Query, Request
+from pydantic import BaseModel
+
+
+class SparseFields(BaseModel):
+    fields: set[str] | None = None
+    expand: set[str] | None = None
+
+
+def _split(value: str) -> set[str]:
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def get_sparse_fields(
+    fields: str | None = Query(
+        None,
+        description='Comma-separated fields to return, id is always included'
+    ),
+    expand: str | None = Query(
+        None,
+        description='Comma-separated relations to embed, e.g. '
+            'artist,album.images; other relations are returned as {"id": ...}'
+    )
+) -> SparseFields | None:
+    if fields is None and expand is None:
+        return None
+    return SparseFields(
+        fields=_split(fields) if fields is not None else None,
+        expand={
+            path.replace('.', '__') for path in _split(expand)
+        } if expand is not None else None
+    )
+
+
+def reject_sparse_fields(request: Request) -> None:
+    """For routes that always return the full object."""
+    if 'fields' in request.query_params or 'expand' in request.query_params:
+        raise HTTPException(
+            status_code=400,
+            detail='fields and expand are not supported here'
+        )
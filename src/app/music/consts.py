@@ -6,6 +6,14 @@ class ImageSize(str, Enum):
     NORMAL = 'normal'
 
 
+IMAGE_SIZES = {
+    ImageSize.SMALL: (100, 100),
+    ImageSize.NORMAL: (450, 450)
+}
+
+PREVIEW_LIMIT = 15
+
+
 class AlbumType(str, Enum):
     ALBUM = 'album'
     SINGLE = 'single'
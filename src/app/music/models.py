@@ -37,6 +37,24 @@ class Album(ormar.Model):
     release_date: datetime = ormar.Date(server_default=func.now())
     images: list[Image] = ormar.ManyToMany(Image, skip_reverse=True)
     duration_ms: int = ormar.Integer(minimum=0)
+    track_count: int = ormar.Integer(
+        minimum=0,
+        default=0,
+        server_default='0',
+        nullable=False
+    )
+    saved_count: int = ormar.Integer(
+        minimum=0,
+        default=0,
+        server_default='0',
+        nullable=False
+    )
+    version: int = ormar.Integer(
+        minimum=1,
+        default=1,
+        server_default='1',
+        nullable=False
+    )
 
 
 class Track(ormar.Model):
@@ -52,7 +70,19 @@ class Track(ormar.Model):
     explicit: bool = ormar.Boolean(nullable=False)
     text: str | None = ormar.Text(nullable=True)
     duration_ms: int = ormar.Integer(minimum=0)
-    number: int = ormar.Integer(minimum=1, default=1)
+    number: int = ormar.Integer(minimum=1, default=1, nullable=False)
+    saved_count: int = ormar.Integer(
+        minimum=0,
+        default=0,
+        server_default='0',
+        nullable=False
+    )
+    version: int = ormar.Integer(
+        minimum=1,
+        default=1,
+        server_default='1',
+        nullable=False
+    )
 
 
 class Playlist(ormar.Model):
@@ -70,6 +100,24 @@ class Playlist(ormar.Model):
     tracks: list[Track] = ormar.ManyToMany(Track, skip_reverse=True)
     images: list[Image] = ormar.ManyToMany(Image, skip_reverse=True)
     duration_ms: int = ormar.Integer(minimum=0)
+    track_count: int = ormar.Integer(
+        minimum=0,
+        default=0,
+        server_default='0',
+        nullable=False
+    )
+    follower_count: int = ormar.Integer(
+        minimum=0,
+        default=0,
+        server_default='0',
+        nullable=False
+    )
+    version: int = ormar.Integer(
+        minimum=1,
+        default=1,
+        server_default='1',
+        nullable=False
+    )
 
 
 class SavedAlbum(ormar.Model):
@@ -80,6 +128,11 @@ class SavedAlbum(ormar.Model):
     id: int = ormar.Integer(primary_key=True)
     user: User = ormar.ForeignKey(User, skip_reverse=True, nullable=False)
     album: Album = ormar.ForeignKey(Album, skip_reverse=True, nullable=False)
+    saved_at: datetime = ormar.DateTime(
+        default=datetime.utcnow,
+        server_default=func.now(),
+        nullable=False
+    )
 
 
 class SavedTrack(ormar.Model):
@@ -90,6 +143,11 @@ class SavedTrack(ormar.Model):
     id: int = ormar.Integer(primary_key=True)
     user: User = ormar.ForeignKey(User, skip_reverse=True, nullable=False)
     track: Track = ormar.ForeignKey(Track, skip_reverse=True, nullable=False)
+    saved_at: datetime = ormar.DateTime(
+        default=datetime.utcnow,
+        server_default=func.now(),
+        nullable=False
+    )
 
 
 class SavedPlaylist(ormar.Model):
@@ -104,3 +162,8 @@ class SavedPlaylist(ormar.Model):
         skip_reverse=True,
         nullable=False
     )
+    saved_at: datetime = ormar.DateTime(
+        default=datetime.utcnow,
+        server_default=func.now(),
+        nullable=False
+    )
@@ -1,82 +1,347 @@
-from ormar import Model
+from typing import Any
 
+import sqlalchemy
+from ormar import Model, QuerySet
+
+from src.app.base.prefetch import chunks, prefetch_related
 from src.app.base.repositories import ModelRepository
 from src.app.music import models
+from src.app.music.consts import PREVIEW_LIMIT
 
 
 class AlbumRepository(ModelRepository):
     _model = models.Album
 
     @classmethod
-    async def all(cls, **kwargs) -> list[Model]:
-        return await cls._model.objects.select_related([
-            'artist',
-            'images',
-            'genre',
-            'tracks__artist'
-        ]).all(**kwargs)
+    def _get_queryset(cls) -> QuerySet:
+        return cls._model.objects.select_related(['artist', 'genre'])
 
     @classmethod
-    async def get_object_or_none(cls, **kwargs) -> Model:
-        return await cls._model.objects.select_related([
-            'artist',
-            'images',
-            'genre',
-            'tracks__artist'
-        ]).get_or_none(**kwargs)
+    async def _prefetch(cls, albums: list[Model]) -> None:
+        await prefetch_related(albums, 'images')
+
+    @classmethod
+    async def prefetch_track_previews(
+        cls,
+        albums: list[Model],
+        limit: int
+    ) -> None:
+        await prefetch_related(
+            albums,
+            'tracks',
+            models.Track.objects
+                .select_related('artist')
+                .exclude_fields('text'),
+            limit=limit,
+            order_by=('number', 'id')
+        )
+
+    @classmethod
+    async def increment_by_track(cls, track_id: int, **deltas: int) -> None:
+        track_table = models.Track.Meta.table
+        await cls._increment(
+            cls._model.Meta.table.c.id.in_(
+                sqlalchemy.select([track_table.c.album])
+                    .where(track_table.c.id == track_id)
+            ),
+            **deltas
+        )
+
+    @classmethod
+    def _get_counters(cls) -> dict[str, Any]:
+        table = cls._model.Meta.table
+        track_table = models.Track.Meta.table
+        saved_table = models.SavedAlbum.Meta.table
+        return {
+            'duration_ms': sqlalchemy.select([
+                sqlalchemy.func.coalesce(
+                    sqlalchemy.func.sum(track_table.c.duration_ms),
+                    0
+                )
+            ])
+                .where(track_table.c.album == table.c.id)
+                .scalar_subquery(),
+            'track_count': sqlalchemy.select([sqlalchemy.func.count()])
+                .select_from(track_table)
+                .where(track_table.c.album == table.c.id)
+                .scalar_subquery(),
+            'saved_count': sqlalchemy.select([sqlalchemy.func.count()])
+                .select_from(saved_table)
+                .where(saved_table.c.album == table.c.id)
+                .scalar_subquery()
+        }
 
 
 class TrackRepository(ModelRepository):
     _model = models.Track
+    _row_relations = ('artist', 'album__artist', 'album__genre')
+    _row_prefetch = {'album__images': ()}
+    _deferred_fields = ('text',)
+    _version_relations = ('album',)
 
     @classmethod
-    async def all(cls, **kwargs) -> list[Model]:
-        return await cls._model.objects.select_related([
+    def _get_queryset(cls) -> QuerySet:
+        return cls._model.objects.select_related([
             'artist',
-            'album',
             'album__artist',
-            'album__genre',
-            'album__images'
-        ]).all(**kwargs)
+            'album__genre'
+        ])
 
     @classmethod
-    async def get_object_or_none(cls, **kwargs) -> Model:
-        return await cls._model.objects.select_related([
-            'artist',
-            'album',
-            'album__artist',
-            'album__genre',
-            'album__images'
-        ]).get_or_none(**kwargs)
+    async def _prefetch(cls, tracks: list[Model]) -> None:
+        await prefetch_related(tracks, 'album__images')
+
+    @classmethod
+    async def slice_by_playlist(
+        cls,
+        playlist_id: int,
+        offset: int,
+        limit: int
+    ) -> list[Model]:
+        if not limit:
+            return []
+
+        table = cls._get_playlist_tracks_table()
+        rows = await cls._model.Meta.database.fetch_all(
+            sqlalchemy.select([table.c.track])
+                .where(table.c.playlist == playlist_id)
+                .order_by(table.c.id)
+                .offset(offset)
+                .limit(limit)
+        )
+        ids = [row[0] for row in rows]
+        if not ids:
+            return []
+
+        tracks = {
+            track.pk: track
+            for track in await cls._fetch(
+                cls._get_list_queryset().filter(id__in=ids)
+            )
+        }
+        return [tracks[id] for id in ids if id in tracks]
+
+    @classmethod
+    def _get_playlist_tracks_table(cls) -> sqlalchemy.Table:
+        return models.Playlist.Meta.model_fields['tracks'].through.Meta.table
+
+    @classmethod
+    async def get_link_rows(cls, ids: list[int]) -> list[dict]:
+        table = cls._model.Meta.table
+        rows = []
+        for chunk in chunks(ids):
+            rows.extend(await cls._model.Meta.database.fetch_all(
+                sqlalchemy.select([
+                    table.c.id,
+                    table.c.artist,
+                    table.c.duration_ms
+                ]).where(table.c.id.in_(chunk))
+            ))
+        return [dict(row) for row in rows]
+
+    @classmethod
+    def _get_counters(cls) -> dict[str, Any]:
+        table = cls._model.Meta.table
+        saved_table = models.SavedTrack.Meta.table
+        return {
+            'saved_count': sqlalchemy.select([sqlalchemy.func.count()])
+                .select_from(saved_table)
+                .where(saved_table.c.track == table.c.id)
+                .scalar_subquery()
+        }
+
+    @classmethod
+    async def get_text_or_none(cls, **kwargs) -> dict | None:
+        rows = await cls._model.objects\
+            .filter(**kwargs)\
+            .limit(1)\
+            .values(['id', 'text'])
+        return rows[0] if rows else None
+
+    @classmethod
+    async def get_file_or_none(cls, **kwargs) -> dict | None:
+        rows = await cls._model.objects\
+            .filter(**kwargs)\
+            .limit(1)\
+            .values(['file', 'is_playable'])
+        return rows[0] if rows else None
+
+
+class AlbumTrackRepository(TrackRepository):
+    """Tracks of one album, in the order of their numbers."""
+    _cursor_field = 'number'
 
 
 class PlaylistRepository(ModelRepository):
     _model = models.Playlist
 
     @classmethod
-    async def all(cls, **kwargs) -> list[Model]:
-        return await cls._model.objects.select_related([
-            'author',
-            'artists',
-            'tracks',
-            'tracks__artist',
-            'tracks__album',
-            'tracks__album__artist',
-            'tracks__album__genre',
-            'images'
-        ]).all(**kwargs)
-
-    @classmethod
-    async def get_object_or_none(cls, **kwargs) -> Model:
-        return await cls._model.objects.select_related([
-            'author',
-            'artists',
+    def _get_queryset(cls) -> QuerySet:
+        return cls._model.objects.select_related('author')
+
+    @classmethod
+    async def _prefetch(cls, playlists: list[Model]) -> None:
+        await prefetch_related(playlists, 'artists')
+        await prefetch_related(playlists, 'images')
+
+    @classmethod
+    async def add_tracks(cls, playlist: Model, tracks: list[dict]) -> None:
+        database = cls._model.Meta.database
+        tracks_table = cls._get_through_table('tracks')
+        artists_table = cls._get_through_table('artists')
+
+        existing = set()
+        for chunk in chunks([track['id'] for track in tracks]):
+            existing.update(row[0] for row in await database.fetch_all(
+                sqlalchemy.select([tracks_table.c.track]).where(
+                    tracks_table.c.playlist == playlist.pk,
+                    tracks_table.c.track.in_(chunk)
+                )
+            ))
+        tracks = [track for track in tracks if track['id'] not in existing]
+        if not tracks:
+            return
+
+        linked_artists = {row[0] for row in await database.fetch_all(
+            sqlalchemy.select([artists_table.c.user])
+                .where(artists_table.c.playlist == playlist.pk)
+        )}
+        artist_ids = list(dict.fromkeys(
+            track['artist'] for track in tracks
+            if track['artist'] not in linked_artists
+        ))
+
+        for chunk in chunks(tracks):
+            await database.execute(tracks_table.insert().values([
+                {'playlist': playlist.pk, 'track': track['id']}
+                for track in chunk
+            ]))
+        for chunk in chunks(artist_ids):
+            await database.execute(artists_table.insert().values([
+                {'playlist': playlist.pk, 'user': artist_id}
+                for artist_id in chunk
+            ]))
+
+        await cls.increment(
+            playlist.pk,
+            duration_ms=sum(track['duration_ms'] for track in tracks),
+            track_count=len(tracks)
+        )
+
+    @classmethod
+    async def remove_tracks(cls, playlist: Model, track_ids: list[int]) -> None:
+        database = cls._model.Meta.database
+        tracks_table = cls._get_through_table('tracks')
+        artists_table = cls._get_through_table('artists')
+        track_table = models.Track.Meta.table
+
+        for chunk in chunks(track_ids):
+            await database.execute(tracks_table.delete().where(
+                tracks_table.c.playlist == playlist.pk,
+                tracks_table.c.track.in_(chunk)
+            ))
+
+        playlist_tracks = sqlalchemy.select([track_table.c.artist])\
+            .select_from(tracks_table.join(
+                track_table,
+                tracks_table.c.track == track_table.c.id
+            ))\
+            .where(tracks_table.c.playlist == playlist.pk)\
+            .subquery()
+
+        await database.execute(artists_table.delete().where(
+            artists_table.c.playlist == playlist.pk,
+            artists_table.c.user.not_in(
+                sqlalchemy.select([playlist_tracks.c.artist])
+            )
+        ))
+
+        table = cls._model.Meta.table
+        counters = cls._get_counters()
+        await database.execute(
+            table.update()
+                .where(table.c.id == playlist.pk)
+                .values({
+                    'duration_ms': counters['duration_ms'],
+                    'track_count': counters['track_count'],
+                    **cls._get_version_values()
+                })
+        )
+
+    @classmethod
+    async def increment_by_track(cls, track_id: int, **deltas: int) -> None:
+        tracks_table = cls._get_through_table('tracks')
+        await cls._increment(
+            cls._model.Meta.table.c.id.in_(
+                sqlalchemy.select([tracks_table.c.playlist])
+                    .where(tracks_table.c.track == track_id)
+            ),
+            **deltas
+        )
+
+    @classmethod
+    async def get_track_count_or_none(cls, id: int) -> int | None:
+        rows = await cls._model.objects\
+            .filter(id=id)\
+            .limit(1)\
+            .values('track_count')
+        return rows[0]['track_count'] if rows else None
+
+    @classmethod
+    def _get_counters(cls) -> dict[str, Any]:
+        table = cls._model.Meta.table
+        tracks_table = cls._get_through_table('tracks')
+        track_table = models.Track.Meta.table
+        saved_table = models.SavedPlaylist.Meta.table
+        return {
+            'duration_ms': sqlalchemy.select([
+                sqlalchemy.func.coalesce(
+                    sqlalchemy.func.sum(track_table.c.duration_ms),
+                    0
+                )
+            ])
+                .select_from(tracks_table.join(
+                    track_table,
+                    tracks_table.c.track == track_table.c.id
+                ))
+                .where(tracks_table.c.playlist == table.c.id)
+                .scalar_subquery(),
+            'track_count': sqlalchemy.select([sqlalchemy.func.count()])
+                .select_from(tracks_table)
+                .where(tracks_table.c.playlist == table.c.id)
+                .scalar_subquery(),
+            'follower_count': sqlalchemy.select([sqlalchemy.func.count()])
+                .select_from(saved_table)
+                .where(saved_table.c.playlist == table.c.id)
+                .scalar_subquery()
+        }
+
+    @classmethod
+    def _get_through_table(cls, name: str) -> sqlalchemy.Table:
+        return cls._model.Meta.model_fields[name].through.Meta.table
+
+    @classmethod
+    async def _prefetch_page(cls, playlists: list[Model]) -> None:
+        await prefetch_related(playlists, 'images')
+
+    @classmethod
+    async def prefetch_previews(
+        cls,
+        playlists: list[Model],
+        limit: int
+    ) -> None:
+        await prefetch_related(playlists, 'artists', limit=limit)
+        await prefetch_related(
+            playlists,
             'tracks',
-            'tracks__artist',
-            'tracks__album__artist',
-            'tracks__album__genre',
-            'images'
-        ]).get_or_none(**kwargs)
+            models.Track.objects.select_related([
+                'artist',
+                'album__artist',
+                'album__genre'
+            ]).exclude_fields('text'),
+            limit=limit,
+            order_by=('id',)
+        )
 
 
 class GenreRepository(ModelRepository):
@@ -89,47 +354,99 @@ class ImageRepository(ModelRepository):
 
 class SavedTrackRepository(ModelRepository):
     _model = models.SavedTrack
+    _cursor_field = 'saved_at'
+    _row_relations = (
+        'track__artist',
+        'track__album__artist',
+        'track__album__genre'
+    )
+    _row_prefetch = {'track__album__images': ()}
+    _row_item_path = 'track'
+    _deferred_fields = ('track__text',)
+    _version_relations = ('track__album',)
+    _version_timestamp = 'saved_at'
 
     @classmethod
-    async def all(cls, **kwargs) -> list[Model]:
-        saved_tracks = await cls._model.objects.select_related([
-            'track',
-            'track__album',
+    def _get_queryset(cls) -> QuerySet:
+        return cls._model.objects.select_related([
             'track__artist',
             'track__album__genre',
-            'track__album__artist',
-            'track__album__images'
-        ]).all(**kwargs)
+            'track__album__artist'
+        ])
+
+    @classmethod
+    async def _prefetch(cls, saved_tracks: list[Model]) -> None:
+        await prefetch_related(saved_tracks, 'track__album__images')
+
+    @classmethod
+    def _to_items(cls, saved_tracks: list[Model]) -> list[dict]:
         return [saved_track.track.dict() for saved_track in saved_tracks]
 
+    @classmethod
+    def _rows_to_items(cls, rows: list[dict]) -> list[dict]:
+        return [row['track'] for row in rows]
+
 
 class SavedAlbumRepository(ModelRepository):
     _model = models.SavedAlbum
+    _cursor_field = 'saved_at'
+    _row_relations = ('album__artist', 'album__genre')
+    _row_prefetch = {'album__images': (), 'album__tracks': ('artist',)}
+    _row_prefetch_options = {
+        'album__tracks': {'limit': PREVIEW_LIMIT, 'order_by': ('number', 'id')}
+    }
+    _row_item_path = 'album'
+    _deferred_fields = ('album__tracks__text',)
+    _version_relations = ('album',)
+    _version_timestamp = 'saved_at'
 
     @classmethod
-    async def all(cls, **kwargs) -> list[Model]:
-        saved_albums = await cls._model.objects.select_related([
-            'album',
+    def _get_queryset(cls) -> QuerySet:
+        return cls._model.objects.select_related([
             'album__artist',
-            'album__genre',
-            'album__images',
+            'album__genre'
+        ])
+
+    @classmethod
+    async def _prefetch(cls, saved_albums: list[Model]) -> None:
+        await prefetch_related(saved_albums, 'album__images')
+        await prefetch_related(
+            saved_albums,
             'album__tracks',
-            'album__tracks__artist'
-        ]).all(**kwargs)
+            models.Track.objects.select_related('artist').exclude_fields('text'),
+            **cls._row_prefetch_options['album__tracks']
+        )
+
+    @classmethod
+    def _to_items(cls, saved_albums: list[Model]) -> list[dict]:
         return [saved_album.album.dict() for saved_album in saved_albums]
 
+    @classmethod
+    def _rows_to_items(cls, rows: list[dict]) -> list[dict]:
+        return [row['album'] for row in rows]
+
 
 class SavedPlaylistRepository(ModelRepository):
     _model = models.SavedPlaylist
+    _cursor_field = 'saved_at'
+    _version_relations = ('playlist',)
+    _version_timestamp = 'saved_at'
 
     @classmethod
-    async def all(cls, **kwargs) -> list[Model]:
-        saved_playlists = await cls._model.objects.select_related([
-            'playlist',
-            'playlist__author',
-            'playlist__artists',
+    def _get_queryset(cls) -> QuerySet:
+        return cls._model.objects.select_related('playlist__author')
+
+    @classmethod
+    async def _prefetch(cls, saved_playlists: list[Model]) -> None:
+        await prefetch_related(saved_playlists, 'playlist__artists')
+        await prefetch_related(saved_playlists, 'playlist__images')
+        await prefetch_related(
+            saved_playlists,
             'playlist__tracks',
-            'playlist__tracks__artist',
-            'playlist__images'
-        ]).all(**kwargs)
+            models.Track.objects.select_related('artist').exclude_fields('text'),
+            order_by=('id',)
+        )
+
+    @classmethod
+    def _to_items(cls, saved_playlists: list[Model]) -> list[dict]:
         return [saved_playlist.dict() for saved_playlist in saved_playlists]
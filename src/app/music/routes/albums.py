@@ -1,10 +1,18 @@
 from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from starlette.datastructures import URL
 
+from src.core.cache import response_cache
+from src.core.responses import conditional_response, fast_response
 from src.app.base.paginator import paginate
 from src.app.base.schemas import ExceptionMessage
+from src.app.base.sparse import (
+    SparseFields,
+    get_sparse_fields,
+    reject_sparse_fields
+)
 from src.app.auth.permissions import get_current_active_user, token_responses
 from src.app.user.models import User
+from src.app.user.services import UserService
 from src.app.music import models, schemas, services
 from src.app.music.permissions import (
     is_user_album_author,
@@ -14,26 +22,71 @@ from src.app.music.permissions import (
 album_router = APIRouter(prefix='/albums', tags=['Albums'])
 
 
-@album_router.get('', response_model=schemas.AlbumList, responses={
-    200: {'description': 'Pages of albums'}
-})
+@album_router.get(
+    '',
+    response_model=schemas.AlbumList,
+    dependencies=[Depends(reject_sparse_fields)],
+    responses={
+        200: {'description': 'Pages of albums'}
+    }
+)
 async def get_albums(
     request: Request,
     offset: int = Query(0, ge=0, le=100000),
-    limit: int = Query(15, ge=0, le=50)
+    limit: int = Query(15, ge=0, le=50),
+    cursor: str | None = Query(
+        None,
+        description='Opaque cursor from next_page, empty to start keyset '
+            'pagination'
+    )
 ):
-    return await services.AlbumService.get_pages(offset, limit, request.url)
+    return await response_cache.get_or_set(
+        request.url,
+        schemas.AlbumList,
+        'album',
+        lambda: services.AlbumService.get_cursor_pages(
+            cursor,
+            limit,
+            request.url
+        ) if cursor is not None else services.AlbumService.get_pages(
+            offset,
+            limit,
+            request.url
+        )
+    )
 
 
-@album_router.get('/{id}', response_model=schemas.AlbumOut, responses={
-    200: {'description': 'An album'},
-    404: {'model': ExceptionMessage}
-})
+@album_router.get(
+    '/{id}',
+    response_model=schemas.AlbumOut,
+    dependencies=[Depends(reject_sparse_fields)],
+    responses={
+        200: {'description': 'An album'},
+        304: {'description': 'Album has not changed since the given ETag'},
+        404: {'model': ExceptionMessage}
+    }
+)
 async def get_single_album(
+    request: Request,
+    response: Response,
     id: int = Path(..., gt=0, description='ID of album')
 ):
+    return await conditional_response(
+        request,
+        response,
+        await services.AlbumService.get_version(id=id),
+        lambda: response_cache.get_or_set(
+            request.url,
+            schemas.AlbumOut,
+            'album',
+            lambda: _get_single_album(id)
+        )
+    )
+
+
+async def _get_single_album(id: int) -> dict:
     album = await services.AlbumService.get_object_or_404(id=id)
-    tracks = await services.TrackService.get_pages(
+    tracks = await services.AlbumTrackService.get_pages(
         0,
         15,
         URL('http://127.0.0.1:8000/api/v1/albums/{}/tracks?offset=0&limit=15'\
@@ -99,6 +152,9 @@ async def delete_album(
     album = await services.AlbumService.get_object_or_404(id=id)
     is_user_album_author(current_user, album)
     await album.delete()
+    await services.AlbumService.unindex_search(id)
+    await services.AlbumService.invalidate_responses(id)
+    await UserService.index_search(await album.artist.load())
 
 
 @album_router.get(
@@ -113,21 +169,42 @@ async def get_album_tracks(
     request: Request,
     album_id: int = Path(..., gt=0),
     offset: int = Query(0, ge=0, le=100000),
-    limit: int = Query(15, ge=0, le=50)
+    limit: int = Query(15, ge=0, le=50),
+    cursor: str | None = Query(
+        None,
+        description='Opaque cursor from next_page, empty to start keyset '
+            'pagination'
+    ),
+    sparse: SparseFields | None = Depends(get_sparse_fields)
 ):
     album = await services.AlbumService.get_object_or_404(id=album_id)
-    return await services.TrackService.get_pages(
-        offset,
-        limit,
-        request.url,
-        album=album
+    if cursor is not None:
+        pages = await services.AlbumTrackService.get_cursor_pages(
+            cursor,
+            limit,
+            request.url,
+            sparse=sparse,
+            album=album
+        )
+    else:
+        pages = await services.AlbumTrackService.get_pages(
+            offset,
+            limit,
+            request.url,
+            sparse=sparse,
+            album=album
+        )
+    return fast_response(
+        schemas.TrackList,
+        pages,
+        partial=sparse is not None
     )
 
 
 @album_router.post(
     '/{album_id}/tracks',
     status_code=201,
-    response_model=schemas.TrackOut,
+    response_model=schemas.TrackDetail,
     responses={
         201: {'description': 'A track'},
         404: {'model': ExceptionMessage},
@@ -153,16 +230,19 @@ async def upload_track_to_album(
                 album=album,
                 artist=current_user
             )
-            await album.update(
-                duration_ms=album.duration_ms + track.duration_ms
+            await services.AlbumService.increment(
+                album.id,
+                duration_ms=track.duration_ms,
+                track_count=1
             )
+    await services.AlbumService.invalidate_responses(album.id)
 
     return track
 
 
 @album_router.patch(
     '/{album_id}/tracks/{id}',
-    response_model=schemas.TrackOut,
+    response_model=schemas.TrackDetail,
     responses={
         201: {'description': 'A track'},
         **token_responses
@@ -185,11 +265,10 @@ async def update_album_track(
             track = await services.TrackService.update(
                 schema,
                 id=id,
+                album__id=album.id,
                 artist=current_user.id
             )
-            await album.update(
-                duration_ms=album.duration_ms + track.duration_ms
-            )
+    await services.AlbumService.invalidate_responses(album.id)
 
     return track
 
@@ -207,7 +286,23 @@ async def delete_album_track(
 ):
     track = await services.TrackService.get_object_or_404(
         id=id,
-        album_id=album_id
+        album__id=album_id
     )
     is_user_track_author(current_user, track)
-    await track.delete()
+    async with track.Meta.database.connection() as conn:
+        async with conn.transaction():
+            await services.PlaylistService.increment_by_track(
+                track.id,
+                duration_ms=-track.duration_ms,
+                track_count=-1
+            )
+            await services.AlbumService.increment(
+                album_id,
+                duration_ms=-track.duration_ms,
+                track_count=-1
+            )
+            await track.delete()
+            await services.TrackService.unindex_search(id)
+    await services.TrackService.invalidate_responses(id)
+    await services.AlbumService.invalidate_responses(album_id)
+    await services.PlaylistService.invalidate_responses()
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, Path, Response
+from fastapi import APIRouter, Depends, Path, Request, Response
 
+from src.core.cache import response_cache
 from src.app.base.schemas import ExceptionMessage
 from src.app.music import models, schemas, services
 from src.app.auth.permissions import get_current_superuser, token_responses
@@ -12,7 +13,16 @@ genre_router = APIRouter(prefix='/genres', tags=['Genres'])
         'description': 'An array of genres'
     }
 })
-async def get_genres():
+async def get_genres(request: Request):
+    return await response_cache.get_or_set(
+        request.url,
+        list[str],
+        'genre',
+        _get_genre_titles
+    )
+
+
+async def _get_genre_titles() -> list[str]:
     return [genre.title for genre in await services.GenreService.all()]
 
 
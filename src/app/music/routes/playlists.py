@@ -1,38 +1,86 @@
 from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from starlette.datastructures import URL
 
+from src.core.cache import response_cache
+from src.core.responses import conditional_response, fast_response
 from src.app.base.schemas import ExceptionMessage
-from src.app.base.paginator import paginate
+from src.app.base.sparse import reject_sparse_fields
 from src.app.auth.permissions import get_current_active_user, token_responses
 from src.app.user.models import User
 from src.app.music import schemas
-from src.app.music.models import Playlist, Track
+from src.app.music.models import Playlist
 from src.app.music.permissions import is_user_playlist_author
 from src.app.music.services import PlaylistService, TrackService
 
 playlist_router = APIRouter(prefix='/playlists', tags=['Playlists'])
 
 
-@playlist_router.get('', response_model=schemas.PlaylistList, responses={
-    200: {'description': 'Pages of albums'}
-})
+@playlist_router.get(
+    '',
+    response_model=schemas.PlaylistList,
+    dependencies=[Depends(reject_sparse_fields)],
+    responses={
+        200: {'description': 'Pages of albums'}
+    }
+)
 async def get_playlists(
     request: Request,
     offset: int = Query(0, ge=0, le=100000),
-    limit: int = Query(15, ge=0, le=50)
+    limit: int = Query(15, ge=0, le=50),
+    cursor: str | None = Query(
+        None,
+        description='Opaque cursor from next_page, empty to start keyset '
+            'pagination'
+    )
 ):
-    return await PlaylistService.get_pages(offset, limit, request.url)
+    return await response_cache.get_or_set(
+        request.url,
+        schemas.PlaylistList,
+        'playlist',
+        lambda: PlaylistService.get_cursor_pages(
+            cursor,
+            limit,
+            request.url
+        ) if cursor is not None else PlaylistService.get_pages(
+            offset,
+            limit,
+            request.url
+        )
+    )
 
 
-@playlist_router.get('/{id}', response_model=schemas.PlaylistOut, responses={
-    404: {'model': ExceptionMessage}
-})
+@playlist_router.get(
+    '/{id}',
+    response_model=schemas.PlaylistOut,
+    dependencies=[Depends(reject_sparse_fields)],
+    responses={
+        304: {'description': 'Playlist has not changed since the given ETag'},
+        404: {'model': ExceptionMessage}
+    }
+)
 async def get_single_playlist(
+    request: Request,
+    response: Response,
     id: int = Path(..., description='ID of playlist')
 ):
+    return await conditional_response(
+        request,
+        response,
+        await PlaylistService.get_version(id=id),
+        lambda: response_cache.get_or_set(
+            request.url,
+            schemas.PlaylistOut,
+            'playlist',
+            lambda: _get_single_playlist(id)
+        )
+    )
+
+
+async def _get_single_playlist(id: int) -> dict:
     playlist = await PlaylistService.get_object_or_404(id=id)
-    tracks = paginate(
-        playlist.tracks,
+    tracks = await TrackService.get_playlist_pages(
+        playlist.id,
+        playlist.track_count,
         0,
         15,
         URL('http://127.0.0.1:8000/api/v1/playlists/{}/tracks'
@@ -101,11 +149,14 @@ async def delete_playlist(
     playlist = await PlaylistService.get_object_or_404(id=id)
     is_user_playlist_author(current_user, playlist)
     await playlist.delete()
+    await PlaylistService.unindex_search(id)
+    await PlaylistService.invalidate_responses(id)
 
 
 @playlist_router.get(
     '/{playlist_id}/tracks',
     response_model=schemas.TrackList,
+    dependencies=[Depends(reject_sparse_fields)],
     responses={
         200: {'description': 'Pages of tracks'},
         404: {'model': ExceptionMessage}
@@ -117,8 +168,15 @@ async def get_playlist_tracks(
     offset: int = Query(0, ge=0, le=100000),
     limit: int = Query(15, ge=0, le=50)
 ):
-    playlist = await PlaylistService.get_object_or_404(id=playlist_id)
-    return paginate(playlist.tracks, offset, limit, request.url)
+    total = await PlaylistService.get_track_count_or_404(playlist_id)
+    pages = await TrackService.get_playlist_pages(
+        playlist_id,
+        total,
+        offset,
+        limit,
+        request.url
+    )
+    return fast_response(schemas.TrackList, pages)
 
 
 @playlist_router.put(
@@ -143,18 +201,7 @@ async def add_tracks_to_playlist(
     )
 
     is_user_playlist_author(current_user, playlist)
-
-    async with playlist.Meta.database.connection() as conn:
-        async with conn.transaction():
-            for track_id in schema.tracks:
-                track: Track = await TrackService.get_object_or_404(
-                    id=track_id
-                )
-
-                await playlist.tracks.add(track)
-                await playlist.artists.add(track.artist)
-                playlist.duration_ms += track.duration_ms
-            await playlist.update()
+    await PlaylistService.add_tracks(playlist, schema.tracks)
 
 
 @playlist_router.delete(
@@ -175,14 +222,4 @@ async def remove_playlist_tracks(
         id=playlist_id
     )
     is_user_playlist_author(current_user, playlist)
-
-    for track_id in schema.tracks:
-        exist = 0 not in (
-            await playlist.Meta.database.fetch_one(
-                f'''SELECT EXISTS(SELECT id FROM playlists_tracks
-                        WHERE track={track_id} and playlist={playlist_id})'''
-                )
-            )
-        if exist:
-            track = await TrackService.get_object_or_404(id=track_id)
-            await playlist.tracks.remove(track)
+    await PlaylistService.remove_tracks(playlist, schema.tracks)
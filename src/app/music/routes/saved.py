@@ -1,6 +1,13 @@
 from fastapi import APIRouter, Depends, Path, Query, Request, Response
 
-from src.app.base.schemas import Message
+from src.core.responses import conditional_response, fast_response
+from src.app.base.schemas import ItemList, Message
+from src.app.base.services import ModelService
+from src.app.base.sparse import (
+    SparseFields,
+    get_sparse_fields,
+    reject_sparse_fields
+)
 from src.app.auth.permissions import get_current_active_user, token_responses
 from src.app.user.models import User
 from src.app.music import schemas, services
@@ -8,26 +15,81 @@ from src.app.music import schemas, services
 
 saved_router = APIRouter(prefix='/users/me/saved')
 
+
+async def _get_saved_version(service: type[ModelService], user: User) -> tuple:
+    return (user.id, *await service.get_version(user=user))
+
+
+async def _get_saved_pages(
+    service: type[ModelService],
+    request: Request,
+    offset: int,
+    limit: int,
+    cursor: str | None,
+    user: User,
+    sparse: SparseFields | None = None
+) -> ItemList:
+    if cursor is not None:
+        return await service.get_cursor_pages(
+            cursor,
+            limit,
+            request.url,
+            sparse=sparse,
+            user=user
+        )
+    return await service.get_pages(
+        offset,
+        limit,
+        request.url,
+        sparse=sparse,
+        user=user
+    )
+
+
 @saved_router.get(
     '/tracks',
     response_model=schemas.TrackList,
     tags=['Tracks'],
     responses={
         200: {'description': 'Pages of tracks'},
+        304: {'description': 'Saved tracks have not changed'},
         **token_responses
     }
 )
 async def get_saved_tracks(
     request: Request,
+    response: Response,
     offset: int = Query(0, ge=0, le=100000),
     limit: int = Query(15, ge=0, le=50),
+    cursor: str | None = Query(
+        None,
+        description='Opaque cursor from next_page, empty to start keyset '
+            'pagination'
+    ),
+    sparse: SparseFields | None = Depends(get_sparse_fields),
     current_user: User = Depends(get_current_active_user)
 ):
-    return await services.SavedTrackService.get_pages(
-        offset,
-        limit,
-        request.url,
-        user=current_user
+    async def load():
+        pages = await _get_saved_pages(
+            services.SavedTrackService,
+            request,
+            offset,
+            limit,
+            cursor,
+            current_user,
+            sparse
+        )
+        return fast_response(
+            schemas.TrackList,
+            pages,
+            partial=sparse is not None
+        )
+
+    return await conditional_response(
+        request,
+        response,
+        await _get_saved_version(services.SavedTrackService, current_user),
+        load
     )
 
 
@@ -46,10 +108,7 @@ async def save_track(
     current_user: User = Depends(get_current_active_user)
 ):
     track = await services.TrackService.get_object_or_404(id=schema.id)
-    await services.SavedTrackService.get_or_create(
-        track=track,
-        user=current_user
-    )
+    await services.SavedTrackService.save(current_user, track)
 
 
 @saved_router.delete(
@@ -63,32 +122,47 @@ async def remove_saved_track(
     schema: schemas.TrackId,
     current_user: User = Depends(get_current_active_user)
 ):
-    await services.SavedTrackService.delete(
-        user=current_user.id,
-        track=schema.id
-    )
+    await services.SavedTrackService.remove(current_user.id, schema.id)
 
 
 @saved_router.get(
     '/albums',
     response_model=schemas.AlbumList,
     tags=['Albums'],
+    dependencies=[Depends(reject_sparse_fields)],
     responses={
         200: {'description': 'Pages of albums'},
+        304: {'description': 'Saved albums have not changed'},
         **token_responses
     }
 )
 async def get_saved_albums(
     request: Request,
+    response: Response,
     offset: int = Query(0, ge=0, le=100000),
     limit: int = Query(15, ge=0, le=50),
+    cursor: str | None = Query(
+        None,
+        description='Opaque cursor from next_page, empty to start keyset '
+            'pagination'
+    ),
     current_user: User = Depends(get_current_active_user)
 ):
-    return await services.SavedAlbumService.get_pages(
-        offset,
-        limit,
-        request.url,
-        user=current_user
+    async def load():
+        return fast_response(schemas.AlbumList, await _get_saved_pages(
+            services.SavedAlbumService,
+            request,
+            offset,
+            limit,
+            cursor,
+            current_user
+        ))
+
+    return await conditional_response(
+        request,
+        response,
+        await _get_saved_version(services.SavedAlbumService, current_user),
+        load
     )
 
 
@@ -107,10 +181,7 @@ async def save_album(
     current_user: User = Depends(get_current_active_user)
 ):
     album = await services.AlbumService.get_object_or_404(id=schema.id)
-    await services.SavedAlbumService.get_or_create(
-        album=album,
-        user=current_user
-    )
+    await services.SavedAlbumService.save(current_user, album)
 
 
 @saved_router.delete(
@@ -124,27 +195,42 @@ async def remove_saved_album(
     schema: schemas.AlbumId,
     current_user: User = Depends(get_current_active_user)
 ):
-    await services.SavedAlbumService.delete(
-        user=current_user.id,
-        album=schema.id
-    )
+    await services.SavedAlbumService.remove(current_user.id, schema.id)
 
 
 @saved_router.get(
     '/playlists',
-    tags=['Playlists']
+    tags=['Playlists'],
+    dependencies=[Depends(reject_sparse_fields)],
+    responses={
+        304: {'description': 'Saved playlists have not changed'},
+        **token_responses
+    }
 )
 async def get_saved_playlsits(
     request: Request,
+    response: Response,
     offset: int = Query(0, ge=0, le=100000),
     limit: int = Query(15, ge=0, le=50),
+    cursor: str | None = Query(
+        None,
+        description='Opaque cursor from next_page, empty to start keyset '
+            'pagination'
+    ),
     current_user: User = Depends(get_current_active_user)
 ):
-    return await services.SavedPlaylistService.get_pages(
-        offset,
-        limit,
-        request.url,
-        user=current_user
+    return await conditional_response(
+        request,
+        response,
+        await _get_saved_version(services.SavedPlaylistService, current_user),
+        lambda: _get_saved_pages(
+            services.SavedPlaylistService,
+            request,
+            offset,
+            limit,
+            cursor,
+            current_user
+        )
     )
 
 
@@ -163,10 +249,7 @@ async def save_playlist(
     current_user: User = Depends(get_current_active_user)
 ):
     playlist = await services.PlaylistService.get_object_or_404(id=schema.id)
-    await services.SavedPlaylistService.get_or_create(
-        playlist=playlist,
-        user=current_user
-    )
+    await services.SavedPlaylistService.save(current_user, playlist)
 
 
 @saved_router.delete(
@@ -180,7 +263,4 @@ async def remove_saved_playlist(
     schema: schemas.PlaylistId,
     current_user: User = Depends(get_current_active_user)
 ):
-    await services.SavedAlbumService.delete(
-        user=current_user.id,
-        album=schema.id
-    )
+    await services.SavedPlaylistService.remove(current_user.id, schema.id)
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Path, Query, Request
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response
 
+from src.core.cache import response_cache
+from src.core.responses import conditional_response
 from src.app.music import schemas, services
 from src.app.base.schemas import ExceptionMessage
+from src.app.base.sparse import SparseFields, get_sparse_fields
+from src.app.base.responses import RangeFileResponse
 
 
 track_router = APIRouter(prefix='/tracks', tags=['Tracks'])
@@ -13,18 +17,103 @@ track_router = APIRouter(prefix='/tracks', tags=['Tracks'])
 async def get_tracks(
     request: Request,
     offset: int = Query(0, ge=0, le=100000),
-    limit: int = Query(15, ge=0, le=50)
+    limit: int = Query(15, ge=0, le=50),
+    cursor: str | None = Query(
+        None,
+        description='Opaque cursor from next_page, empty to start keyset '
+            'pagination'
+    ),
+    sparse: SparseFields | None = Depends(get_sparse_fields)
 ):
-    return await services.TrackService.get_pages(
-        offset,
-        limit,
-        request.url
+    return await response_cache.get_or_set(
+        request.url,
+        schemas.TrackList,
+        'track',
+        lambda: services.TrackService.get_cursor_pages(
+            cursor,
+            limit,
+            request.url,
+            sparse=sparse
+        ) if cursor is not None else services.TrackService.get_pages(
+            offset,
+            limit,
+            request.url,
+            sparse=sparse
+        ),
+        partial=sparse is not None
     )
 
 
-@track_router.get('/{id}', response_model=schemas.TrackOut, responses={
+@track_router.get('/{id}', response_model=schemas.TrackDetail, responses={
     200: {'description': 'A track'},
+    304: {'description': 'Track has not changed since the given ETag'},
     404: {'model': ExceptionMessage}
 })
-async def get_single_track(id: int = Path(..., gt=0)):
-    return await services.TrackService.get_object_or_404(id=id)
+async def get_single_track(
+    request: Request,
+    response: Response,
+    id: int = Path(..., gt=0),
+    sparse: SparseFields | None = Depends(get_sparse_fields)
+):
+    return await conditional_response(
+        request,
+        response,
+        await services.TrackService.get_version(id=id),
+        lambda: response_cache.get_or_set(
+            request.url,
+            schemas.TrackDetail,
+            'track',
+            lambda: services.TrackService.get_object_or_404(id=id)
+                if sparse is None
+                else services.TrackService.get_row_or_404(sparse, id=id),
+            partial=sparse is not None
+        )
+    )
+
+
+@track_router.get(
+    '/{id}/lyrics',
+    response_model=schemas.TrackLyrics,
+    responses={
+        200: {'description': 'Lyrics of the track'},
+        404: {'model': ExceptionMessage}
+    }
+)
+async def get_track_lyrics(request: Request, id: int = Path(..., gt=0)):
+    return await response_cache.get_or_set(
+        request.url,
+        schemas.TrackLyrics,
+        'track',
+        lambda: services.TrackService.get_text_or_404(id=id)
+    )
+
+
+@track_router.get(
+    '/{id}/stream',
+    response_class=RangeFileResponse,
+    responses={
+        200: {
+            'description': 'Audio file of the track',
+            'content': {'audio/mpeg': {}}
+        },
+        206: {
+            'description': 'Requested ranges of the audio file',
+            'content': {'audio/mpeg': {}, 'multipart/byteranges': {}}
+        },
+        403: {'model': ExceptionMessage},
+        404: {'model': ExceptionMessage},
+        416: {'description': 'Requested range not satisfiable'}
+    }
+)
+async def stream_track(
+    id: int = Path(..., gt=0),
+    range: str | None = Header(None),
+    if_range: str | None = Header(None)
+):
+    file_path = await services.TrackService.get_playable_file_or_404(id=id)
+    return RangeFileResponse(
+        file_path,
+        range_header=range,
+        if_range=if_range,
+        media_type='audio/mpeg'
+    )
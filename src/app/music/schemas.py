@@ -13,16 +13,27 @@ AlbumFromModel = get_pydantic(models.Album, 'Album', exclude={
     'id',
     'release_date',
     'duration_ms',
+    'track_count',
+    'saved_count',
     'tracks',
     'artist',
     'genre',
-    'images'
+    'images',
+    'version'
 })
 
 TrackFromModel = get_pydantic(
     models.Track,
     'Track',
-    exclude={'id', 'album', 'duration_ms', 'file', 'artist'}
+    exclude={
+        'id',
+        'album',
+        'duration_ms',
+        'saved_count',
+        'file',
+        'artist',
+        'version'
+    }
 )
 ImageRelated = get_pydantic(
     models.Image,
@@ -75,15 +86,17 @@ class PlaylistUpdate(BaseModel):
     image: UploadFile | None = File(None)
 
 
-class AlbumRelated(
-    models.Album.get_pydantic(exclude={'artist', 'tracks', 'genre', 'images'})
-):
+class AlbumRelated(models.Album.get_pydantic(
+    exclude={'artist', 'tracks', 'genre', 'images', 'version'}
+)):
     genre: Genre
     artist: Artist
     images: list[ImageRelated]
 
 
-class TrackRelated(models.Track.get_pydantic(exclude={'artist', 'album'})):
+class TrackRelated(models.Track.get_pydantic(
+    exclude={'artist', 'album', 'text', 'version'}
+)):
     artist: Artist
 
 
@@ -91,6 +104,15 @@ class TrackOut(TrackRelated):
     album: AlbumRelated
 
 
+class TrackDetail(TrackOut):
+    text: str | None
+
+
+class TrackLyrics(BaseModel):
+    id: int
+    text: str | None
+
+
 class TrackList(ItemList):
     items: list[TrackOut]
 
@@ -99,9 +121,9 @@ class TrackListRelated(ItemList):
     items: list[TrackRelated]
 
 
-class AlbumOut(
-    models.Album.get_pydantic(exclude={'artist', 'genre', 'images', 'tracks'})
-):
+class AlbumOut(models.Album.get_pydantic(
+    exclude={'artist', 'genre', 'images', 'tracks', 'version'}
+)):
     genre: Genre
     artist: Artist
     tracks: TrackListRelated
@@ -112,9 +134,9 @@ class AlbumList(ItemList):
     items: list[AlbumOut]
 
 
-class PlaylistOut(
-    models.Playlist.get_pydantic(exclude={'author', 'artists', 'tracks', 'images'})
-):
+class PlaylistOut(models.Playlist.get_pydantic(
+    exclude={'author', 'artists', 'tracks', 'images', 'version'}
+)):
     author: Artist
     artists: list[Artist]
     tracks: TrackListRelated
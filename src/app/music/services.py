@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Type
 from fastapi import HTTPException
 
 from ormar import Model
@@ -7,20 +7,41 @@ from src.app.base.schemas import ItemList
 
 from src.core.db import database
 from src.utils.audio import upload_audio
-from src.utils.image import upload_image
-from src.app.base.paginator import paginate
+from src.utils.image import upload_images
+from src.app.base.paginator import build_page
 from src.app.base.services import CreateSchema, ModelService, UpdateSchema
 from src.app.base.uploads import (
     get_album_image_upload_path,
     get_track_upload_path,
     get_playlist_image_upload_path
 )
+from src.app.user.models import User
+from src.app.user.services import UserService
 from src.app.music import models, repositories
-from src.app.music.consts import AlbumType, ImageSize
+from src.app.music.consts import IMAGE_SIZES, PREVIEW_LIMIT, AlbumType
+
+
+def _build_track_preview(
+    path: str,
+    id: int,
+    tracks: list,
+    total: int
+) -> dict:
+    return build_page(
+        tracks,
+        total,
+        0,
+        PREVIEW_LIMIT,
+        URL('http://127.0.0.1:8000/api/v1/{}/{}/tracks?offset=0&limit={}'\
+            .format(path, id, PREVIEW_LIMIT))
+    )
 
 
 class AlbumService(ModelService):
     _repository = repositories.AlbumRepository
+    _cache_tag = 'album'
+    _search_kind = 'album'
+    _suggest_kind = 'album'
 
     @classmethod
     async def is_available_to_upload(cls, album: models.Album) -> None:
@@ -32,20 +53,19 @@ class AlbumService(ModelService):
             )
 
     @classmethod
-    async def get_pages(cls, offset: int, limit: int, url: URL, **kwargs):
-        albums = await cls.all(**kwargs)
-        for i, album in enumerate(albums):
-            albums[i] = {
+    async def _prepare_page_items(cls, albums: list[models.Album]) -> list:
+        await cls._repository.prefetch_track_previews(albums, PREVIEW_LIMIT)
+        return [
+            {
                 **album.dict(exclude={'tracks'}),
-                'tracks': paginate(
+                'tracks': _build_track_preview(
+                    'albums',
+                    album.id,
                     album.tracks,
-                    0,
-                    15,
-                    URL('http://127.0.0.1:8000/api/v1/albums/{}/tracks?offset=0&limit=15'\
-                        .format(album.id))
+                    album.track_count
                 )
-            }
-        return paginate(albums, offset, limit, url)
+            } for album in albums
+        ]
 
     @classmethod
     async def create(
@@ -53,9 +73,11 @@ class AlbumService(ModelService):
         schema: CreateSchema | None = None,
         **kwargs
     ) -> Model:
-        upload_path = get_album_image_upload_path()
-        small_image_path = upload_image(upload_path, schema.image, (100, 100))
-        normal_image_path = upload_image(upload_path, schema.image, (450, 450))
+        image_paths = await upload_images(
+            get_album_image_upload_path(),
+            schema.image,
+            IMAGE_SIZES
+        )
 
         genre = await GenreService.get_object_or_404(id=schema.genre)
 
@@ -67,19 +89,13 @@ class AlbumService(ModelService):
                     duration_ms=0,
                     genre=genre
                 )
-                small_image_obj = await ImageService.create(
-                    url=small_image_path,
-                    size=ImageSize.SMALL
-                )
-                normal_image_obj = await ImageService.create(
-                    url=normal_image_path,
-                    size=ImageSize.NORMAL
-                )
-                await album.images.add(small_image_obj)
-                await album.images.add(normal_image_obj)
+                for size, url in image_paths.items():
+                    image_obj = await ImageService.create(url=url, size=size)
+                    await album.images.add(image_obj)
 
         await album.genre.load()
         await album.artist.load()
+        await UserService.index_search(album.artist)
         return {
             **album.dict(exclude={'tracks'}),
             'tracks': {
@@ -99,15 +115,19 @@ class AlbumService(ModelService):
         album = await super().update(schema, **kwargs)
 
         if schema.image:
-            upload_path = get_album_image_upload_path()
-            small_image_path = upload_image(upload_path, schema.image, (100, 100))
-            normal_image_path = upload_image(upload_path, schema.image, (450, 450))
+            image_paths = await upload_images(
+                get_album_image_upload_path(),
+                schema.image,
+                IMAGE_SIZES
+            )
             for image in album.images:
-                if image.size == ImageSize.NORMAL:
-                    url = normal_image_path
-                else:
-                    url = small_image_path
-                await image.update(url=url)
+                await image.update(url=image_paths[image.size])
+            await cls.touch(album.id)
+            await cls.invalidate_responses(album.id)
+
+    @classmethod
+    async def increment_by_track(cls, track_id: int, **deltas: int) -> None:
+        await cls._repository.increment_by_track(track_id, **deltas)
 
     @classmethod
     async def _pre_save(cls, schema: CreateSchema | UpdateSchema) -> dict[str, Any]:
@@ -116,6 +136,76 @@ class AlbumService(ModelService):
 
 class TrackService(ModelService):
     _repository = repositories.TrackRepository
+    _use_rows = True
+    _cache_tag = 'track'
+    _search_kind = 'track'
+    _suggest_kind = 'track'
+    _search_fields = ('title', 'text')
+
+    @classmethod
+    async def update(cls, schema: UpdateSchema, **kwargs) -> Model:
+        track: models.Track = await cls.get_object_or_404(**kwargs)
+        duration_ms = track.duration_ms
+
+        track = await cls._repository.update(
+            track,
+            **await cls._pre_save(schema)
+        )
+        delta = track.duration_ms - duration_ms
+        deltas = {'duration_ms': delta} if delta else {}
+        await AlbumService.increment(track.album.id, **deltas)
+        await PlaylistService.increment_by_track(track.id, **deltas)
+        await PlaylistService.invalidate_responses()
+        await cls.index_search(track)
+        await cls.invalidate_responses(track.id)
+        return track
+
+    @classmethod
+    async def increment(cls, pk: Any, **deltas: int) -> None:
+        await super().increment(pk, **deltas)
+        await AlbumService.increment_by_track(pk)
+        await PlaylistService.increment_by_track(pk)
+
+    @classmethod
+    async def get_playlist_pages(
+        cls,
+        playlist_id: int,
+        total: int,
+        offset: int,
+        limit: int,
+        url: URL
+    ) -> ItemList:
+        items = await cls._repository.slice_by_playlist(
+            playlist_id,
+            offset,
+            limit
+        ) if total > offset else []
+        return build_page(items, total, offset, limit, url)
+
+    @classmethod
+    async def get_link_rows(cls, ids: list[int]) -> list[dict]:
+        return await cls._repository.get_link_rows(ids)
+
+    @classmethod
+    async def get_text_or_404(cls, **kwargs) -> dict:
+        track = await cls._repository.get_text_or_none(**kwargs)
+
+        if not track:
+            raise HTTPException(status_code=404, detail='Track does not exist')
+        return track
+
+    @classmethod
+    async def get_playable_file_or_404(cls, **kwargs) -> str:
+        track = await cls._repository.get_file_or_none(**kwargs)
+
+        if not track:
+            raise HTTPException(status_code=404, detail='Track does not exist')
+        if not track['is_playable']:
+            raise HTTPException(
+                status_code=403,
+                detail='Track is not playable'
+            )
+        return track['file']
 
     @classmethod
     async def _pre_save(
@@ -135,54 +225,49 @@ class TrackService(ModelService):
         return to_save
 
 
+class AlbumTrackService(TrackService):
+    _repository = repositories.AlbumTrackRepository
+
+
 class PlaylistService(ModelService):
     _repository = repositories.PlaylistRepository
+    _cache_tag = 'playlist'
+    _search_kind = 'playlist'
+    _suggest_kind = 'playlist'
 
     @classmethod
-    async def get_pages(cls, offset: int, limit: int, url: URL, **kwargs) -> ItemList:
-        playlists = await cls._repository.all(**kwargs)
-        for i, playlist in enumerate(playlists):
-            playlists[i] = {
-                **playlist.dict(exclude={'tracks', 'artists'}),
-                'artists': playlist.artists[:15],
-                'tracks': paginate(
+    async def _prepare_page_items(
+        cls,
+        playlists: list[models.Playlist]
+    ) -> list:
+        await cls._repository.prefetch_previews(playlists, PREVIEW_LIMIT)
+        return [
+            {
+                **playlist.dict(exclude={'tracks'}),
+                'tracks': _build_track_preview(
+                    'playlists',
+                    playlist.id,
                     playlist.tracks,
-                    0,
-                    15,
-                    URL('http://127.0.0.1:8000/api/v1/playlists/{}/tracks'
-                            '?offset=0&limit=15'.format(playlist.id))
+                    playlist.track_count
                 )
-            }
-        return paginate(playlists, offset, limit, url)
+            } for playlist in playlists
+        ]
 
     @classmethod
     async def create(cls, schema: CreateSchema | None = None, **kwargs) -> Model:
-        upload_path = get_playlist_image_upload_path()
-        small_image_path = upload_image(
-            upload_path,
+        image_paths = await upload_images(
+            get_playlist_image_upload_path(),
             schema.image,
-            (100, 100)
-        )
-        normal_image_path = upload_image(
-            upload_path,
-            schema.image,
-            (450, 450)
+            IMAGE_SIZES
         )
 
         async with database.connection() as conn:
             async with conn.transaction():
                 playlist: models.Playlist = await super().create(schema, **kwargs)
 
-                small_image_obj = await ImageService.create(
-                    url=small_image_path,
-                    size=ImageSize.SMALL
-                )
-                normal_image_obj = await ImageService.create(
-                    url=normal_image_path,
-                    size=ImageSize.NORMAL
-                )
-                await playlist.images.add(small_image_obj)
-                await playlist.images.add(normal_image_obj)
+                for size, url in image_paths.items():
+                    image_obj = await ImageService.create(url=url, size=size)
+                    await playlist.images.add(image_obj)
 
         return {
             **playlist.dict(exclude={'tracks'}),
@@ -203,37 +288,161 @@ class PlaylistService(ModelService):
         playlist = await super().update(schema, **kwargs)
 
         if schema.image:
-            upload_path = get_playlist_image_upload_path()
-            small_image_path = upload_image(upload_path, schema.image, (100, 100))
-            normal_image_path = upload_image(upload_path, schema.image, (450, 450))
+            image_paths = await upload_images(
+                get_playlist_image_upload_path(),
+                schema.image,
+                IMAGE_SIZES
+            )
             for image in playlist.images:
-                if image.size == ImageSize.NORMAL:
-                    url = normal_image_path
-                else:
-                    url = small_image_path
-                await image.update(url=url)
+                await image.update(url=image_paths[image.size])
+            await cls.touch(playlist.id)
+            await cls.invalidate_responses(playlist.id)
 
         return playlist
 
+    @classmethod
+    async def increment_by_track(cls, track_id: int, **deltas: int) -> None:
+        await cls._repository.increment_by_track(track_id, **deltas)
+
+    @classmethod
+    async def get_track_count_or_404(cls, id: int) -> int:
+        track_count = await cls._repository.get_track_count_or_none(id)
+
+        if track_count is None:
+            raise HTTPException(
+                status_code=404,
+                detail='Playlist does not exist'
+            )
+        return track_count
+
+    @classmethod
+    async def add_tracks(
+        cls,
+        playlist: models.Playlist,
+        track_ids: list[int]
+    ) -> None:
+        track_ids = list(dict.fromkeys(track_ids))
+        positions = {id: position for position, id in enumerate(track_ids)}
+        tracks = sorted(
+            await TrackService.get_link_rows(track_ids),
+            key=lambda track: positions[track['id']]
+        )
+
+        found = {track['id'] for track in tracks}
+        missing = [id for id in track_ids if id not in found]
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail='Tracks do not exist: {}'.format(
+                    ', '.join(map(str, missing))
+                )
+            )
+
+        async with database.connection() as conn:
+            async with conn.transaction():
+                await cls._repository.add_tracks(playlist, tracks)
+        await cls.invalidate_responses(playlist.id)
+
+    @classmethod
+    async def remove_tracks(
+        cls,
+        playlist: models.Playlist,
+        track_ids: list[int]
+    ) -> None:
+        async with database.connection() as conn:
+            async with conn.transaction():
+                await cls._repository.remove_tracks(
+                    playlist,
+                    list(dict.fromkeys(track_ids))
+                )
+        await cls.invalidate_responses(playlist.id)
+
     @classmethod
     async def _pre_save(cls, schema: CreateSchema | UpdateSchema) -> dict[str, Any]:
         return schema.dict(exclude={'image'}, exclude_none=True)
 
 
-class SavedTrackService(ModelService):
+class SavedService(ModelService):
+    _saved_service: Type[ModelService]
+    _saved_field: str
+    _counter_field: str
+
+    @classmethod
+    async def save(cls, user: User, obj: Model) -> None:
+        async with database.connection() as conn:
+            async with conn.transaction():
+                created = await cls._repository.create_or_ignore(
+                    user=user,
+                    **{cls._saved_field: obj}
+                )
+                if created:
+                    await cls._saved_service.increment(
+                        obj.pk,
+                        **{cls._counter_field: 1}
+                    )
+        if created:
+            await cls._saved_service.invalidate_responses(obj.pk)
+
+    @classmethod
+    async def remove(cls, user_id: int, id: int) -> None:
+        # Counters follow the rows the statements actually changed, so
+        # concurrent saves and removes can not count the same row twice.
+        async with database.connection() as conn:
+            async with conn.transaction():
+                removed = await cls._repository.delete_rowcount(
+                    user=user_id,
+                    **{cls._saved_field: id}
+                )
+                if removed:
+                    await cls._saved_service.increment(
+                        id,
+                        **{cls._counter_field: -removed}
+                    )
+        if removed:
+            await cls._saved_service.invalidate_responses(id)
+
+
+class SavedTrackService(SavedService):
     _repository = repositories.SavedTrackRepository
+    _use_rows = True
+    _saved_service = TrackService
+    _saved_field = 'track'
+    _counter_field = 'saved_count'
 
 
-class SavedAlbumService(ModelService):
+class SavedAlbumService(SavedService):
     _repository = repositories.SavedAlbumRepository
+    _use_rows = True
+    _saved_service = AlbumService
+    _saved_field = 'album'
+    _counter_field = 'saved_count'
+
+    @classmethod
+    async def _prepare_page_items(cls, albums: list[dict]) -> list:
+        return [
+            {
+                **album,
+                'tracks': _build_track_preview(
+                    'albums',
+                    album['id'],
+                    album['tracks'],
+                    album['track_count']
+                )
+            } for album in albums
+        ]
 
 
-class SavedPlaylistService(ModelService):
+class SavedPlaylistService(SavedService):
     _repository = repositories.SavedPlaylistRepository
+    _saved_service = PlaylistService
+    _saved_field = 'playlist'
+    _counter_field = 'follower_count'
 
 
 class GenreService(ModelService):
     _repository = repositories.GenreRepository
+    _cache_tag = 'genre'
+    _suggest_kind = 'genre'
 
 
 class ImageService(ModelService):
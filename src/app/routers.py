@@ -9,6 +9,7 @@ from src.app.music.routes import (
     saved_router,
     playlist_router
 )
+from src.app.search.routes import search_router, suggest_router
 from src.config.settings import API_V1_PREFIX
 
 
@@ -21,3 +22,5 @@ app_router.include_router(genre_router)
 app_router.include_router(saved_router)
 app_router.include_router(auth_router)
 app_router.include_router(user_router)
+app_router.include_router(search_router)
+app_router.include_router(suggest_router)
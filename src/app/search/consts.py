@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class SearchType(str, Enum):
+    TRACK = 'track'
+    ALBUM = 'album'
+    PLAYLIST = 'playlist'
+    ARTIST = 'artist'
+
+
+class SuggestType(str, Enum):
+    TRACK = 'track'
+    ALBUM = 'album'
+    PLAYLIST = 'playlist'
+    ARTIST = 'artist'
+    GENRE = 'genre'
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Query, Request
+
+from src.core.responses import fast_response
+from src.app.search import schemas
+from src.app.search.consts import SearchType, SuggestType
+from src.app.search.services import SearchService, SuggestService
+
+search_router = APIRouter(prefix='/search', tags=['Search'])
+suggest_router = APIRouter(prefix='/suggest', tags=['Search'])
+
+
+@search_router.get('', response_model=schemas.SearchList, responses={
+    200: {'description': 'Pages of ranked search results'}
+})
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description='Query'),
+    type: list[SearchType] | None = Query(
+        None,
+        description='Result types to include, all by default'
+    ),
+    offset: int = Query(0, ge=0, le=100000),
+    limit: int = Query(15, ge=0, le=50)
+):
+    return fast_response(schemas.SearchList, await SearchService.get_pages(
+        q,
+        type or list(SearchType),
+        offset,
+        limit,
+        request.url
+    ))
+
+
+@suggest_router.get('', response_model=list[schemas.SuggestHit], responses={
+    200: {'description': 'Typeahead suggestions'}
+})
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description='Prefix'),
+    type: list[SuggestType] | None = Query(
+        None,
+        description='Suggestion types to include, all by default'
+    ),
+    limit: int = Query(10, ge=0, le=20)
+):
+    return SuggestService.suggest(q, type or list(SuggestType), limit)
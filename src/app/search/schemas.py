@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+from src.app.base.schemas import ItemList
+from src.app.search.consts import SearchType, SuggestType
+
+
+class SearchHit(BaseModel):
+    type: SearchType
+    id: int
+    title: str
+
+
+class SearchList(ItemList):
+    items: list[SearchHit]
+
+
+class SuggestHit(BaseModel):
+    type: SuggestType
+    id: int
+    title: str
@@ -0,0 +1,108 @@
+import sqlalchemy
+from starlette.datastructures import URL
+
+from src.core.db import database
+from src.core.search import search_index
+from src.core.suggest import suggest_index
+from src.app.base.paginator import build_page
+from src.app.base.schemas import ItemList
+from src.app.music import models
+from src.app.user.models import User
+from src.app.search.consts import SearchType, SuggestType
+
+
+def _owns_music() -> sqlalchemy.sql.ClauseElement:
+    album_table = models.Album.Meta.table
+    return sqlalchemy.exists().where(
+        album_table.c.artist == User.Meta.table.c.id
+    )
+
+
+class SearchService:
+    @classmethod
+    async def get_pages(
+        cls,
+        query: str,
+        types: list[SearchType],
+        offset: int,
+        limit: int,
+        url: URL
+    ) -> ItemList:
+        total, hits = await search_index.search(
+            query,
+            [search_type.value for search_type in types],
+            offset,
+            limit
+        )
+        items = [
+            {'type': hit['kind'], 'id': hit['object_id'], 'title': hit['title']}
+            for hit in hits
+        ]
+        return build_page(items, total, offset, limit, url)
+
+    @classmethod
+    async def rebuild(cls) -> None:
+        for search_type, table, title, body, where in (
+            (SearchType.TRACK, models.Track.Meta.table, 'title', 'text', True),
+            (SearchType.ALBUM, models.Album.Meta.table, 'title', None, True),
+            (
+                SearchType.PLAYLIST,
+                models.Playlist.Meta.table,
+                'title',
+                None,
+                True
+            ),
+            (
+                SearchType.ARTIST,
+                User.Meta.table,
+                'username',
+                None,
+                _owns_music()
+            )
+        ):
+            await search_index.replace(search_type.value, sqlalchemy.select([
+                sqlalchemy.literal(search_type.value),
+                table.c.id,
+                table.c[title],
+                table.c[body] if body else sqlalchemy.null()
+            ]).where(where))
+
+
+class SuggestService:
+    @classmethod
+    def suggest(
+        cls,
+        query: str,
+        types: list[SuggestType],
+        limit: int
+    ) -> list[dict]:
+        return [
+            {'type': kind, 'id': id, 'title': title}
+            for kind, id, title in suggest_index.suggest(
+                query,
+                {suggest_type.value for suggest_type in types},
+                limit
+            )
+        ]
+
+    @classmethod
+    async def build(cls, generation: int | None = None) -> None:
+        if generation is None:
+            generation = await suggest_index.get_generation()
+        entries = []
+        for suggest_type, table, title, where in (
+            (SuggestType.TRACK, models.Track.Meta.table, 'title', True),
+            (SuggestType.ALBUM, models.Album.Meta.table, 'title', True),
+            (SuggestType.PLAYLIST, models.Playlist.Meta.table, 'title', True),
+            (SuggestType.ARTIST, User.Meta.table, 'username', _owns_music()),
+            (SuggestType.GENRE, models.Genre.Meta.table, 'title', True)
+        ):
+            entries.extend(
+                (suggest_type.value, row[0], row[1])
+                for row in await database.fetch_all(
+                    sqlalchemy.select([table.c.id, table.c[title]])
+                        .where(where)
+                )
+            )
+        suggest_index.build(entries)
+        suggest_index.generation = generation
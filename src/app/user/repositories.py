@@ -1,6 +1,19 @@
 from src.app.base.repositories import ModelRepository
+from src.app.music.models import Album
 from src.app.user.models import User
 
 
 class UserRepository(ModelRepository):
     _model = User
+
+    @classmethod
+    async def get_auth_state_or_none(cls, id: int) -> dict | None:
+        rows = await cls._model.objects\
+            .filter(id=id)\
+            .limit(1)\
+            .values(['invalidate_before', 'is_active'])
+        return rows[0] if rows else None
+
+    @classmethod
+    async def owns_music(cls, id: int) -> bool:
+        return await Album.objects.filter(artist=id).exists()
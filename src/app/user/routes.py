@@ -2,9 +2,10 @@ import os
 
 from fastapi import APIRouter, Depends
 
-from src.utils.image import upload_image
+from src.utils.image import upload_images
 from src.app.user.models import User
 from src.app.user.schemas import UserUpdate
+from src.app.user.services import UserService
 from src.app.auth.permissions import get_current_active_user
 from src.app.base.uploads import get_avatar_upload_path
 from src.app.base.schemas import ExceptionMessage
@@ -48,7 +49,14 @@ async def update_current_user(schema: UserUpdate, current_user: User = Depends(g
         upload_path = get_avatar_upload_path()
         os.makedirs(upload_path, exist_ok=True)
 
-        image_path = upload_image(upload_path, avatar, (250, 250))
-        avatar = image_path
-
-    return await current_user.update(avatar=avatar, about=schema.about)
+        image_paths = await upload_images(
+            upload_path,
+            avatar,
+            {'avatar': (250, 250)}
+        )
+        avatar = image_paths['avatar']
+
+    user = await current_user.update(avatar=avatar, about=schema.about)
+    UserService.invalidate_cache(user.id)
+    await UserService.invalidate_responses(user.id)
+    return user
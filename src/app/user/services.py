@@ -1,6 +1,50 @@
+from src.config import settings
+from src.core.cache import TTLCache
 from src.app.base.services import ModelService
+from src.app.user.models import User
 from src.app.user.repositories import UserRepository
 
 
 class UserService(ModelService):
     _repository = UserRepository
+    _cache_tag = 'user'
+    _search_kind = 'artist'
+    _search_fields = ('username',)
+    _suggest_kind = 'artist'
+    _cache = TTLCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL)
+
+    @classmethod
+    async def get_cached_object_or_404(cls, id: int) -> User:
+        """Return the user from the per-process cache, checked against the
+        columns that revoke access.
+
+        Invalidation only reaches the worker that handled the change, so
+        invalidate_before and is_active are always read from the database
+        and a cached user that disagrees with them is reloaded.
+        """
+        user = cls._cache.get(id)
+        if user is not None:
+            state = await cls._repository.get_auth_state_or_none(id)
+            if state is None or any(
+                getattr(user, name) != value for name, value in state.items()
+            ):
+                cls._cache.delete(id)
+                user = None
+
+        if user is None:
+            user = await cls.get_object_or_404(pk=id)
+            cls._cache.set(id, user)
+        return user
+
+    @classmethod
+    async def index_search(cls, obj: User) -> None:
+        # Users are searched and suggested as artists, so only once they
+        # have an album; AlbumService re-checks on album create and delete.
+        if await cls._repository.owns_music(obj.pk):
+            await super().index_search(obj)
+        else:
+            await cls.unindex_search(obj.pk)
+
+    @classmethod
+    def invalidate_cache(cls, id: int) -> None:
+        cls._cache.delete(id)
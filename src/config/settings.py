@@ -7,6 +7,39 @@ load_dotenv()
 API_V1_PREFIX = '/api/v1'
 SITE_DOMAIN = os.environ.get('SITE_DOMAIN', 'localhost:8000')
 DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite')
+DATABASE_POOL_MIN_SIZE = int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2))
+DATABASE_POOL_MAX_SIZE = int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10))
+DATABASE_POOL_ACQUIRE_TIMEOUT = float(
+    os.environ.get('DATABASE_POOL_ACQUIRE_TIMEOUT', 10)
+)
+DATABASE_POOL_MAX_INACTIVE_LIFETIME = float(
+    os.environ.get('DATABASE_POOL_MAX_INACTIVE_LIFETIME', 300)
+)
+DATABASE_CONNECT_TIMEOUT = float(os.environ.get('DATABASE_CONNECT_TIMEOUT', 10))
+DATABASE_COMMAND_TIMEOUT = float(os.environ.get('DATABASE_COMMAND_TIMEOUT', 30))
+DATABASE_STATEMENT_CACHE_SIZE = int(
+    os.environ.get('DATABASE_STATEMENT_CACHE_SIZE', 100)
+)
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'wal')
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'normal')
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -16 * 1024))
+SQLITE_BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 5))
+REDIS_URL = os.environ.get('REDIS_URL')
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+FAST_JSON_RESPONSES = os.environ.get(
+    'FAST_JSON_RESPONSES',
+    'false'
+).lower() == 'true'
+RESPONSE_COMPRESSION = os.environ.get(
+    'RESPONSE_COMPRESSION',
+    'true'
+).lower() == 'true'
+COMPRESSION_MINIMUM_SIZE = int(
+    os.environ.get('COMPRESSION_MINIMUM_SIZE', 1024)
+)
+GZIP_COMPRESS_LEVEL = int(os.environ.get('GZIP_COMPRESS_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 4))
 ORIGINS = [
     "http://localhost",
     "http://127.0.0.1",
@@ -51,9 +84,21 @@ PASSWORD_RESET_TOKEN_SECRET_KEY = os.environ.get(
     '3fe69992d6b2e6a58beb46d715167876a5832544b9025e2b78eaaf40084a46be'
 )
 
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', 64))
+USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', 1024))
+USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 30))
+
 
 ALLOWED_IMAGE_FORMAT_EXTENSIONS = 'jpg', 'jpeg', 'png'
 ALLOWED_AUDIO_FORMAT_EXTENSIONS = 'mp3',
+AUDIO_UPLOAD_MAX_SIZE = int(
+    os.environ.get('AUDIO_UPLOAD_MAX_SIZE', 100 * 1024 * 1024)
+)
+AUDIO_UPLOAD_CHUNK_SIZE = 1024 * 1024
+IMAGE_PROCESS_POOL_WORKERS = int(
+    os.environ.get('IMAGE_PROCESS_POOL_WORKERS', 2)
+)
 
 
 MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
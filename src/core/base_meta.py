@@ -1,4 +1,5 @@
 from src.core.db import BaseMeta
+from src.core.search import search_index
 from src.app.user.models import User
 from src.app.music.models import (
     Image, Album, Track, Playlist, SavedAlbum, SavedPlaylist, SavedTrack
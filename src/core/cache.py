@@ -0,0 +1,190 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+import orjson
+import aioredis
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+from starlette.datastructures import URL
+
+from src.config import settings
+from src.core.responses import fast_response, shape_response
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            return None
+
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class ResponseCache:
+    """Redis cache of serialized GET responses, tagged by the entities in
+    them.
+
+    invalidate() bumps a generation counter before dropping the tagged
+    keys. A response is only stored while the generation is still the one
+    seen before it was loaded, so a reader that raced a write can not put
+    the stale body back for the whole ttl.
+    """
+    _key_prefix = 'response:'
+    _tag_prefix = 'tag:'
+    _generation_key = 'response-generation'
+
+    def __init__(
+        self,
+        ttl: int,
+        relation_tags: dict[str, str],
+        redis: aioredis.Redis | None = None
+    ) -> None:
+        self.ttl = ttl
+        self.redis = redis
+        self._relation_tags = relation_tags
+
+    def connect(self, url: str) -> None:
+        self.redis = aioredis.from_url(url)
+
+    async def disconnect(self) -> None:
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+    async def get_or_set(
+        self,
+        url: URL,
+        response_model: Any,
+        entity: str,
+        loader: Callable[[], Awaitable[Any]],
+        partial: bool = False
+    ) -> Any:
+        if self.redis is None:
+            return fast_response(response_model, await loader(), partial)
+
+        key = '{}{}'.format(self._key_prefix, url)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.get(self._generation_key)
+                content, generation = await pipe.execute()
+        except aioredis.RedisError:
+            return fast_response(response_model, await loader(), partial)
+        if content is not None:
+            return Response(content=content, media_type='application/json')
+
+        if partial or settings.FAST_JSON_RESPONSES:
+            data = shape_response(response_model, await loader(), partial)
+            content = orjson.dumps(data)
+        else:
+            data = jsonable_encoder(parse_obj_as(
+                response_model,
+                jsonable_encoder(await loader())
+            ))
+            content = json.dumps(data, separators=(',', ':')).encode()
+
+        await self._store(
+            key,
+            content,
+            self._collect_tags(data, entity),
+            generation
+        )
+        return Response(content=content, media_type='application/json')
+
+    async def _store(
+        self,
+        key: str,
+        content: bytes,
+        tags: set[str],
+        generation: bytes | None
+    ) -> None:
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(self._generation_key)
+                if await pipe.get(self._generation_key) != generation:
+                    return
+                pipe.multi()
+                pipe.set(key, content, ex=self.ttl)
+                for tag in tags:
+                    tag_key = '{}{}'.format(self._tag_prefix, tag)
+                    pipe.sadd(tag_key, key)
+                    pipe.expire(tag_key, self.ttl)
+                await pipe.execute()
+        except aioredis.RedisError:
+            pass
+
+    async def invalidate(self, *tags: str) -> None:
+        if self.redis is None or not tags:
+            return
+
+        tag_keys = ['{}{}'.format(self._tag_prefix, tag) for tag in tags]
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.incr(self._generation_key)
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                _, *members = await pipe.execute()
+            keys = set().union(*members)
+            await self.redis.delete(*keys, *tag_keys)
+        except aioredis.RedisError:
+            pass
+
+    def _collect_tags(self, data: Any, entity: str) -> set[str]:
+        tags = {entity} if isinstance(data, list) or 'items' in data else set()
+        self._walk(data, entity, tags)
+        return tags
+
+    def _walk(self, value: Any, entity: str | None, tags: set[str]) -> None:
+        if isinstance(value, list):
+            for item in value:
+                self._walk(item, entity, tags)
+        elif isinstance(value, dict):
+            if entity and 'items' not in value:
+                tags.add(
+                    '{}:{}'.format(entity, value['id'])
+                    if 'id' in value else entity
+                )
+            for key, item in value.items():
+                if key == 'items':
+                    self._walk(item, entity, tags)
+                elif key in self._relation_tags:
+                    self._walk(item, self._relation_tags[key], tags)
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_TTL,
+    relation_tags={
+        'album': 'album',
+        'tracks': 'track',
+        'genre': 'genre',
+        'artist': 'user',
+        'artists': 'user',
+        'author': 'user'
+    }
+)
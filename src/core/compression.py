@@ -0,0 +1,175 @@
+import zlib
+from typing import Callable, Sequence
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ENCODINGS = ('br', 'gzip')
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        weight = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    default = weights.get('*', 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, default)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def get_compressor(
+    encoding: str,
+    gzip_level: int,
+    brotli_quality: int
+) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    if encoding == 'br':
+        compressor = brotli.Compressor(
+            mode=brotli.MODE_TEXT,
+            quality=brotli_quality
+        )
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(
+        gzip_level,
+        zlib.DEFLATED,
+        16 + zlib.MAX_WBITS
+    )
+    return compressor.compress, compressor.flush
+
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression of text responses.
+
+    Only media_types are compressed, and only once the body reaches
+    minimum_size, so audio, images and tiny bodies pass through as they
+    are. Requests under exclude_paths are not looked at at all.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        media_types: Sequence[str] = ('application/json',),
+        exclude_paths: Sequence[str] = ()
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.media_types = frozenset(media_types)
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send
+    ) -> None:
+        if scope['type'] != 'http' \
+                or scope['path'].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get('accept-encoding', '')
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        encoding: str,
+        send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Message = {}
+        self.started = False
+        self.compress: Callable[[bytes], bytes] | None = None
+        self.finish: Callable[[], bytes] | None = None
+
+    async def send(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            self.start_message = message
+            if not self._is_compressible(
+                MutableHeaders(raw=message['headers'])
+            ):
+                self.started = True
+                await self._send(message)
+            # Otherwise headers depend on the first body chunk, so hold
+            # them back.
+        elif message['type'] != 'http.response.body':
+            # Extensions such as zerocopysend carry the body themselves,
+            # so the held headers go out untouched.
+            if not self.started:
+                self.started = True
+                await self._send(self.start_message)
+            await self._send(message)
+        elif not self.started:
+            self.started = True
+            await self._send_first(message)
+        elif self.compress is None:
+            await self._send(message)
+        else:
+            body = self.compress(message.get('body', b''))
+            if not message.get('more_body', False):
+                body += self.finish()
+            await self._send({**message, 'body': body})
+
+    def _is_compressible(self, headers: MutableHeaders) -> bool:
+        media_type = headers.get('content-type', '').split(';')[0].strip()
+        return (
+            self.start_message['status'] not in (204, 206, 304)
+            and 'content-encoding' not in headers
+            and media_type.lower() in self.middleware.media_types
+        )
+
+    async def _send_first(self, message: Message) -> None:
+        headers = MutableHeaders(raw=self.start_message['headers'])
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        headers.add_vary_header('Accept-Encoding')
+        if not more_body and len(body) < self.middleware.minimum_size:
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        self.compress, self.finish = get_compressor(
+            self.encoding,
+            self.middleware.gzip_level,
+            self.middleware.brotli_quality
+        )
+        headers['Content-Encoding'] = self.encoding
+        body = self.compress(body)
+        if more_body:
+            del headers['Content-Length']
+        else:
+            body += self.finish()
+            headers['Content-Length'] = str(len(body))
+
+        await self._send(self.start_message)
+        await self._send({**message, 'body': body})
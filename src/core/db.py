@@ -1,11 +1,65 @@
 import databases
 import sqlalchemy
+from sqlalchemy.sql import ClauseElement
 
 import ormar
 
 from src.config import settings
 
-database = databases.Database(settings.DATABASE_URL)
+
+class Database(databases.Database):
+    SUPPORTED_BACKENDS = {
+        **databases.Database.SUPPORTED_BACKENDS,
+        'sqlite': 'src.core.sqlite:SQLiteBackend',
+        'postgresql': 'src.core.postgres:PostgresBackend',
+        'postgres': 'src.core.postgres:PostgresBackend'
+    }
+
+    @property
+    def is_postgres(self) -> bool:
+        return self.url.dialect.startswith('postgres')
+
+    async def execute_rowcount(self, query: ClauseElement) -> int:
+        """Execute an INSERT, UPDATE or DELETE and return how many rows it
+        affected, which execute() does not report on every backend.
+        """
+        async with self.connection() as connection:
+            async with connection._query_lock:
+                return await connection._connection.execute_rowcount(query)
+
+
+def get_database_options(url: str) -> dict:
+    dialect = databases.DatabaseURL(url).dialect
+    if dialect in ('postgresql', 'postgres'):
+        return {
+            'min_size': settings.DATABASE_POOL_MIN_SIZE,
+            'max_size': settings.DATABASE_POOL_MAX_SIZE,
+            'acquire_timeout': settings.DATABASE_POOL_ACQUIRE_TIMEOUT,
+            'max_inactive_connection_lifetime':
+                settings.DATABASE_POOL_MAX_INACTIVE_LIFETIME,
+            'timeout': settings.DATABASE_CONNECT_TIMEOUT,
+            'command_timeout': settings.DATABASE_COMMAND_TIMEOUT,
+            'statement_cache_size': settings.DATABASE_STATEMENT_CACHE_SIZE
+        }
+    if dialect == 'sqlite':
+        # connections are opened per task, so the pragmas run on each one
+        return {
+            'timeout': settings.SQLITE_BUSY_TIMEOUT,
+            'cached_statements': settings.DATABASE_STATEMENT_CACHE_SIZE,
+            'pragmas': {
+                'journal_mode': settings.SQLITE_JOURNAL_MODE,
+                'synchronous': settings.SQLITE_SYNCHRONOUS,
+                'mmap_size': settings.SQLITE_MMAP_SIZE,
+                'cache_size': settings.SQLITE_CACHE_SIZE
+            }
+        }
+    return {}
+
+
+database = Database(
+    settings.DATABASE_URL,
+    **get_database_options(settings.DATABASE_URL)
+)
 metadata = sqlalchemy.MetaData()
 
 
@@ -0,0 +1,36 @@
+import databases
+from databases.backends.postgres import (
+    PostgresBackend as BasePostgresBackend,
+    PostgresConnection as BasePostgresConnection
+)
+from sqlalchemy.sql import ClauseElement
+
+
+class PostgresConnection(BasePostgresConnection):
+    async def acquire(self) -> None:
+        assert self._connection is None, 'Connection is already acquired'
+        assert self._database._pool is not None, 'DatabaseBackend is not running'
+        self._connection = await self._database._pool.acquire(
+            timeout=self._database.acquire_timeout
+        )
+
+    async def execute_rowcount(self, query: ClauseElement) -> int:
+        assert self._connection is not None, 'Connection is not acquired'
+        query_str, args, _ = self._compile(query)
+        # asyncpg returns the command tag, e.g. 'DELETE 1' or 'INSERT 0 1'
+        status = await self._connection.execute(query_str, *args)
+        return int(status.rsplit(' ', 1)[-1])
+
+
+class PostgresBackend(BasePostgresBackend):
+    def __init__(
+        self,
+        database_url: str | databases.DatabaseURL,
+        acquire_timeout: float | None = None,
+        **options
+    ) -> None:
+        super().__init__(database_url, **options)
+        self.acquire_timeout = acquire_timeout
+
+    def connection(self) -> PostgresConnection:
+        return PostgresConnection(self, self._dialect)
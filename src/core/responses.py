@@ -0,0 +1,129 @@
+import hashlib
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, get_args, get_origin
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON
+from pydantic.utils import lenient_issubclass
+
+from src.config import settings
+
+
+class Reference(dict):
+    """{pk: value} standing in for a relation that was not expanded.
+
+    shape_response passes it through as it is, since the relation's schema
+    may not have the primary key at all.
+    """
+
+
+@lru_cache(maxsize=None)
+def _get_fields(
+    model: type[BaseModel]
+) -> tuple[tuple[str, type[BaseModel] | None, bool, Any], ...]:
+    return tuple(
+        (
+            field.alias,
+            field.type_ if lenient_issubclass(field.type_, BaseModel) else None,
+            field.shape != SHAPE_SINGLETON,
+            field.default
+        )
+        for field in model.__fields__.values()
+    )
+
+
+def _shape_object(
+    model: type[BaseModel],
+    value: Any,
+    partial: bool
+) -> dict | None:
+    if value is None:
+        return None
+    if isinstance(value, Reference):
+        return dict(value)
+    if isinstance(value, BaseModel):
+        value = value.dict()
+
+    data = {}
+    for name, nested, many, default in _get_fields(model):
+        if partial and name not in value:
+            continue
+        item = value.get(name, default)
+        if nested is not None and item is not None:
+            item = [
+                _shape_object(nested, i, partial) for i in item
+            ] if many else _shape_object(nested, item, partial)
+        data[name] = item
+    return data
+
+
+def shape_response(
+    response_model: Any,
+    value: Any,
+    partial: bool = False
+) -> Any:
+    """Project already validated data onto response_model's fields.
+
+    Unlike FastAPI's response validation nothing is coerced or checked, so
+    the data must already have the right types. With partial, fields
+    missing from the data are left out instead of defaulted, which is how
+    sparse fieldsets keep their shape.
+    """
+    if get_origin(response_model) is list:
+        item_model = get_args(response_model)[0]
+        return [
+            shape_response(item_model, item, partial) for item in value
+        ]
+    if lenient_issubclass(response_model, BaseModel):
+        return _shape_object(response_model, value, partial)
+    return value
+
+
+def fast_response(
+    response_model: Any,
+    value: Any,
+    partial: bool = False
+) -> Any:
+    if not partial and not settings.FAST_JSON_RESPONSES:
+        return value
+    return ORJSONResponse(shape_response(response_model, value, partial))
+
+
+def get_etag(request: Request, version: Any) -> str:
+    digest = hashlib.blake2b(
+        repr((str(request.url), version)).encode(),
+        digest_size=16
+    ).hexdigest()
+    return 'W/"{}"'.format(digest)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    return etag.removeprefix('W/') in {
+        tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+    }
+
+
+async def conditional_response(
+    request: Request,
+    response: Response,
+    version: Any,
+    loader: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Answer If-None-Match from version alone, loading only on a miss.
+
+    version must change whenever the content behind the URL does. The weak
+    ETag is a hash of the URL and version, attached once loader succeeds.
+    """
+    etag = get_etag(request, version)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+
+    content = await loader()
+    target = content if isinstance(content, Response) else response
+    target.headers['ETag'] = etag
+    return content
@@ -0,0 +1,177 @@
+import re
+from typing import Any
+
+import databases
+import sqlalchemy
+
+from src.core.db import database, metadata
+
+TABLE_NAME = 'search_index'
+
+SQLITE_DDL = (
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        kind UNINDEXED,
+        object_id UNINDEXED,
+        title,
+        body,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    ''',
+)
+POSTGRES_DDL = (
+    '''
+    CREATE TABLE IF NOT EXISTS search_index (
+        kind VARCHAR(20) NOT NULL,
+        object_id INTEGER NOT NULL,
+        title TEXT,
+        body TEXT,
+        document TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+        ) STORED,
+        PRIMARY KEY (kind, object_id)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS ix_search_index_document '
+    'ON search_index USING GIN (document)'
+)
+
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+
+class SearchIndex:
+    _token_pattern = re.compile(r'\w+', re.UNICODE)
+
+    def __init__(self, database: databases.Database) -> None:
+        self.database = database
+        self.table = sqlalchemy.Table(
+            TABLE_NAME,
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column('kind', sqlalchemy.String(20)),
+            sqlalchemy.Column('object_id', sqlalchemy.Integer),
+            sqlalchemy.Column('title', sqlalchemy.Text),
+            sqlalchemy.Column('body', sqlalchemy.Text)
+        )
+
+    @property
+    def is_postgres(self) -> bool:
+        return self.database.url.dialect.startswith('postgres')
+
+    async def add(
+        self,
+        kind: str,
+        object_id: int,
+        title: str,
+        body: str | None = None
+    ) -> None:
+        async with self.database.transaction():
+            await self.remove(kind, object_id)
+            await self.database.execute(self.table.insert().values(
+                kind=kind,
+                object_id=object_id,
+                title=title,
+                body=body
+            ))
+
+    async def remove(self, kind: str, *object_ids: int) -> None:
+        if object_ids:
+            await self.database.execute(self.table.delete().where(
+                self.table.c.kind == kind,
+                self.table.c.object_id.in_(object_ids)
+            ))
+
+    async def replace(self, kind: str, rows: sqlalchemy.sql.Select) -> None:
+        async with self.database.transaction():
+            await self.database.execute(
+                self.table.delete().where(self.table.c.kind == kind)
+            )
+            await self.database.execute(self.table.insert().from_select(
+                ['kind', 'object_id', 'title', 'body'],
+                rows
+            ))
+
+    async def search(
+        self,
+        query: str,
+        kinds: list[str],
+        offset: int,
+        limit: int
+    ) -> tuple[int, list[dict[str, Any]]]:
+        tokens = self._token_pattern.findall(query)
+        if not tokens or not kinds:
+            return 0, []
+
+        if self.is_postgres:
+            match, rank = self._get_postgres_clauses(' '.join(tokens))
+        else:
+            match, rank = self._get_sqlite_clauses(tokens)
+        where = sqlalchemy.and_(match, self.table.c.kind.in_(kinds))
+
+        total = await self.database.fetch_val(
+            sqlalchemy.select([sqlalchemy.func.count()])
+                .select_from(self.table)
+                .where(where)
+        )
+        if not total or offset >= total or not limit:
+            return total, []
+
+        rows = await self.database.fetch_all(
+            sqlalchemy.select([
+                self.table.c.kind,
+                self.table.c.object_id,
+                self.table.c.title,
+                rank.label('rank')
+            ])
+                .where(where)
+                .order_by(
+                    rank if not self.is_postgres else rank.desc(),
+                    self.table.c.kind,
+                    self.table.c.object_id
+                )
+                .offset(offset)
+                .limit(limit)
+        )
+        return total, [dict(row) for row in rows]
+
+    def _get_sqlite_clauses(self, tokens: list[str]) -> tuple[Any, Any]:
+        fts_table = sqlalchemy.literal_column(TABLE_NAME)
+        match = fts_table.op('MATCH')(' '.join(
+            '"{}"'.format(token) for token in tokens
+        ))
+        rank = sqlalchemy.func.bm25(
+            fts_table,
+            0.0,
+            0.0,
+            TITLE_WEIGHT,
+            BODY_WEIGHT
+        )
+        return match, rank
+
+    def _get_postgres_clauses(self, query: str) -> tuple[Any, Any]:
+        document = sqlalchemy.literal_column('{}.document'.format(TABLE_NAME))
+        ts_query = sqlalchemy.func.plainto_tsquery('simple', query)
+        return document.op('@@')(ts_query), sqlalchemy.func.ts_rank(
+            document,
+            ts_query
+        )
+
+
+search_index = SearchIndex(database)
+
+
+# search_index is not an ormar model, so databases built with
+# metadata.create_all() (benchmarks, tests) get it from these hooks while
+# deployed ones get it from the migration.
+@sqlalchemy.event.listens_for(metadata, 'after_create')
+def _create_table(target, connection, **kwargs) -> None:
+    statements = POSTGRES_DDL if connection.dialect.name == 'postgresql' \
+        else SQLITE_DDL
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+@sqlalchemy.event.listens_for(metadata, 'before_drop')
+def _drop_table(target, connection, **kwargs) -> None:
+    connection.exec_driver_sql('DROP TABLE IF EXISTS {}'.format(TABLE_NAME))
@@ -1,11 +1,63 @@
+import asyncio
+from typing import Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
+from src.config import settings
+
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix='password-hash'
+)
+_pending = 0
+
+
+async def _run_in_executor(func: Callable, *args) -> Any:
+    global _pending
+    max_pending = settings.PASSWORD_HASH_WORKERS + \
+        settings.PASSWORD_HASH_MAX_QUEUE
+    if _pending >= max_pending:
+        raise HTTPException(
+            status_code=503,
+            detail='Server is busy, try again later',
+            headers={'Retry-After': '1'}
+        )
+
+    loop = asyncio.get_running_loop()
+    future = _executor.submit(func, *args)
+    _pending += 1
+    # A cancelled request stops waiting while the hash keeps running, so the
+    # slot is only released once the executor is done with it.
+    future.add_done_callback(
+        lambda _: loop.call_soon_threadsafe(_release)
+    )
+    return await asyncio.wrap_future(future, loop=loop)
+
+
+def _release() -> None:
+    global _pending
+    _pending -= 1
+
+
+def get_password_hash_stats() -> dict[str, int]:
+    return {
+        'workers': settings.PASSWORD_HASH_WORKERS,
+        'pending': _pending,
+        'queued': max(_pending - settings.PASSWORD_HASH_WORKERS, 0)
+    }
+
 
-def get_password_hash(raw_password: str):
-    return pwd_context.encrypt(raw_password)
+async def get_password_hash(raw_password: str) -> str:
+    return await _run_in_executor(pwd_context.hash, raw_password)
 
 
-def verify_password(raw_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(raw_password, hashed_password)
+async def verify_password(raw_password: str, hashed_password: str) -> bool:
+    return await _run_in_executor(
+        pwd_context.verify,
+        raw_password,
+        hashed_password
+    )
@@ -0,0 +1,51 @@
+import aiosqlite
+import databases
+from databases.backends.sqlite import (
+    SQLiteBackend as BaseSQLiteBackend,
+    SQLiteConnection as BaseSQLiteConnection,
+    SQLitePool as BaseSQLitePool
+)
+from sqlalchemy.sql import ClauseElement
+
+
+class SQLitePool(BaseSQLitePool):
+    def __init__(
+        self,
+        url: databases.DatabaseURL,
+        pragmas: dict[str, str | int] | None = None,
+        **options
+    ) -> None:
+        super().__init__(url, **options)
+        self._script = ''.join(
+            'PRAGMA {} = {};'.format(name, value)
+            for name, value in (pragmas or {}).items()
+        )
+
+    async def acquire(self) -> aiosqlite.Connection:
+        connection = await super().acquire()
+        if self._script:
+            await connection.executescript(self._script)
+        return connection
+
+
+class SQLiteConnection(BaseSQLiteConnection):
+    async def execute_rowcount(self, query: ClauseElement) -> int:
+        assert self._connection is not None, 'Connection is not acquired'
+        query_str, args, _ = self._compile(query)
+        async with self._connection.cursor() as cursor:
+            await cursor.execute(query_str, args)
+            return cursor.rowcount
+
+
+class SQLiteBackend(BaseSQLiteBackend):
+    def __init__(
+        self,
+        database_url: str | databases.DatabaseURL,
+        pragmas: dict[str, str | int] | None = None,
+        **options
+    ) -> None:
+        super().__init__(database_url, **options)
+        self._pool = SQLitePool(self._database_url, pragmas, **options)
+
+    def connection(self) -> SQLiteConnection:
+        return SQLiteConnection(self._pool, self._dialect)
@@ -0,0 +1,190 @@
+import re
+import asyncio
+import unicodedata
+from bisect import bisect_left, insort
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Iterable
+
+import orjson
+import aioredis
+
+MAX_SCAN = 512
+RESYNC_INTERVAL = 5.0
+RETRY_DELAY = 1.0
+
+
+class PrefixIndex:
+    _token_pattern = re.compile(r'\w+', re.UNICODE)
+
+    def __init__(self) -> None:
+        self._keys: list[tuple[str, str, int]] = []  # (kind, key, id)
+        self._titles: dict[tuple[str, int], tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def build(self, entries: Iterable[tuple[str, int, str]]) -> None:
+        keys, titles = [], {}
+        for kind, id, title in entries:
+            tokens = self._tokenize(title)
+            titles[(kind, id)] = (title, ' '.join(tokens))
+            keys.extend((kind, key, id) for key in self._get_keys(tokens))
+        keys.sort()
+        self._keys, self._titles = keys, titles
+
+    def add(self, kind: str, id: int, title: str) -> None:
+        self.remove(kind, id)
+        tokens = self._tokenize(title)
+        self._titles[(kind, id)] = (title, ' '.join(tokens))
+        for key in self._get_keys(tokens):
+            insort(self._keys, (kind, key, id))
+
+    def remove(self, kind: str, *ids: int) -> None:
+        for id in ids:
+            entry = self._titles.pop((kind, id), None)
+            if entry is None:
+                continue
+            for key in self._get_keys(entry[1].split()):
+                i = bisect_left(self._keys, (kind, key, id))
+                if i < len(self._keys) and self._keys[i] == (kind, key, id):
+                    del self._keys[i]
+
+    def suggest(
+        self,
+        prefix: str,
+        kinds: set[str],
+        limit: int
+    ) -> list[tuple[str, int, str]]:
+        prefix = ' '.join(self._tokenize(prefix))
+        if not prefix or not limit:
+            return []
+
+        found = {}
+        for kind in kinds:
+            i = bisect_left(self._keys, (kind, prefix))
+            for key_kind, key, id in self._keys[i : i + MAX_SCAN]:
+                if key_kind != kind or not key.startswith(prefix):
+                    break
+                title, title_key = self._titles[(kind, id)]
+                rank = (key != title_key, len(title), title)
+                if (kind, id) not in found or rank < found[(kind, id)]:
+                    found[(kind, id)] = rank
+
+        ranked = sorted(found, key=found.get)[:limit]
+        return [(kind, id, self._titles[(kind, id)][0]) for kind, id in ranked]
+
+    def _tokenize(self, value: str) -> list[str]:
+        value = unicodedata.normalize('NFKD', value.casefold())
+        return self._token_pattern.findall(''.join(
+            char for char in value if not unicodedata.combining(char)
+        ))
+
+    @staticmethod
+    def _get_keys(tokens: list[str]) -> set[str]:
+        return {' '.join(tokens[i:]) for i in range(len(tokens))}
+
+
+class SharedPrefixIndex(PrefixIndex):
+    """PrefixIndex kept in step with the other workers over redis pub/sub.
+
+    Changes are applied locally and published with the next value of a
+    redis counter; listen() applies the changes of every worker as they
+    arrive. When the counter shows a change that never arrived (the
+    subscription dropped, or was not there yet) the listener rebuilds in
+    the background while suggestions keep using the old index. Without
+    redis the index is local to the process.
+    """
+    _generation_key = 'suggest-generation'
+    _channel = 'suggest-changes'
+
+    def __init__(self, redis: aioredis.Redis | None = None) -> None:
+        super().__init__()
+        self.redis = redis
+        self.generation = 0
+        self._listener: asyncio.Task | None = None
+
+    def connect(self, url: str) -> None:
+        self.redis = aioredis.from_url(url)
+
+    async def disconnect(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+    async def get_generation(self) -> int:
+        if self.redis is None:
+            return self.generation
+        try:
+            return int(await self.redis.get(self._generation_key) or 0)
+        except aioredis.RedisError:
+            return self.generation
+
+    async def publish_add(self, kind: str, id: int, title: str) -> None:
+        self.add(kind, id, title)
+        await self._publish('add', kind, id, title)
+
+    async def publish_remove(self, kind: str, *ids: int) -> None:
+        self.remove(kind, *ids)
+        await self._publish('remove', kind, *ids)
+
+    def start(self, rebuild: Callable[[int], Awaitable[None]]) -> None:
+        """Follow the other workers' changes; rebuild(generation) reloads
+        the whole index."""
+        if self.redis is not None and self._listener is None:
+            self._listener = asyncio.create_task(self.listen(rebuild))
+
+    async def listen(self, rebuild: Callable[[int], Awaitable[None]]) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                # Changes published before the subscription are lost
+                await self._resync(rebuild)
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=RESYNC_INTERVAL
+                    )
+                    if message is None:
+                        await self._resync(rebuild)
+                    else:
+                        self.apply(message['data'])
+            except Exception:
+                # Redis or the rebuild failed; resubscribing resyncs
+                await asyncio.sleep(RETRY_DELAY)
+            finally:
+                with suppress(aioredis.RedisError):
+                    await pubsub.reset()
+
+    def apply(self, data: bytes) -> None:
+        generation, op, kind, *args = orjson.loads(data)
+        if op == 'add':
+            self.add(kind, *args)
+        else:
+            self.remove(kind, *args)
+        self.generation = max(self.generation, generation)
+
+    async def _publish(self, *change: Any) -> None:
+        if self.redis is None:
+            return
+        try:
+            generation = await self.redis.incr(self._generation_key)
+            await self.redis.publish(
+                self._channel,
+                orjson.dumps([generation, *change])
+            )
+        except aioredis.RedisError:
+            pass
+
+    async def _resync(self, rebuild: Callable[[int], Awaitable[None]]) -> None:
+        generation = await self.redis.get(self._generation_key)
+        if int(generation or 0) > self.generation:
+            await rebuild(int(generation))
+
+
+suggest_index = SharedPrefixIndex()
@@ -32,6 +32,13 @@ target_metadata = BaseMeta.metadata
 # ... etc.
 
 
+def include_name(name, type_, parent_names):
+    # search_index and its FTS5 shadow tables are managed by hand
+    if type_ == 'table':
+        return not name.startswith('search_index')
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
     This configures the context with just a URL
@@ -45,6 +52,7 @@ def run_migrations_offline():
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +76,9 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name
         )
 
         with context.begin_transaction():
@@ -0,0 +1,59 @@
+"""create search index
+
+Revision ID: 8e41d0c6a2f7
+Revises: 3b7e2c91d4a6
+Create Date: 2026-10-18 21:48:12.207815
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e41d0c6a2f7'
+down_revision = '3b7e2c91d4a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('''
+            CREATE TABLE search_index (
+                kind VARCHAR(20) NOT NULL,
+                object_id INTEGER NOT NULL,
+                title TEXT,
+                body TEXT,
+                document TSVECTOR GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+                    || setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+                ) STORED,
+                PRIMARY KEY (kind, object_id)
+            )
+        ''')
+        op.execute(
+            'CREATE INDEX ix_search_index_document '
+            'ON search_index USING GIN (document)'
+        )
+    else:
+        op.execute('''
+            CREATE VIRTUAL TABLE search_index USING fts5(
+                kind UNINDEXED,
+                object_id UNINDEXED,
+                title,
+                body,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        ''')
+
+    op.execute('''
+        INSERT INTO search_index (kind, object_id, title, body)
+        SELECT 'track', id, title, text FROM tracks
+        UNION ALL SELECT 'album', id, title, NULL FROM albums
+        UNION ALL SELECT 'playlist', id, title, NULL FROM playlists
+        UNION ALL SELECT 'artist', id, username, NULL FROM users
+            WHERE EXISTS (SELECT 1 FROM albums WHERE albums.artist = users.id)
+    ''')
+
+
+def downgrade():
+    op.execute('DROP TABLE search_index')
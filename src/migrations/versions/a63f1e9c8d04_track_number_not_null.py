@@ -0,0 +1,39 @@
+"""track number not null
+
+Revision ID: a63f1e9c8d04
+Revises: 5c0d9a4e7b21
+Create Date: 2026-10-18 23:12:40.208517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a63f1e9c8d04'
+down_revision = '5c0d9a4e7b21'
+branch_labels = None
+depends_on = None
+
+
+tracks = sa.table('tracks', sa.column('number', sa.Integer()))
+
+
+def upgrade():
+    # Album tracks are paged by (number, id), where NULL has no stable place
+    op.execute(tracks.update().where(tracks.c.number.is_(None)).values(number=1))
+    with op.batch_alter_table('tracks') as batch_op:
+        batch_op.alter_column(
+            'number',
+            existing_type=sa.Integer(),
+            nullable=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('tracks') as batch_op:
+        batch_op.alter_column(
+            'number',
+            existing_type=sa.Integer(),
+            nullable=True
+        )
@@ -1,7 +1,10 @@
 import os
 import string
+import hashlib
 from random import sample
 
+import anyio
+from mutagen import MutagenError
 from mutagen.mp3 import MP3
 from fastapi import HTTPException, UploadFile
 
@@ -19,25 +22,85 @@ async def upload_audio(upload_path: str, file: UploadFile) -> tuple[str, int]:
     if extension not in settings.ALLOWED_AUDIO_FORMAT_EXTENSIONS:
         raise HTTPException(
             status_code=403,
-            detail='Forbidden image format. '
+            detail='Forbidden audio format. '
             'Allowed format extension is {}.'.format(', '.join(
                 settings.ALLOWED_AUDIO_FORMAT_EXTENSIONS
             ))
         )
 
-    file_path = '{}{}'.format(upload_path, file.filename)
+    tmp_path = '{0}.{1}_{2}.part'.format(
+        upload_path,
+        filename,
+        _get_random_suffix()
+    )
+    sha256 = hashlib.sha256()
+    size = 0
 
-    if os.path.exists(file_path):
-        file_path = '{0}{1}_{2}.mp3'.format(
+    try:
+        f = await anyio.to_thread.run_sync(open, tmp_path, 'wb')
+        try:
+            while chunk := await file.read(settings.AUDIO_UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.AUDIO_UPLOAD_MAX_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail='Audio file is too large. Maximum size is '
+                            '{} bytes.'.format(settings.AUDIO_UPLOAD_MAX_SIZE)
+                    )
+                sha256.update(chunk)
+                await anyio.to_thread.run_sync(f.write, chunk)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(f.close)
+
+        duration_ms = await anyio.to_thread.run_sync(
+            _get_audio_duration,
+            tmp_path
+        )
+    except MutagenError:
+        await anyio.to_thread.run_sync(_remove, tmp_path)
+        raise HTTPException(status_code=400, detail='Invalid audio file')
+    except BaseException:
+        with anyio.CancelScope(shield=True):
+            await anyio.to_thread.run_sync(_remove, tmp_path)
+        raise
+
+    file_path = await anyio.to_thread.run_sync(_store, tmp_path, [
+        '{}{}'.format(upload_path, file.filename),
+        '{0}{1}_{2}.mp3'.format(upload_path, filename, sha256.hexdigest()),
+        '{0}{1}_{2}_{3}.mp3'.format(
             upload_path,
             filename,
-            ''.join(sample(string.ascii_letters, 10))
+            sha256.hexdigest(),
+            _get_random_suffix()
         )
+    ])
 
-    content = await file.read()
-    with open(file_path, 'wb') as f:
-        f.write(content)
+    return file_path, duration_ms
 
-    duration_ms = _get_audio_duration(file_path)
 
-    return file_path, duration_ms
+def _get_random_suffix() -> str:
+    return ''.join(sample(string.ascii_letters, 10))
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _store(tmp_path: str, file_paths: list[str]) -> str:
+    """Move tmp_path to the first of file_paths that does not exist yet.
+
+    os.link fails instead of replacing an existing file, so a concurrent
+    upload under the same name can never be overwritten.
+    """
+    for file_path in file_paths:
+        try:
+            os.link(tmp_path, file_path)
+        except FileExistsError:
+            continue
+        os.remove(tmp_path)
+        return file_path
+    raise FileExistsError(file_paths[-1])
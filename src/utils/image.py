@@ -1,50 +1,114 @@
+import io
 import os
 import string
-from typing import IO
+import asyncio
 from random import sample
-from PIL import Image, ImageOps
-from tempfile import SpooledTemporaryFile
+from typing import Hashable, TypeVar
+from concurrent.futures import ProcessPoolExecutor
 
+from PIL import Image, ImageOps
 from fastapi import HTTPException, UploadFile
 
 from src.config import settings
 
+SizeKey = TypeVar('SizeKey', bound=Hashable)
+
+_executor: ProcessPoolExecutor | None = None
+
+
+class InvalidImageError(Exception):
+    pass
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESS_POOL_WORKERS
+        )
+    return _executor
+
+
+def shutdown_image_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
 
-def upload_image(
+async def upload_images(
     upload_path: str,
     file: UploadFile,
-    size = tuple[int, int]
-) -> str:
+    sizes: dict[SizeKey, tuple[int, int]]
+) -> dict[SizeKey, str]:
     filename, extension = file.filename.split('.')
 
     if extension not in settings.ALLOWED_IMAGE_FORMAT_EXTENSIONS:
         raise HTTPException(
             status_code=403,
             detail='Forbidden image format. '
-            'Allowed format extensions are {}.'.format(
-                settings.ALLOWED_FORMAT_EXTENSIONS
-            )
+            'Allowed format extensions are {}.'.format(', '.join(
+                settings.ALLOWED_IMAGE_FORMAT_EXTENSIONS
+            ))
+        )
+
+    image_paths = {
+        key: _get_image_path(upload_path, filename, size)
+        for key, size in sizes.items()
+    }
+
+    content = await file.read()
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(
+            _get_executor(),
+            _save_resized_images,
+            content,
+            [(image_paths[key], size) for key, size in sizes.items()]
         )
+    except InvalidImageError:
+        raise HTTPException(status_code=400, detail='Invalid image file')
+
+    return image_paths
 
-    image = _resize_image(file.file, size)
-    image = image.convert('RGB')
 
-    image_path = '{0}{1}.jpeg'.format(upload_path, filename)
+def _get_image_path(
+    upload_path: str,
+    filename: str,
+    size: tuple[int, int]
+) -> str:
+    image_path = '{0}{1}_{2}x{3}.jpeg'.format(upload_path, filename, *size)
     if os.path.exists(image_path):
-        image_path = '{0}{1}_{2}.jpeg'.format(
+        image_path = '{0}{1}_{2}x{3}_{4}.jpeg'.format(
             upload_path,
             filename,
+            *size,
             ''.join(sample(string.ascii_letters, 10))
         )
-
-    image.save(image_path, 'JPEG', quality=95)
     return image_path
 
 
-def _resize_image(img: SpooledTemporaryFile[bytes] | IO, size: tuple[int, int]):
-    img: Image.Image = Image.open(img)
+def _save_resized_images(
+    content: bytes,
+    targets: list[tuple[str, tuple[int, int]]]
+) -> None:
+    # Unknown, truncated, corrupt and oversized images all fail while
+    # decoding; errors from saving the resized copies are left as they are.
+    try:
+        image: Image.Image = Image.open(io.BytesIO(content))
+        image.draft('RGB', max(size for _, size in targets))
+        image = image.convert('RGB')
+    except (OSError, Image.DecompressionBombError) as e:
+        raise InvalidImageError(str(e))
+
+    for image_path, size in targets:
+        _resize_image(image, size).save(image_path, 'JPEG', quality=95)
+
+
+def _resize_image(img: Image.Image, size: tuple[int, int]) -> Image.Image:
     crop: bool = not img.width / size[0] == img.height / size[1]
     if not crop:
+        img = img.copy()
         img.thumbnail(size, Image.ANTIALIAS)
     else:
         img = ImageOps.fit(img, size, Image.ANTIALIAS, centering=(0.5, 0.5))
@@ -0,0 +1,39 @@
+import os
+import asyncio
+import tempfile
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+# Settings are read on import, so the throwaway database has to be set
+# before anything from src is imported.
+os.environ['DATABASE_URL'] = 'sqlite:///{}'.format(os.path.join(
+    tempfile.mkdtemp(prefix='fastapi-music-test-'),
+    'db.sqlite'
+))
+for name in 'MAIL_USERNAME', 'MAIL_PASSWORD', 'MAIL_SERVER':
+    os.environ.setdefault(name, 'test')
+os.environ.setdefault('MAIL_FROM', 'test@example.com')
+
+
+@pytest.fixture
+def run_db() -> Callable[[Callable[[], Awaitable[Any]]], Any]:
+    """Create the tables and return a runner that calls an async function
+    with the database connected."""
+    import sqlalchemy
+
+    from src.core.db import database
+    from src.core.base_meta import BaseMeta
+
+    engine = sqlalchemy.create_engine(os.environ['DATABASE_URL'])
+    BaseMeta.metadata.create_all(engine)
+
+    def run(func: Callable[[], Awaitable[Any]]) -> Any:
+        async def main() -> Any:
+            async with database:
+                return await func()
+        return asyncio.run(main())
+
+    yield run
+    BaseMeta.metadata.drop_all(engine)
+    engine.dispose()
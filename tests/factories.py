@@ -0,0 +1,49 @@
+from src.app.user.models import User
+from src.app.music import models
+from src.app.music.consts import AlbumType
+
+
+async def create_user(username: str = 'artist') -> User:
+    return await User.objects.create(
+        username=username,
+        email='{}@example.com'.format(username),
+        hashed_password='-'
+    )
+
+
+async def create_album(artist: User, title: str = 'Album') -> models.Album:
+    genre, _ = await models.Genre.objects.get_or_create(title='Rock')
+    return await models.Album.objects.create(
+        title=title,
+        artist=artist,
+        genre=genre,
+        album_type=AlbumType.ALBUM.value,
+        duration_ms=0
+    )
+
+
+async def create_track(
+    album: models.Album,
+    title: str = 'Track',
+    duration_ms: int = 1000,
+    artist: User | None = None
+) -> models.Track:
+    return await models.Track.objects.create(
+        title=title,
+        artist=artist or album.artist,
+        album=album,
+        file='track.mp3',
+        explicit=False,
+        duration_ms=duration_ms
+    )
+
+
+async def create_playlist(
+    author: User,
+    title: str = 'Playlist'
+) -> models.Playlist:
+    return await models.Playlist.objects.create(
+        title=title,
+        author=author,
+        duration_ms=0
+    )
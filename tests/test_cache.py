@@ -0,0 +1,171 @@
+import asyncio
+
+import aioredis
+import orjson
+from fakeredis.aioredis import FakeRedis
+from pydantic import BaseModel
+from starlette.datastructures import URL
+
+from src.core.cache import ResponseCache
+
+
+class Artist(BaseModel):
+    id: int
+    username: str
+
+
+class Track(BaseModel):
+    id: int
+    title: str
+    artist: Artist
+
+
+class TrackList(BaseModel):
+    items: list[Track]
+
+
+def _track(id: int, title: str = 'title', artist: int = 1) -> dict:
+    return {
+        'id': id,
+        'title': title,
+        'artist': {'id': artist, 'username': 'artist'}
+    }
+
+
+def _get_cache(redis=None) -> ResponseCache:
+    return ResponseCache(
+        60,
+        relation_tags={'artist': 'user'},
+        redis=redis if redis is not None else FakeRedis()
+    )
+
+
+class Loader:
+    def __init__(self, value, on_load=None) -> None:
+        self.value = value
+        self.calls = 0
+        self._on_load = on_load
+
+    async def __call__(self):
+        self.calls += 1
+        if self._on_load is not None:
+            await self._on_load()
+        return self.value
+
+
+def _get(cache, url, loader, response_model=Track, entity='track'):
+    return cache.get_or_set(URL(url), response_model, entity, loader)
+
+
+def test_miss_then_hit():
+    async def run():
+        cache = _get_cache()
+        loader = Loader(_track(1))
+
+        first = await _get(cache, '/tracks/1', loader)
+        second = await _get(cache, '/tracks/1', loader)
+
+        assert loader.calls == 1
+        assert orjson.loads(first.body) == _track(1)
+        assert second.body == first.body
+
+    asyncio.run(run())
+
+
+def test_distinct_urls_are_distinct_entries():
+    async def run():
+        cache = _get_cache()
+        loader = Loader(_track(1))
+
+        await _get(cache, '/tracks/1', loader)
+        await _get(cache, '/tracks/1?fields=title', loader)
+
+        assert loader.calls == 2
+
+    asyncio.run(run())
+
+
+def test_invalidate_by_entity_tag():
+    async def run():
+        cache = _get_cache()
+        one, two = Loader(_track(1)), Loader(_track(2))
+        await _get(cache, '/tracks/1', one)
+        await _get(cache, '/tracks/2', two)
+
+        await cache.invalidate('track:1')
+        await _get(cache, '/tracks/1', one)
+        await _get(cache, '/tracks/2', two)
+
+        assert one.calls == 2
+        assert two.calls == 1
+
+    asyncio.run(run())
+
+
+def test_invalidate_by_list_and_relation_tags():
+    async def run():
+        cache = _get_cache()
+        page = Loader({'items': [_track(1, artist=5), _track(2, artist=6)]})
+        await _get(cache, '/tracks', page, TrackList)
+
+        await cache.invalidate('user:6')
+        await _get(cache, '/tracks', page, TrackList)
+        await cache.invalidate('track')
+        await _get(cache, '/tracks', page, TrackList)
+        await cache.invalidate('user:7', 'track:3')
+        await _get(cache, '/tracks', page, TrackList)
+
+        assert page.calls == 3
+
+    asyncio.run(run())
+
+
+def test_invalidate_during_load_is_not_cached():
+    async def run():
+        cache = _get_cache()
+        stale = Loader(
+            _track(1, 'old'),
+            on_load=lambda: cache.invalidate('track:1')
+        )
+        fresh = Loader(_track(1, 'new'))
+
+        response = await _get(cache, '/tracks/1', stale)
+        assert orjson.loads(response.body)['title'] == 'old'
+
+        response = await _get(cache, '/tracks/1', fresh)
+        assert orjson.loads(response.body)['title'] == 'new'
+        assert fresh.calls == 1
+
+    asyncio.run(run())
+
+
+def test_redis_errors_fall_back_to_loader():
+    async def run():
+        # Nothing listens on port 1, so every command fails to connect.
+        redis = aioredis.Redis(host='127.0.0.1', port=1)
+        cache = _get_cache(redis)
+        loader = Loader(_track(1))
+
+        first = await _get(cache, '/tracks/1', loader)
+        second = await _get(cache, '/tracks/1', loader)
+        await cache.invalidate('track:1')
+
+        assert loader.calls == 2
+        assert first == _track(1) and second == _track(1)
+        await redis.close()
+
+    asyncio.run(run())
+
+
+def test_without_redis_loader_is_always_called():
+    async def run():
+        cache = ResponseCache(60, relation_tags={})
+        loader = Loader(_track(1))
+
+        await _get(cache, '/tracks/1', loader)
+        await _get(cache, '/tracks/1', loader)
+        await cache.invalidate('track:1')
+
+        assert loader.calls == 2
+
+    asyncio.run(run())
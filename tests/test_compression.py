@@ -0,0 +1,73 @@
+import gzip
+import asyncio
+
+from src.core.compression import CompressionMiddleware
+
+BODY = b'{"items": []}' * 200
+
+
+def _make_app(content_type: bytes, extension: bool = False):
+    async def app(scope, receive, send):
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', content_type),
+                (b'content-length', str(len(BODY)).encode())
+            ]
+        })
+        if extension:
+            await send({
+                'type': 'http.response.zerocopysend',
+                'file': 0,
+                'count': len(BODY)
+            })
+        else:
+            await send({'type': 'http.response.body', 'body': BODY})
+    return app
+
+
+def _call(app) -> list:
+    scope = {
+        'type': 'http',
+        'path': '/api/v1/tracks/1/stream',
+        'headers': [(b'accept-encoding', b'gzip')],
+        'extensions': {'http.response.zerocopysend': {}}
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(CompressionMiddleware(app)(scope, receive, send))
+    return messages
+
+
+def test_json_is_compressed():
+    start, body = _call(_make_app(b'application/json'))
+
+    assert dict(start['headers'])[b'content-encoding'] == b'gzip'
+    assert gzip.decompress(body['body']) == BODY
+
+
+def test_audio_start_is_not_held_back():
+    messages = _call(_make_app(b'audio/mpeg', extension=True))
+
+    assert [message['type'] for message in messages] == [
+        'http.response.start',
+        'http.response.zerocopysend'
+    ]
+    assert b'content-encoding' not in dict(messages[0]['headers'])
+
+
+def test_extension_message_releases_held_start():
+    messages = _call(_make_app(b'application/json', extension=True))
+
+    assert [message['type'] for message in messages] == [
+        'http.response.start',
+        'http.response.zerocopysend'
+    ]
+    assert b'content-encoding' not in dict(messages[0]['headers'])
@@ -0,0 +1,90 @@
+import asyncio
+import contextvars
+
+from scripts.reconcilecounters import reconcilecounters
+from src.app.music import models
+from src.app.music.services import SavedAlbumService, SavedPlaylistService
+from tests.factories import (
+    create_album,
+    create_playlist,
+    create_track,
+    create_user
+)
+
+
+def _spawn(coroutine) -> asyncio.Future:
+    # Like separate requests, each call gets a connection of its own
+    return contextvars.Context().run(asyncio.ensure_future, coroutine)
+
+
+async def _seed() -> tuple[models.Album, models.Playlist, list]:
+    artist = await create_user()
+    album = await create_album(artist)
+    for duration_ms in 1000, 2000:
+        await create_track(album, duration_ms=duration_ms)
+    playlist = await create_playlist(artist)
+    users = [await create_user('listener{}'.format(i)) for i in range(4)]
+    return album, playlist, users
+
+
+async def _get_counters(album: models.Album, playlist: models.Playlist):
+    album = await models.Album.objects.get(id=album.id)
+    playlist = await models.Playlist.objects.get(id=playlist.id)
+    return (
+        album.track_count,
+        album.duration_ms,
+        album.saved_count,
+        await models.SavedAlbum.objects.filter(album=album.id).count(),
+        playlist.follower_count,
+        await models.SavedPlaylist.objects.filter(playlist=playlist.id).count()
+    )
+
+
+def test_reconcile_counters_repairs_drift(run_db, capsys):
+    async def drift():
+        album, playlist, users = await _seed()
+        await SavedAlbumService.save(users[0], album)
+        await SavedPlaylistService.save(users[0], playlist)
+        await album.update(track_count=7, duration_ms=1, saved_count=5)
+        await playlist.update(follower_count=3)
+        return album, playlist
+
+    album, playlist = run_db(drift)
+    asyncio.run(reconcilecounters(batch_size=1))
+
+    assert run_db(lambda: _get_counters(album, playlist)) == (
+        2, 3000, 1, 1, 1, 1
+    )
+
+
+def test_concurrent_save_and_remove_keep_counters(run_db):
+    async def run():
+        album, playlist, users = await _seed()
+        for _ in range(3):
+            await asyncio.gather(*(
+                _spawn(call)
+                for user in users
+                for call in (
+                    SavedAlbumService.save(user, album),
+                    SavedAlbumService.save(user, album),
+                    SavedPlaylistService.save(user, playlist)
+                )
+            ))
+            saved = await _get_counters(album, playlist)
+            await asyncio.gather(*(
+                _spawn(call)
+                for user in users[1:]
+                for call in (
+                    SavedAlbumService.remove(user.id, album.id),
+                    SavedAlbumService.remove(user.id, album.id),
+                    SavedPlaylistService.remove(user.id, playlist.id),
+                    SavedPlaylistService.remove(user.id, playlist.id)
+                )
+            ))
+            removed = await _get_counters(album, playlist)
+        return saved, removed
+
+    saved, removed = run_db(run)
+
+    assert saved[2:] == (4, 4, 4, 4)
+    assert removed[2:] == (1, 1, 1, 1)
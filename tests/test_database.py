@@ -0,0 +1,97 @@
+import os
+import asyncio
+import tempfile
+import contextvars
+
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.core.db import Database
+
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+
+table = sqlalchemy.Table(
+    'test_rowcount',
+    sqlalchemy.MetaData(),
+    sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True)
+)
+
+
+def _get_urls() -> list:
+    return [
+        'sqlite:///{}'.format(os.path.join(tempfile.mkdtemp(), 'db.sqlite')),
+        pytest.param(POSTGRES_URL, marks=pytest.mark.skipif(
+            POSTGRES_URL is None,
+            reason='TEST_POSTGRES_URL is not set'
+        ))
+    ]
+
+
+@pytest.mark.parametrize('url', _get_urls())
+def test_execute_rowcount(url):
+    async def run():
+        async with Database(url) as database:
+            await database.execute('DROP TABLE IF EXISTS test_rowcount')
+            await database.execute(
+                'CREATE TABLE test_rowcount (id INTEGER PRIMARY KEY)'
+            )
+            insert = (postgresql if database.is_postgres else sqlite).insert
+            try:
+                await database.execute(table.insert().values([
+                    {'id': 1}, {'id': 2}
+                ]))
+                counts = [
+                    await database.execute_rowcount(
+                        insert(table).values(id=id).on_conflict_do_nothing()
+                    )
+                    for id in (1, 3)
+                ]
+                counts += [
+                    await database.execute_rowcount(
+                        table.delete().where(table.c.id < 3)
+                    )
+                    for _ in range(2)
+                ]
+            finally:
+                await database.execute('DROP TABLE test_rowcount')
+        return counts
+
+    assert asyncio.run(run()) == [0, 1, 2, 0]
+
+
+@pytest.mark.skipif(POSTGRES_URL is None, reason='TEST_POSTGRES_URL is not set')
+def test_postgres_acquire_timeout():
+    async def hold(database, acquired, release):
+        async with database.connection() as connection:
+            await connection.fetch_val('SELECT 1')
+            acquired.set()
+            await release.wait()
+
+    async def run():
+        async with Database(
+            POSTGRES_URL,
+            min_size=1,
+            max_size=1,
+            acquire_timeout=0.2
+        ) as database:
+            acquired, release = asyncio.Event(), asyncio.Event()
+            # Each task needs its own connection, not the one in our context
+            holder = contextvars.Context().run(
+                asyncio.ensure_future,
+                hold(database, acquired, release)
+            )
+            await acquired.wait()
+            with pytest.raises(asyncio.TimeoutError):
+                await contextvars.Context().run(
+                    asyncio.ensure_future,
+                    database.fetch_val('SELECT 1')
+                )
+            release.set()
+            await holder
+            return await contextvars.Context().run(
+                asyncio.ensure_future,
+                database.fetch_val('SELECT 1')
+            )
+
+    assert asyncio.run(run()) == 1
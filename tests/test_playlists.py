@@ -0,0 +1,108 @@
+import pytest
+import sqlalchemy
+from fastapi import HTTPException
+
+from src.core.db import database
+from src.app.music import models
+from src.app.music.services import PlaylistService
+from tests.factories import (
+    create_album,
+    create_playlist,
+    create_track,
+    create_user
+)
+
+
+async def _get_links(playlist: models.Playlist, name: str) -> list[int]:
+    table = models.Playlist.Meta.model_fields[name].through.Meta.table
+    column = table.c.track if name == 'tracks' else table.c.user
+    return sorted(row[0] for row in await database.fetch_all(
+        sqlalchemy.select([column]).where(table.c.playlist == playlist.id)
+    ))
+
+
+async def _get_counters(playlist: models.Playlist) -> tuple[int, int]:
+    playlist = await models.Playlist.objects.get(id=playlist.id)
+    return playlist.track_count, playlist.duration_ms
+
+
+def test_add_tracks_inserts_each_track_once(run_db):
+    async def run():
+        artist, guest = await create_user('artist'), await create_user('guest')
+        album = await create_album(artist)
+        first = await create_track(album, duration_ms=1000)
+        second = await create_track(album, duration_ms=2000)
+        third = await create_track(album, duration_ms=4000, artist=guest)
+        playlist = await create_playlist(artist)
+
+        await PlaylistService.add_tracks(playlist, [first.id, second.id, first.id])
+        added = (
+            await _get_links(playlist, 'tracks'),
+            await _get_links(playlist, 'artists'),
+            await _get_counters(playlist)
+        )
+        await PlaylistService.add_tracks(playlist, [second.id, third.id, third.id])
+        readded = (
+            await _get_links(playlist, 'tracks'),
+            await _get_links(playlist, 'artists'),
+            await _get_counters(playlist)
+        )
+        return [first.id, second.id, third.id], [artist.id, guest.id], \
+            added, readded
+
+    tracks, artists, added, readded = run_db(run)
+
+    assert added == (tracks[:2], artists[:1], (2, 3000))
+    assert readded == (tracks, artists, (3, 7000))
+
+
+def test_add_tracks_lists_missing_tracks(run_db):
+    async def run():
+        artist = await create_user()
+        track = await create_track(await create_album(artist))
+        playlist = await create_playlist(artist)
+
+        with pytest.raises(HTTPException) as error:
+            await PlaylistService.add_tracks(playlist, [track.id, 998, 999, 998])
+        return error.value, await _get_links(playlist, 'tracks'), \
+            await _get_counters(playlist)
+
+    error, links, counters = run_db(run)
+
+    assert error.status_code == 404
+    assert error.detail == 'Tracks do not exist: 998, 999'
+    assert links == []
+    assert counters == (0, 0)
+
+
+def test_remove_tracks_keeps_artists_of_remaining_tracks(run_db):
+    async def run():
+        artist, guest = await create_user('artist'), await create_user('guest')
+        album = await create_album(artist)
+        first = await create_track(album, duration_ms=1000)
+        second = await create_track(album, duration_ms=2000)
+        third = await create_track(album, duration_ms=4000, artist=guest)
+        playlist = await create_playlist(artist)
+        await PlaylistService.add_tracks(
+            playlist,
+            [first.id, second.id, third.id]
+        )
+
+        await PlaylistService.remove_tracks(playlist, [first.id, third.id])
+        removed = (
+            await _get_links(playlist, 'tracks'),
+            await _get_links(playlist, 'artists'),
+            await _get_counters(playlist)
+        )
+        await PlaylistService.remove_tracks(playlist, [second.id, second.id])
+        emptied = (
+            await _get_links(playlist, 'tracks'),
+            await _get_links(playlist, 'artists'),
+            await _get_counters(playlist)
+        )
+        return second.id, artist.id, removed, emptied
+
+    second, artist, removed, emptied = run_db(run)
+
+    assert removed == ([second], [artist], (1, 2000))
+    assert emptied == ([], [], (0, 0))
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from src.app.base.responses import (
+    RangeFileResponse,
+    RangeNotSatisfiable,
+    parse_range_header
+)
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.mark.parametrize('header, ranges', [
+    (None, None),
+    ('bytes=0-99', [(0, 99)]),
+    ('bytes=-100', [(924, 1023)]),
+    ('bytes=1000-', [(1000, 1023)]),
+    ('bytes=1000-5000', [(1000, 1023)]),
+    ('bytes=0-9, 20-29', [(0, 9), (20, 29)]),
+    ('items=0-9', None),
+    ('bytes=9-0', None),
+    ('bytes=abc', None)
+])
+def test_parse_range_header(header, ranges):
+    assert parse_range_header(header, len(CONTENT)) == ranges
+
+
+def test_parse_range_header_not_satisfiable():
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range_header('bytes=1024-', len(CONTENT))
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    path = tmp_path / 'track.mp3'
+    path.write_bytes(CONTENT)
+    return str(path)
+
+
+def _call(
+    path: str,
+    range_header: str | None = None,
+    if_range: str | None = None,
+    extensions: dict | None = None
+) -> tuple[dict, bytes, list[dict]]:
+    response = RangeFileResponse(
+        path,
+        range_header=range_header,
+        if_range=if_range,
+        media_type='audio/mpeg'
+    )
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        if message['type'] == 'http.response.zerocopysend':
+            message = {**message, 'body': CONTENT[
+                message['offset']:message['offset'] + message['count']
+            ]}
+        messages.append(message)
+
+    scope = {'type': 'http', 'extensions': extensions or {}}
+    asyncio.run(response(scope, receive, send))
+
+    start, *body = messages
+    return start, b''.join(message.get('body', b'') for message in body), body
+
+
+def _get_header(start: dict, name: str) -> str | None:
+    return dict(start['headers']).get(name.encode(), b'').decode() or None
+
+
+def test_full_file(path):
+    start, body, _ = _call(path)
+
+    assert start['status'] == 200
+    assert body == CONTENT
+    assert _get_header(start, 'accept-ranges') == 'bytes'
+
+
+@pytest.mark.parametrize('header, first, last', [
+    ('bytes=10-19', 10, 19),
+    ('bytes=-24', 1000, 1023),
+    ('bytes=1000-', 1000, 1023)
+])
+def test_single_range(path, header, first, last):
+    start, body, _ = _call(path, header)
+
+    assert start['status'] == 206
+    assert body == CONTENT[first:last + 1]
+    assert _get_header(start, 'content-range') == 'bytes {}-{}/{}'.format(
+        first, last, len(CONTENT)
+    )
+    assert _get_header(start, 'content-length') == str(len(body))
+
+
+def test_multiple_ranges(path):
+    start, body, _ = _call(path, 'bytes=0-9,20-29')
+
+    content_type = _get_header(start, 'content-type')
+    boundary = content_type.partition('boundary=')[2].encode()
+    assert start['status'] == 206
+    assert content_type.startswith('multipart/byteranges')
+    assert _get_header(start, 'content-length') == str(len(body))
+    assert body == b''.join([
+        b'--', boundary, b'\r\nContent-Type: audio/mpeg\r\n'
+        b'Content-Range: bytes 0-9/1024\r\n\r\n', CONTENT[0:10],
+        b'\r\n--', boundary, b'\r\nContent-Type: audio/mpeg\r\n'
+        b'Content-Range: bytes 20-29/1024\r\n\r\n', CONTENT[20:30],
+        b'\r\n--', boundary, b'--\r\n'
+    ])
+
+
+def test_range_not_satisfiable(path):
+    start, body, _ = _call(path, 'bytes=2000-')
+
+    assert start['status'] == 416
+    assert _get_header(start, 'content-range') == 'bytes */1024'
+    assert body == b''
+
+
+def test_if_range(path):
+    etag = _get_header(_call(path)[0], 'etag')
+
+    matched, body, _ = _call(path, 'bytes=0-9', if_range=etag)
+    assert matched['status'] == 206
+    assert body == CONTENT[:10]
+
+    mismatched, body, _ = _call(path, 'bytes=0-9', if_range='"stale"')
+    assert mismatched['status'] == 200
+    assert body == CONTENT
+
+
+def test_zerocopysend(path):
+    start, body, messages = _call(
+        path,
+        'bytes=10-19',
+        extensions={'http.response.zerocopysend': {}}
+    )
+
+    assert start['status'] == 206
+    assert [message['type'] for message in messages] == [
+        'http.response.zerocopysend'
+    ]
+    assert messages[0]['offset'] == 10 and messages[0]['count'] == 10
+    assert body == CONTENT[10:20]
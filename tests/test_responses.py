@@ -0,0 +1,97 @@
+import asyncio
+
+from fastapi import Response
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from src.core.responses import (
+    Reference,
+    conditional_response,
+    get_etag,
+    shape_response
+)
+
+
+class Genre(BaseModel):
+    title: str
+
+
+class Album(BaseModel):
+    id: int
+    title: str
+    genre: Genre
+
+
+def test_partial_leaves_out_missing_fields():
+    assert shape_response(Album, {'id': 1}, partial=True) == {'id': 1}
+
+
+def test_reference_keeps_primary_key_missing_from_schema():
+    assert shape_response(
+        Album,
+        {'id': 1, 'genre': Reference({'id': 2})},
+        partial=True
+    ) == {'id': 1, 'genre': {'id': 2}}
+
+
+def test_expanded_relation_is_projected():
+    assert shape_response(
+        Album,
+        {'id': 1, 'genre': {'id': 2, 'title': 'rock'}},
+        partial=True
+    ) == {'id': 1, 'genre': {'title': 'rock'}}
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [] if if_none_match is None else [
+        (b'if-none-match', if_none_match.encode())
+    ]
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'scheme': 'http',
+        'server': ('testserver', 80),
+        'path': '/api/v1/albums/1',
+        'query_string': b'',
+        'headers': headers
+    })
+
+
+def _conditional(request: Request, version: tuple) -> tuple[Response, list]:
+    loaded = []
+
+    async def loader():
+        loaded.append(version)
+        return {'id': 1}
+
+    response = Response()
+    content = asyncio.run(
+        conditional_response(request, response, version, loader)
+    )
+    return (content if isinstance(content, Response) else response), loaded
+
+
+def test_conditional_response_sets_etag():
+    response, loaded = _conditional(_request(), (1, 2))
+
+    assert response.headers['etag'] == get_etag(_request(), (1, 2))
+    assert loaded == [(1, 2)]
+
+
+def test_matching_etag_is_not_modified():
+    etag = get_etag(_request(), (1, 2))
+
+    for if_none_match in etag, etag.removeprefix('W/'), '"other", ' + etag:
+        response, loaded = _conditional(_request(if_none_match), (1, 2))
+        assert response.status_code == 304
+        assert response.headers['etag'] == etag
+        assert loaded == []
+
+
+def test_new_version_changes_etag():
+    etag = get_etag(_request(), (1, 2))
+    response, loaded = _conditional(_request(etag), (1, 3))
+
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+    assert loaded == [(1, 3)]
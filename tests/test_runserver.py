@@ -0,0 +1,44 @@
+import pytest
+
+from scripts import runserver as runserver_module
+from scripts.runserver import runserver_manager
+
+
+def _run(monkeypatch, *args: str) -> list[dict]:
+    calls = []
+    monkeypatch.setattr(
+        runserver_module.uvicorn,
+        'run',
+        lambda app, **kwargs: calls.append(kwargs)
+    )
+    kwargs = vars(runserver_manager.parse_args(['runserver', *args]))
+    kwargs.pop('command')
+    kwargs.pop('func')(**kwargs)
+    return calls
+
+
+@pytest.mark.parametrize('args', [
+    ('--limit-max-requests', '100'),
+    ('--limit-max-requests', '100', '--workers', '1'),
+    ('--limit-max-requests', '100', '--workers', '2', '--reload')
+])
+def test_limit_max_requests_needs_several_workers(monkeypatch, capsys, args):
+    assert _run(monkeypatch, *args) == []
+    assert '--limit-max-requests needs --workers above 1' \
+        in capsys.readouterr().out
+
+
+def test_limit_max_requests_with_several_workers(monkeypatch):
+    calls = _run(monkeypatch, '--limit-max-requests', '100', '--workers', '2')
+
+    assert len(calls) == 1
+    assert calls[0]['workers'] == 2
+    assert calls[0]['limit_max_requests'] == 100
+
+
+def test_reload_ignores_workers(monkeypatch):
+    calls = _run(monkeypatch, '--reload', '--workers', '4')
+
+    assert calls[0]['reload'] is True
+    assert calls[0]['workers'] is None
+    assert calls[0]['limit_max_requests'] is None
@@ -0,0 +1,79 @@
+import asyncio
+
+from scripts.rebuildsearchindex import rebuildsearchindex
+from src.core.search import search_index
+from src.app.music import schemas
+from src.app.music.services import AlbumService, TrackService
+from src.app.user.services import UserService
+from tests.factories import create_album, create_track, create_user
+
+KINDS = ['album', 'artist', 'playlist', 'track']
+
+
+async def _search(query: str) -> list[tuple[str, int]]:
+    _, hits = await search_index.search(query, KINDS, 0, 10)
+    return [(hit['kind'], hit['object_id']) for hit in hits]
+
+
+def test_search_follows_index_update_and_unindex(run_db):
+    async def run():
+        album = await create_album(await create_user(), 'Sunrise')
+        track = await create_track(album, 'Morning')
+        await AlbumService.index_search(album)
+        await TrackService.index_search(track)
+        indexed = await _search('sunrise'), await _search('morning')
+
+        await AlbumService.update(
+            schemas.AlbumUpdate(title='Sunset'),
+            id=album.id
+        )
+        await TrackService.update(
+            schemas.TrackUpdate(text='under the moon'),
+            id=track.id
+        )
+        updated = (
+            await _search('sunrise'),
+            await _search('sunset'),
+            await _search('moon')
+        )
+
+        await TrackService.delete(id=track.id)
+        return album.id, track.id, indexed, updated, await _search('morning')
+
+    album, track, indexed, updated, removed = run_db(run)
+
+    assert indexed == ([('album', album)], [('track', track)])
+    assert updated == ([], [('album', album)], [('track', track)])
+    assert removed == []
+
+
+def test_artists_are_indexed_once_they_have_albums(run_db):
+    async def run():
+        user = await create_user('drummer')
+        await UserService.index_search(user)
+        without_album = await _search('drummer')
+
+        await create_album(user)
+        await UserService.index_search(user)
+        return user.id, without_album, await _search('drummer')
+
+    user, without_album, with_album = run_db(run)
+
+    assert without_album == []
+    assert with_album == [('artist', user)]
+
+
+def test_rebuild_indexes_existing_rows(run_db, capsys):
+    async def seed():
+        user = await create_user('singer')
+        album = await create_album(user, 'Harbour')
+        await create_user('listener')
+        return user.id, album.id, await _search('harbour singer listener')
+
+    user, album, before = run_db(seed)
+    asyncio.run(rebuildsearchindex())
+
+    assert before == []
+    assert run_db(lambda: _search('harbour')) == [('album', album)]
+    assert run_db(lambda: _search('singer')) == [('artist', user)]
+    assert run_db(lambda: _search('listener')) == []
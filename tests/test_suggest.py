@@ -0,0 +1,88 @@
+import asyncio
+
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from src.core.suggest import MAX_SCAN, PrefixIndex, SharedPrefixIndex
+
+
+def test_suggest_filters_kind_before_scan():
+    index = PrefixIndex()
+    index.build([
+        *(('track', id, 'love song {}'.format(id))
+          for id in range(MAX_SCAN * 2)),
+        ('album', 1, 'love')
+    ])
+
+    assert index.suggest('lo', {'album'}, 10) == [('album', 1, 'love')]
+    assert len(index.suggest('lo', {'album', 'track'}, 5)) == 5
+
+
+def test_suggest_after_add_and_remove():
+    index = PrefixIndex()
+    index.build([('track', 1, 'Café del Mar')])
+    index.add('album', 2, 'Del Mar')
+    index.remove('track', 1)
+
+    assert index.suggest('del', {'album', 'track'}, 10) == [
+        ('album', 2, 'Del Mar')
+    ]
+
+
+def test_shared_index_applies_other_worker_changes():
+    async def run():
+        server = FakeServer()
+        first = SharedPrefixIndex(FakeRedis(server=server))
+        second = SharedPrefixIndex(FakeRedis(server=server))
+        rebuilds = []
+
+        async def rebuild(generation):
+            rebuilds.append(generation)
+            second.generation = generation
+
+        second.start(rebuild)
+        await asyncio.sleep(0.1)
+        await first.publish_add('track', 1, 'title')
+        await first.publish_add('track', 2, 'title two')
+        await first.publish_remove('track', 1)
+        await asyncio.sleep(0.1)
+
+        suggestions = second.suggest('ti', {'track'}, 10)
+        await second.disconnect()
+        return rebuilds, suggestions, second.generation
+
+    assert asyncio.run(run()) == ([], [('track', 2, 'title two')], 3)
+
+
+def test_shared_index_rebuilds_after_missed_changes():
+    async def run():
+        server = FakeServer()
+        first = SharedPrefixIndex(FakeRedis(server=server))
+        second = SharedPrefixIndex(FakeRedis(server=server))
+        rebuilt = asyncio.Event()
+
+        async def rebuild(generation):
+            second.build([('track', 1, 'title')])
+            second.generation = generation
+            rebuilt.set()
+
+        await first.publish_add('track', 1, 'title')
+        second.start(rebuild)
+        await asyncio.wait_for(rebuilt.wait(), 1)
+
+        suggestions = second.suggest('ti', {'track'}, 10)
+        await second.disconnect()
+        return suggestions, second.generation
+
+    assert asyncio.run(run()) == ([('track', 1, 'title')], 1)
+
+
+def test_shared_index_without_redis_is_local():
+    async def run():
+        index = SharedPrefixIndex()
+        index.start(None)
+        await index.publish_add('track', 1, 'title')
+
+        return index.suggest('ti', {'track'}, 10)
+
+    assert asyncio.run(run()) == [('track', 1, 'title')]
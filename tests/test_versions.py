@@ -0,0 +1,113 @@
+from src.app.music import schemas
+from src.app.music.services import (
+    AlbumService,
+    PlaylistService,
+    SavedAlbumService,
+    SavedPlaylistService,
+    TrackService
+)
+from tests.factories import (
+    create_album,
+    create_playlist,
+    create_track,
+    create_user
+)
+
+
+class Versions:
+    """Records the version after each write, so every write can be checked
+    to have changed it."""
+
+    def __init__(self, get_version) -> None:
+        self.get_version = get_version
+        self.versions = []
+
+    async def record(self) -> None:
+        self.versions.append(await self.get_version())
+
+    def are_distinct(self) -> bool:
+        return len(set(self.versions)) == len(self.versions)
+
+
+def test_album_and_track_versions_follow_writes(run_db):
+    async def run():
+        user = await create_user()
+        album = await create_album(user)
+        track = await create_track(album)
+        album_versions = Versions(lambda: AlbumService.get_version(id=album.id))
+        track_versions = Versions(lambda: TrackService.get_version(id=track.id))
+
+        async def record():
+            await album_versions.record()
+            await track_versions.record()
+
+        await record()
+        await AlbumService.update(
+            schemas.AlbumUpdate(title='New'),
+            id=album.id
+        )
+        await record()
+        await TrackService.update(
+            schemas.TrackUpdate(title='New'),
+            id=track.id
+        )
+        await record()
+
+        # Adding a track, as the upload route does
+        added = await create_track(album)
+        await AlbumService.increment(
+            album.id,
+            duration_ms=added.duration_ms,
+            track_count=1
+        )
+        await album_versions.record()
+        await SavedAlbumService.save(user, album)
+        await album_versions.record()
+        return album_versions, track_versions
+
+    album_versions, track_versions = run_db(run)
+
+    assert album_versions.are_distinct()
+    assert track_versions.are_distinct()
+
+
+def test_playlist_versions_follow_writes(run_db):
+    async def run():
+        user = await create_user()
+        track = await create_track(await create_album(user))
+        playlist = await create_playlist(user)
+        versions = Versions(lambda: PlaylistService.get_version(id=playlist.id))
+
+        await versions.record()
+        await PlaylistService.add_tracks(playlist, [track.id])
+        await versions.record()
+        await SavedPlaylistService.save(user, playlist)
+        await versions.record()
+        await PlaylistService.remove_tracks(playlist, [track.id])
+        await versions.record()
+        return versions
+
+    assert run_db(run).are_distinct()
+
+
+def test_saved_list_versions_follow_writes(run_db):
+    async def run():
+        user = await create_user()
+        first, second = await create_album(user), await create_album(user)
+        versions = Versions(lambda: SavedAlbumService.get_version(user=user))
+
+        await versions.record()
+        await SavedAlbumService.save(user, first)
+        await versions.record()
+        await SavedAlbumService.save(user, second)
+        await versions.record()
+        await AlbumService.update(
+            schemas.AlbumUpdate(title='New'),
+            id=first.id
+        )
+        await versions.record()
+        await SavedAlbumService.remove(user.id, second.id)
+        await versions.record()
+        return versions
+
+    assert run_db(run).are_distinct()